@@ -0,0 +1,74 @@
+"""Add patient full-text search index
+
+Revision ID: 3f6c2a9d1e47
+Revises: 8bba5c1adf04
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c2a9d1e47'
+down_revision: Union[str, None] = '8bba5c1adf04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Literal SQL, not app.db.fulltext, so later edits there cannot change this revision
+UPGRADE = {
+    "sqlite": [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS patient_fts USING fts5(
+            mrn, first_name, last_name,
+            content='patient', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS patient_fts_ai AFTER INSERT ON patient BEGIN
+            INSERT INTO patient_fts(rowid, mrn, first_name, last_name)
+            VALUES (new.id, new.mrn, new.first_name, new.last_name);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS patient_fts_ad AFTER DELETE ON patient BEGIN
+            INSERT INTO patient_fts(patient_fts, rowid, mrn, first_name, last_name)
+            VALUES ('delete', old.id, old.mrn, old.first_name, old.last_name);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS patient_fts_au AFTER UPDATE OF mrn, first_name, last_name ON patient BEGIN
+            INSERT INTO patient_fts(patient_fts, rowid, mrn, first_name, last_name)
+            VALUES ('delete', old.id, old.mrn, old.first_name, old.last_name);
+            INSERT INTO patient_fts(rowid, mrn, first_name, last_name)
+            VALUES (new.id, new.mrn, new.first_name, new.last_name);
+        END""",
+        "INSERT INTO patient_fts(patient_fts) VALUES ('rebuild')",
+    ],
+    "postgresql": [
+        "CREATE INDEX IF NOT EXISTS ix_patient_search ON patient USING gin ((setweight(to_tsvector('simple', coalesce(mrn, '')), 'A') || setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'B')))",
+    ],
+}
+
+DOWNGRADE = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS patient_fts_au",
+        "DROP TRIGGER IF EXISTS patient_fts_ad",
+        "DROP TRIGGER IF EXISTS patient_fts_ai",
+        "DROP TABLE IF EXISTS patient_fts",
+    ],
+    "postgresql": [
+        "DROP INDEX IF EXISTS ix_patient_search",
+    ],
+}
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    bind = op.get_bind()
+    for statement in statements.get(bind.dialect.name, []):
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    # FTS5 table + sync triggers on SQLite, GIN expression index on PostgreSQL;
+    # the SQLite index is rebuilt from the existing patient rows
+    _execute(UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(DOWNGRADE)
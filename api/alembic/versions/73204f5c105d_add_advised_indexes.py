@@ -0,0 +1,33 @@
+"""Add indexes proposed by the index advisor
+
+Revision ID: 73204f5c105d
+Revises: c47e9b12d3a8
+Create Date: 2026-10-18 00:08:42.360057
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '73204f5c105d'
+down_revision: Union[str, None] = 'c47e9b12d3a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_patient_id_active',
+        'patient',
+        ['id'],
+        unique=False,
+        sqlite_where=sa.text('is_deleted = 0'),
+        postgresql_where=sa.text('is_deleted = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_patient_id_active', table_name='patient')
@@ -0,0 +1,442 @@
+"""Add clinical free-text search index
+
+Revision ID: a81d4c5e7b20
+Revises: 3f6c2a9d1e47
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81d4c5e7b20'
+down_revision: Union[str, None] = '3f6c2a9d1e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The clinical text DDL as this revision shipped it, independent of app.db.fulltext
+UPGRADE = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS clinical_text_fts USING fts5(body, tokenize='porter unicode61 remove_diacritics 2')",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_procedure_ai AFTER INSERT ON "procedure" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 1, new.operative_report WHERE new.operative_report IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 2, new.complications WHERE new.complications IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 3, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_procedure_ad AFTER DELETE ON "procedure" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 1;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 2;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 3;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_procedure_au AFTER UPDATE OF operative_report, complications, notes ON "procedure" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 1;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 2;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 3;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 1, new.operative_report WHERE new.operative_report IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 2, new.complications WHERE new.complications IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 3, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_encounter_ai AFTER INSERT ON "encounter" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 4, new.chief_complaint WHERE new.chief_complaint IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 5, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_encounter_ad AFTER DELETE ON "encounter" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 4;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 5;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_encounter_au AFTER UPDATE OF chief_complaint, notes ON "encounter" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 4;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 5;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 4, new.chief_complaint WHERE new.chief_complaint IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 5, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_diagnosis_ai AFTER INSERT ON "diagnosis" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 6, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_diagnosis_ad AFTER DELETE ON "diagnosis" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 6;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_diagnosis_au AFTER UPDATE OF notes ON "diagnosis" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 6;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 6, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_other_ai AFTER INSERT ON "rc_other" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 7, new.procedure_description WHERE new.procedure_description IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 8, new.complications_intraop WHERE new.complications_intraop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 9, new.complications_postop WHERE new.complications_postop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 10, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_other_ad AFTER DELETE ON "rc_other" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 7;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 8;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 9;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 10;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_other_au AFTER UPDATE OF procedure_description, complications_intraop, complications_postop, notes ON "rc_other" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 7;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 8;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 9;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 10;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 7, new.procedure_description WHERE new.procedure_description IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 8, new.complications_intraop WHERE new.complications_intraop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 9, new.complications_postop WHERE new.complications_postop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 10, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_rotatorcuff_ai AFTER INSERT ON "rc_rotatorcuff" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 11, new.other_comments WHERE new.other_comments IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_rotatorcuff_ad AFTER DELETE ON "rc_rotatorcuff" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 11;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_rotatorcuff_au AFTER UPDATE OF other_comments ON "rc_rotatorcuff" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 11;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 11, new.other_comments WHERE new.other_comments IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_shoulderscope_ai AFTER INSERT ON "rc_shoulderscope" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 12, new.other_comments WHERE new.other_comments IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 13, new.ac_technique_notes WHERE new.ac_technique_notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_shoulderscope_ad AFTER DELETE ON "rc_shoulderscope" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 12;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 13;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_shoulderscope_au AFTER UPDATE OF other_comments, ac_technique_notes ON "rc_shoulderscope" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 12;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 13;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 12, new.other_comments WHERE new.other_comments IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 13, new.ac_technique_notes WHERE new.ac_technique_notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_kneescope_ai AFTER INSERT ON "rc_kneescope" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 14, new.intraop_complications_explanation WHERE new.intraop_complications_explanation IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_kneescope_ad AFTER DELETE ON "rc_kneescope" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 14;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_kneescope_au AFTER UPDATE OF intraop_complications_explanation ON "rc_kneescope" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 14;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 14, new.intraop_complications_explanation WHERE new.intraop_complications_explanation IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_hiparthroplasty_ai AFTER INSERT ON "rc_hiparthroplasty" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 15, new.complications_intraop WHERE new.complications_intraop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 16, new.complications_postop WHERE new.complications_postop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 17, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_hiparthroplasty_ad AFTER DELETE ON "rc_hiparthroplasty" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 15;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 16;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 17;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_hiparthroplasty_au AFTER UPDATE OF complications_intraop, complications_postop, notes ON "rc_hiparthroplasty" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 15;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 16;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 17;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 15, new.complications_intraop WHERE new.complications_intraop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 16, new.complications_postop WHERE new.complications_postop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 17, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_kneearthroplasty_ai AFTER INSERT ON "rc_kneearthroplasty" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 18, new.complications_intraop WHERE new.complications_intraop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 19, new.complications_postop WHERE new.complications_postop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 20, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_kneearthroplasty_ad AFTER DELETE ON "rc_kneearthroplasty" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 18;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 19;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 20;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_kneearthroplasty_au AFTER UPDATE OF complications_intraop, complications_postop, notes ON "rc_kneearthroplasty" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 18;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 19;
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 20;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 18, new.complications_intraop WHERE new.complications_intraop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 19, new.complications_postop WHERE new.complications_postop IS NOT NULL;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 20, new.notes WHERE new.notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_shoulderarthroplasty_ai AFTER INSERT ON "rc_shoulderarthroplasty" BEGIN
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 21, new.glenoid_notes WHERE new.glenoid_notes IS NOT NULL;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_shoulderarthroplasty_ad AFTER DELETE ON "rc_shoulderarthroplasty" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 21;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS clinical_text_rc_shoulderarthroplasty_au AFTER UPDATE OF glenoid_notes ON "rc_shoulderarthroplasty" BEGIN
+        DELETE FROM clinical_text_fts WHERE rowid = old.id * 1024 + 21;
+        INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * 1024 + 21, new.glenoid_notes WHERE new.glenoid_notes IS NOT NULL;
+        END""",
+        "DELETE FROM clinical_text_fts",
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 1, operative_report FROM "procedure" WHERE operative_report IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 2, complications FROM "procedure" WHERE complications IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 3, notes FROM "procedure" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 4, chief_complaint FROM "encounter" WHERE chief_complaint IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 5, notes FROM "encounter" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 6, notes FROM "diagnosis" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 7, procedure_description FROM "rc_other" WHERE procedure_description IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 8, complications_intraop FROM "rc_other" WHERE complications_intraop IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 9, complications_postop FROM "rc_other" WHERE complications_postop IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 10, notes FROM "rc_other" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 11, other_comments FROM "rc_rotatorcuff" WHERE other_comments IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 12, other_comments FROM "rc_shoulderscope" WHERE other_comments IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 13, ac_technique_notes FROM "rc_shoulderscope" WHERE ac_technique_notes IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 14, intraop_complications_explanation FROM "rc_kneescope" WHERE intraop_complications_explanation IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 15, complications_intraop FROM "rc_hiparthroplasty" WHERE complications_intraop IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 16, complications_postop FROM "rc_hiparthroplasty" WHERE complications_postop IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 17, notes FROM "rc_hiparthroplasty" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 18, complications_intraop FROM "rc_kneearthroplasty" WHERE complications_intraop IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 19, complications_postop FROM "rc_kneearthroplasty" WHERE complications_postop IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 20, notes FROM "rc_kneearthroplasty" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text_fts (rowid, body) SELECT id * 1024 + 21, glenoid_notes FROM "rc_shoulderarthroplasty" WHERE glenoid_notes IS NOT NULL',
+        "INSERT INTO clinical_text_fts(clinical_text_fts) VALUES ('optimize')",
+    ],
+    "postgresql": [
+        "CREATE TABLE IF NOT EXISTS clinical_text (id bigint PRIMARY KEY, body text NOT NULL, document tsvector GENERATED ALWAYS AS (to_tsvector('english', body)) STORED)",
+        "CREATE INDEX IF NOT EXISTS ix_clinical_text_document ON clinical_text USING gin (document)",
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_procedure() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 1, OLD.id * 1024 + 2, OLD.id * 1024 + 3);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (1, NEW.operative_report), (2, NEW.complications), (3, NEW.notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_procedure ON "procedure"',
+        'CREATE TRIGGER clinical_text_procedure AFTER INSERT OR DELETE OR UPDATE OF operative_report, complications, notes ON "procedure" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_procedure()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_encounter() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 4, OLD.id * 1024 + 5);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (4, NEW.chief_complaint), (5, NEW.notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_encounter ON "encounter"',
+        'CREATE TRIGGER clinical_text_encounter AFTER INSERT OR DELETE OR UPDATE OF chief_complaint, notes ON "encounter" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_encounter()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_diagnosis() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 6);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (6, NEW.notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_diagnosis ON "diagnosis"',
+        'CREATE TRIGGER clinical_text_diagnosis AFTER INSERT OR DELETE OR UPDATE OF notes ON "diagnosis" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_diagnosis()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_rc_other() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 7, OLD.id * 1024 + 8, OLD.id * 1024 + 9, OLD.id * 1024 + 10);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (7, NEW.procedure_description), (8, NEW.complications_intraop), (9, NEW.complications_postop), (10, NEW.notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_other ON "rc_other"',
+        'CREATE TRIGGER clinical_text_rc_other AFTER INSERT OR DELETE OR UPDATE OF procedure_description, complications_intraop, complications_postop, notes ON "rc_other" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_rc_other()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_rc_rotatorcuff() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 11);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (11, NEW.other_comments)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_rotatorcuff ON "rc_rotatorcuff"',
+        'CREATE TRIGGER clinical_text_rc_rotatorcuff AFTER INSERT OR DELETE OR UPDATE OF other_comments ON "rc_rotatorcuff" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_rc_rotatorcuff()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_rc_shoulderscope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 12, OLD.id * 1024 + 13);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (12, NEW.other_comments), (13, NEW.ac_technique_notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_shoulderscope ON "rc_shoulderscope"',
+        'CREATE TRIGGER clinical_text_rc_shoulderscope AFTER INSERT OR DELETE OR UPDATE OF other_comments, ac_technique_notes ON "rc_shoulderscope" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_rc_shoulderscope()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_rc_kneescope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 14);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (14, NEW.intraop_complications_explanation)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_kneescope ON "rc_kneescope"',
+        'CREATE TRIGGER clinical_text_rc_kneescope AFTER INSERT OR DELETE OR UPDATE OF intraop_complications_explanation ON "rc_kneescope" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_rc_kneescope()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_rc_hiparthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 15, OLD.id * 1024 + 16, OLD.id * 1024 + 17);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (15, NEW.complications_intraop), (16, NEW.complications_postop), (17, NEW.notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        'CREATE TRIGGER clinical_text_rc_hiparthroplasty AFTER INSERT OR DELETE OR UPDATE OF complications_intraop, complications_postop, notes ON "rc_hiparthroplasty" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_rc_hiparthroplasty()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_rc_kneearthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 18, OLD.id * 1024 + 19, OLD.id * 1024 + 20);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (18, NEW.complications_intraop), (19, NEW.complications_postop), (20, NEW.notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        'CREATE TRIGGER clinical_text_rc_kneearthroplasty AFTER INSERT OR DELETE OR UPDATE OF complications_intraop, complications_postop, notes ON "rc_kneearthroplasty" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_rc_kneearthroplasty()',
+        """CREATE OR REPLACE FUNCTION clinical_text_sync_rc_shoulderarthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM clinical_text WHERE id IN (OLD.id * 1024 + 21);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO clinical_text (id, body)
+                SELECT NEW.id * 1024 + slot, body FROM (VALUES (21, NEW.glenoid_notes)) AS v(slot, body)
+                WHERE body IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        'CREATE TRIGGER clinical_text_rc_shoulderarthroplasty AFTER INSERT OR DELETE OR UPDATE OF glenoid_notes ON "rc_shoulderarthroplasty" FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_rc_shoulderarthroplasty()',
+        "DELETE FROM clinical_text",
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 1, operative_report FROM "procedure" WHERE operative_report IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 2, complications FROM "procedure" WHERE complications IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 3, notes FROM "procedure" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 4, chief_complaint FROM "encounter" WHERE chief_complaint IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 5, notes FROM "encounter" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 6, notes FROM "diagnosis" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 7, procedure_description FROM "rc_other" WHERE procedure_description IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 8, complications_intraop FROM "rc_other" WHERE complications_intraop IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 9, complications_postop FROM "rc_other" WHERE complications_postop IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 10, notes FROM "rc_other" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 11, other_comments FROM "rc_rotatorcuff" WHERE other_comments IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 12, other_comments FROM "rc_shoulderscope" WHERE other_comments IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 13, ac_technique_notes FROM "rc_shoulderscope" WHERE ac_technique_notes IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 14, intraop_complications_explanation FROM "rc_kneescope" WHERE intraop_complications_explanation IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 15, complications_intraop FROM "rc_hiparthroplasty" WHERE complications_intraop IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 16, complications_postop FROM "rc_hiparthroplasty" WHERE complications_postop IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 17, notes FROM "rc_hiparthroplasty" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 18, complications_intraop FROM "rc_kneearthroplasty" WHERE complications_intraop IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 19, complications_postop FROM "rc_kneearthroplasty" WHERE complications_postop IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 20, notes FROM "rc_kneearthroplasty" WHERE notes IS NOT NULL',
+        'INSERT INTO clinical_text (id, body) SELECT id * 1024 + 21, glenoid_notes FROM "rc_shoulderarthroplasty" WHERE glenoid_notes IS NOT NULL',
+    ],
+}
+
+DOWNGRADE = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS clinical_text_procedure_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_procedure_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_procedure_au",
+        "DROP TRIGGER IF EXISTS clinical_text_encounter_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_encounter_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_encounter_au",
+        "DROP TRIGGER IF EXISTS clinical_text_diagnosis_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_diagnosis_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_diagnosis_au",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_other_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_other_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_other_au",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_rotatorcuff_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_rotatorcuff_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_rotatorcuff_au",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_shoulderscope_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_shoulderscope_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_shoulderscope_au",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_kneescope_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_kneescope_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_kneescope_au",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_hiparthroplasty_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_hiparthroplasty_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_hiparthroplasty_au",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_kneearthroplasty_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_kneearthroplasty_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_kneearthroplasty_au",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_shoulderarthroplasty_ai",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_shoulderarthroplasty_ad",
+        "DROP TRIGGER IF EXISTS clinical_text_rc_shoulderarthroplasty_au",
+        "DROP TABLE IF EXISTS clinical_text_fts",
+    ],
+    "postgresql": [
+        'DROP TRIGGER IF EXISTS clinical_text_procedure ON "procedure"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_procedure()",
+        'DROP TRIGGER IF EXISTS clinical_text_encounter ON "encounter"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_encounter()",
+        'DROP TRIGGER IF EXISTS clinical_text_diagnosis ON "diagnosis"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_diagnosis()",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_other ON "rc_other"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_rc_other()",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_rotatorcuff ON "rc_rotatorcuff"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_rc_rotatorcuff()",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_shoulderscope ON "rc_shoulderscope"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_rc_shoulderscope()",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_kneescope ON "rc_kneescope"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_rc_kneescope()",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_rc_hiparthroplasty()",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_rc_kneearthroplasty()",
+        'DROP TRIGGER IF EXISTS clinical_text_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        "DROP FUNCTION IF EXISTS clinical_text_sync_rc_shoulderarthroplasty()",
+        "DROP TABLE IF EXISTS clinical_text",
+    ],
+}
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    bind = op.get_bind()
+    for statement in statements.get(bind.dialect.name, []):
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    # One index over every clinical free-text column, kept current by per-table
+    # triggers; backfilled from existing rows on creation
+    _execute(UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(DOWNGRADE)
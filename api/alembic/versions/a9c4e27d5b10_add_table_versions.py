@@ -0,0 +1,244 @@
+"""Add table_version change counters
+
+Revision ID: a9c4e27d5b10
+Revises: f3a7d1c08e52
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e27d5b10'
+down_revision: Union[str, None] = 'f3a7d1c08e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Version triggers frozen from app.db.versions at this revision
+UPGRADE = {
+    "sqlite": [
+        """CREATE TRIGGER IF NOT EXISTS table_version_patient_ai AFTER INSERT ON "patient" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('patient', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_patient_au AFTER UPDATE ON "patient" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('patient', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_patient_ad AFTER DELETE ON "patient" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('patient', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_encounter_ai AFTER INSERT ON "encounter" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('encounter', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_encounter_au AFTER UPDATE ON "encounter" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('encounter', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_encounter_ad AFTER DELETE ON "encounter" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('encounter', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_diagnosis_ai AFTER INSERT ON "diagnosis" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('diagnosis', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_diagnosis_au AFTER UPDATE ON "diagnosis" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('diagnosis', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_diagnosis_ad AFTER DELETE ON "diagnosis" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('diagnosis', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_procedure_ai AFTER INSERT ON "procedure" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('procedure', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_procedure_au AFTER UPDATE ON "procedure" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('procedure', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_procedure_ad AFTER DELETE ON "procedure" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('procedure', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_rotatorcuff_ai AFTER INSERT ON "rc_rotatorcuff" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_rotatorcuff', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_rotatorcuff_au AFTER UPDATE ON "rc_rotatorcuff" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_rotatorcuff', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_rotatorcuff_ad AFTER DELETE ON "rc_rotatorcuff" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_rotatorcuff', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_kneescope_ai AFTER INSERT ON "rc_kneescope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_kneescope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_kneescope_au AFTER UPDATE ON "rc_kneescope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_kneescope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_kneescope_ad AFTER DELETE ON "rc_kneescope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_kneescope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_shoulderscope_ai AFTER INSERT ON "rc_shoulderscope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_shoulderscope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_shoulderscope_au AFTER UPDATE ON "rc_shoulderscope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_shoulderscope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_shoulderscope_ad AFTER DELETE ON "rc_shoulderscope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_shoulderscope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_shoulderarthroplasty_ai AFTER INSERT ON "rc_shoulderarthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_shoulderarthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_shoulderarthroplasty_au AFTER UPDATE ON "rc_shoulderarthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_shoulderarthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_shoulderarthroplasty_ad AFTER DELETE ON "rc_shoulderarthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_shoulderarthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_hipscope_ai AFTER INSERT ON "rc_hipscope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_hipscope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_hipscope_au AFTER UPDATE ON "rc_hipscope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_hipscope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_hipscope_ad AFTER DELETE ON "rc_hipscope" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_hipscope', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_hiparthroplasty_ai AFTER INSERT ON "rc_hiparthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_hiparthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_hiparthroplasty_au AFTER UPDATE ON "rc_hiparthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_hiparthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_hiparthroplasty_ad AFTER DELETE ON "rc_hiparthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_hiparthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_kneearthroplasty_ai AFTER INSERT ON "rc_kneearthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_kneearthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_kneearthroplasty_au AFTER UPDATE ON "rc_kneearthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_kneearthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_kneearthroplasty_ad AFTER DELETE ON "rc_kneearthroplasty" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_kneearthroplasty', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_other_ai AFTER INSERT ON "rc_other" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_other', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_other_au AFTER UPDATE ON "rc_other" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_other', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS table_version_rc_other_ad AFTER DELETE ON "rc_other" BEGIN
+        INSERT INTO table_version (table_name, version, changed_at) VALUES ('rc_other', 1, CURRENT_TIMESTAMP) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = CURRENT_TIMESTAMP;
+        END""",
+    ],
+    "postgresql": [
+        """CREATE OR REPLACE FUNCTION table_version_bump() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_version (table_name, version, changed_at) VALUES (TG_TABLE_NAME, 1, timezone('utc', now())) ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = timezone('utc', now());
+
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS table_version_patient ON "patient"',
+        'CREATE TRIGGER table_version_patient AFTER INSERT OR UPDATE OR DELETE ON "patient" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_encounter ON "encounter"',
+        'CREATE TRIGGER table_version_encounter AFTER INSERT OR UPDATE OR DELETE ON "encounter" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_diagnosis ON "diagnosis"',
+        'CREATE TRIGGER table_version_diagnosis AFTER INSERT OR UPDATE OR DELETE ON "diagnosis" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_procedure ON "procedure"',
+        'CREATE TRIGGER table_version_procedure AFTER INSERT OR UPDATE OR DELETE ON "procedure" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_rotatorcuff ON "rc_rotatorcuff"',
+        'CREATE TRIGGER table_version_rc_rotatorcuff AFTER INSERT OR UPDATE OR DELETE ON "rc_rotatorcuff" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_kneescope ON "rc_kneescope"',
+        'CREATE TRIGGER table_version_rc_kneescope AFTER INSERT OR UPDATE OR DELETE ON "rc_kneescope" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_shoulderscope ON "rc_shoulderscope"',
+        'CREATE TRIGGER table_version_rc_shoulderscope AFTER INSERT OR UPDATE OR DELETE ON "rc_shoulderscope" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        'CREATE TRIGGER table_version_rc_shoulderarthroplasty AFTER INSERT OR UPDATE OR DELETE ON "rc_shoulderarthroplasty" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_hipscope ON "rc_hipscope"',
+        'CREATE TRIGGER table_version_rc_hipscope AFTER INSERT OR UPDATE OR DELETE ON "rc_hipscope" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        'CREATE TRIGGER table_version_rc_hiparthroplasty AFTER INSERT OR UPDATE OR DELETE ON "rc_hiparthroplasty" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        'CREATE TRIGGER table_version_rc_kneearthroplasty AFTER INSERT OR UPDATE OR DELETE ON "rc_kneearthroplasty" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        'DROP TRIGGER IF EXISTS table_version_rc_other ON "rc_other"',
+        'CREATE TRIGGER table_version_rc_other AFTER INSERT OR UPDATE OR DELETE ON "rc_other" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+    ],
+}
+
+DOWNGRADE = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS table_version_patient_ai",
+        "DROP TRIGGER IF EXISTS table_version_patient_au",
+        "DROP TRIGGER IF EXISTS table_version_patient_ad",
+        "DROP TRIGGER IF EXISTS table_version_encounter_ai",
+        "DROP TRIGGER IF EXISTS table_version_encounter_au",
+        "DROP TRIGGER IF EXISTS table_version_encounter_ad",
+        "DROP TRIGGER IF EXISTS table_version_diagnosis_ai",
+        "DROP TRIGGER IF EXISTS table_version_diagnosis_au",
+        "DROP TRIGGER IF EXISTS table_version_diagnosis_ad",
+        "DROP TRIGGER IF EXISTS table_version_procedure_ai",
+        "DROP TRIGGER IF EXISTS table_version_procedure_au",
+        "DROP TRIGGER IF EXISTS table_version_procedure_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_rotatorcuff_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_rotatorcuff_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_rotatorcuff_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_kneescope_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_kneescope_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_kneescope_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_shoulderscope_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_shoulderscope_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_shoulderscope_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_shoulderarthroplasty_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_shoulderarthroplasty_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_shoulderarthroplasty_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_hipscope_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_hipscope_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_hipscope_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_hiparthroplasty_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_hiparthroplasty_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_hiparthroplasty_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_kneearthroplasty_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_kneearthroplasty_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_kneearthroplasty_ad",
+        "DROP TRIGGER IF EXISTS table_version_rc_other_ai",
+        "DROP TRIGGER IF EXISTS table_version_rc_other_au",
+        "DROP TRIGGER IF EXISTS table_version_rc_other_ad",
+    ],
+    "postgresql": [
+        'DROP TRIGGER IF EXISTS table_version_patient ON "patient"',
+        'DROP TRIGGER IF EXISTS table_version_encounter ON "encounter"',
+        'DROP TRIGGER IF EXISTS table_version_diagnosis ON "diagnosis"',
+        'DROP TRIGGER IF EXISTS table_version_procedure ON "procedure"',
+        'DROP TRIGGER IF EXISTS table_version_rc_rotatorcuff ON "rc_rotatorcuff"',
+        'DROP TRIGGER IF EXISTS table_version_rc_kneescope ON "rc_kneescope"',
+        'DROP TRIGGER IF EXISTS table_version_rc_shoulderscope ON "rc_shoulderscope"',
+        'DROP TRIGGER IF EXISTS table_version_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        'DROP TRIGGER IF EXISTS table_version_rc_hipscope ON "rc_hipscope"',
+        'DROP TRIGGER IF EXISTS table_version_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        'DROP TRIGGER IF EXISTS table_version_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        'DROP TRIGGER IF EXISTS table_version_rc_other ON "rc_other"',
+        "DROP FUNCTION IF EXISTS table_version_bump()",
+    ],
+}
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    bind = op.get_bind()
+    for statement in statements.get(bind.dialect.name, []):
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    op.create_table('table_version',
+    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    # Version triggers on every table whose lists are served with ETags
+    _execute(UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(DOWNGRADE)
+    op.drop_table('table_version')
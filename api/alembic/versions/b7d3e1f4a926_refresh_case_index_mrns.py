@@ -0,0 +1,121 @@
+"""Refresh research case index MRNs on patient and encounter changes
+
+Revision ID: b7d3e1f4a926
+Revises: a9c4e27d5b10
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e1f4a926'
+down_revision: Union[str, None] = 'a9c4e27d5b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Only the patient/encounter triggers this revision added, as literal SQL, then a
+# one-off refresh of MRNs that went stale before they existed
+UPGRADE = {
+    "sqlite": [
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_patient_au AFTER UPDATE OF mrn ON "patient" WHEN old.mrn IS NOT new.mrn BEGIN
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_rotatorcuff" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'rotator-cuff' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneescope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-surgical' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-scope' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderarthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-arthroplasty' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hipscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-scope' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hiparthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-arthroplasty' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneearthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-arthroplasty' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_other" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'other' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = new.id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_encounter_au AFTER UPDATE OF patient_id ON "encounter" WHEN old.patient_id IS NOT new.patient_id BEGIN
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_rotatorcuff" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'rotator-cuff' AND encounter_id IN (new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneescope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-surgical' AND encounter_id IN (new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-scope' AND encounter_id IN (new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderarthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-arthroplasty' AND encounter_id IN (new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hipscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-scope' AND encounter_id IN (new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hiparthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-arthroplasty' AND encounter_id IN (new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneearthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-arthroplasty' AND encounter_id IN (new.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_other" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'other' AND encounter_id IN (new.id);
+        END""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_rotatorcuff" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'rotator-cuff'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneescope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-surgical'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-scope'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderarthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-arthroplasty'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hipscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-scope'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hiparthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-arthroplasty'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneearthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-arthroplasty'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_other" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'other'""",
+    ],
+    "postgresql": [
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_patient() RETURNS trigger AS $$
+        BEGIN
+            UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_rotatorcuff" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'rotator-cuff' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneescope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-surgical' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-scope' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderarthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-arthroplasty' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hipscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-scope' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hiparthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-arthroplasty' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneearthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-arthroplasty' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_other" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'other' AND encounter_id IN (SELECT id FROM encounter WHERE patient_id = NEW.id);
+
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_patient ON "patient"',
+        'CREATE TRIGGER rc_case_index_patient AFTER UPDATE OF mrn ON "patient" FOR EACH ROW WHEN (OLD.mrn IS DISTINCT FROM NEW.mrn) EXECUTE FUNCTION rc_case_index_sync_patient()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_encounter() RETURNS trigger AS $$
+        BEGIN
+            UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_rotatorcuff" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'rotator-cuff' AND encounter_id IN (NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneescope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-surgical' AND encounter_id IN (NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-scope' AND encounter_id IN (NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderarthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-arthroplasty' AND encounter_id IN (NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hipscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-scope' AND encounter_id IN (NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hiparthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-arthroplasty' AND encounter_id IN (NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneearthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-arthroplasty' AND encounter_id IN (NEW.id);
+        UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_other" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'other' AND encounter_id IN (NEW.id);
+
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_encounter ON "encounter"',
+        'CREATE TRIGGER rc_case_index_encounter AFTER UPDATE OF patient_id ON "encounter" FOR EACH ROW WHEN (OLD.patient_id IS DISTINCT FROM NEW.patient_id) EXECUTE FUNCTION rc_case_index_sync_encounter()',
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_rotatorcuff" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'rotator-cuff'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneescope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-surgical'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-scope'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_shoulderarthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'shoulder-arthroplasty'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hipscope" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-scope'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_hiparthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'hip-arthroplasty'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_kneearthroplasty" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'knee-arthroplasty'""",
+        """UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM "rc_other" AS rc JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id WHERE rc.id = rc_case_index.case_id) WHERE procedure_type = 'other'""",
+    ],
+}
+
+DOWNGRADE = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS rc_case_index_patient_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_encounter_au",
+    ],
+    "postgresql": [
+        'DROP TRIGGER IF EXISTS rc_case_index_patient ON "patient"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_patient()",
+        'DROP TRIGGER IF EXISTS rc_case_index_encounter ON "encounter"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_encounter()",
+    ],
+}
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    bind = op.get_bind()
+    for statement in statements.get(bind.dialect.name, []):
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    _execute(UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(DOWNGRADE)
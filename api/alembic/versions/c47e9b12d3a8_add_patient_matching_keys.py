@@ -0,0 +1,47 @@
+"""Add patient matching keys
+
+Revision ID: c47e9b12d3a8
+Revises: a81d4c5e7b20
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlmodel import Session
+
+from app.db.crud import patient as patient_crud
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e9b12d3a8'
+down_revision: Union[str, None] = 'a81d4c5e7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('patient', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('mrn_key', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('first_name_key', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('last_name_key', sa.String(length=10), nullable=True))
+        batch_op.create_index('ix_patient_mrn_key', ['mrn_key'], unique=False)
+        batch_op.create_index('ix_patient_dob_last_name_key', ['date_of_birth', 'last_name_key'], unique=False)
+        batch_op.create_index('ix_patient_dob_first_name_key', ['date_of_birth', 'first_name_key'], unique=False)
+        batch_op.create_index('ix_patient_name_keys', ['last_name_key', 'first_name_key'], unique=False)
+
+    # Derive keys for existing rows
+    with Session(bind=op.get_bind()) as session:
+        patient_crud.backfill_match_keys(session)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('patient', schema=None) as batch_op:
+        batch_op.drop_index('ix_patient_name_keys')
+        batch_op.drop_index('ix_patient_dob_first_name_key')
+        batch_op.drop_index('ix_patient_dob_last_name_key')
+        batch_op.drop_index('ix_patient_mrn_key')
+        batch_op.drop_column('last_name_key')
+        batch_op.drop_column('first_name_key')
+        batch_op.drop_column('mrn_key')
@@ -0,0 +1,403 @@
+"""Add stat_counter rollups
+
+Revision ID: d52e8f0a6b13
+Revises: 73204f5c105d
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd52e8f0a6b13'
+down_revision: Union[str, None] = '73204f5c105d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigger DDL and reconcile SQL copied from app.db.stats at this revision
+UPGRADE = {
+    "sqlite": [
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_patient_ai AFTER INSERT ON "patient" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.status', CASE WHEN new.is_deleted THEN 'deleted' ELSE 'active' END, 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.sex', coalesce(new.sex, 'unknown'), 1 WHERE new.is_deleted = 0 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.state', coalesce(new.state, 'unknown'), 1 WHERE new.is_deleted = 0 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_patient_ad AFTER DELETE ON "patient" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.status' AND bucket = CASE WHEN old.is_deleted THEN 'deleted' ELSE 'active' END AND 1;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.sex' AND bucket = coalesce(old.sex, 'unknown') AND old.is_deleted = 0;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.state' AND bucket = coalesce(old.state, 'unknown') AND old.is_deleted = 0;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_patient_au AFTER UPDATE OF is_deleted, sex, state ON "patient" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.status' AND bucket = CASE WHEN old.is_deleted THEN 'deleted' ELSE 'active' END AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.status', CASE WHEN new.is_deleted THEN 'deleted' ELSE 'active' END, 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.sex' AND bucket = coalesce(old.sex, 'unknown') AND old.is_deleted = 0;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.sex', coalesce(new.sex, 'unknown'), 1 WHERE new.is_deleted = 0 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.state' AND bucket = coalesce(old.state, 'unknown') AND old.is_deleted = 0;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.state', coalesce(new.state, 'unknown'), 1 WHERE new.is_deleted = 0 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_encounter_ai AFTER INSERT ON "encounter" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.type', coalesce(new.encounter_type, 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.month', coalesce(strftime('%Y-%m', new.encounter_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_encounter_ad AFTER DELETE ON "encounter" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'encounter.type' AND bucket = coalesce(old.encounter_type, 'unknown') AND 1;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'encounter.month' AND bucket = coalesce(strftime('%Y-%m', old.encounter_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_encounter_au AFTER UPDATE OF encounter_type, encounter_date ON "encounter" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'encounter.type' AND bucket = coalesce(old.encounter_type, 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.type', coalesce(new.encounter_type, 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'encounter.month' AND bucket = coalesce(strftime('%Y-%m', old.encounter_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.month', coalesce(strftime('%Y-%m', new.encounter_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_rotatorcuff_ai AFTER INSERT ON "rc_rotatorcuff" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_rotatorcuff.month', coalesce(strftime('%Y-%m', new.date_of_surgery), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_rotatorcuff_ad AFTER DELETE ON "rc_rotatorcuff" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_rotatorcuff.month' AND bucket = coalesce(strftime('%Y-%m', old.date_of_surgery), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_rotatorcuff_au AFTER UPDATE OF date_of_surgery ON "rc_rotatorcuff" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_rotatorcuff.month' AND bucket = coalesce(strftime('%Y-%m', old.date_of_surgery), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_rotatorcuff.month', coalesce(strftime('%Y-%m', new.date_of_surgery), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_kneescope_ai AFTER INSERT ON "rc_kneescope" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneescope.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_kneescope_ad AFTER DELETE ON "rc_kneescope" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_kneescope.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_kneescope_au AFTER UPDATE OF surgery_date ON "rc_kneescope" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_kneescope.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneescope.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_shoulderscope_ai AFTER INSERT ON "rc_shoulderscope" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderscope.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_shoulderscope_ad AFTER DELETE ON "rc_shoulderscope" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_shoulderscope.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_shoulderscope_au AFTER UPDATE OF surgery_date ON "rc_shoulderscope" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_shoulderscope.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderscope.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_shoulderarthroplasty_ai AFTER INSERT ON "rc_shoulderarthroplasty" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderarthroplasty.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_shoulderarthroplasty_ad AFTER DELETE ON "rc_shoulderarthroplasty" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_shoulderarthroplasty.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_shoulderarthroplasty_au AFTER UPDATE OF surgery_date ON "rc_shoulderarthroplasty" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_shoulderarthroplasty.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderarthroplasty.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_hipscope_ai AFTER INSERT ON "rc_hipscope" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hipscope.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_hipscope_ad AFTER DELETE ON "rc_hipscope" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_hipscope.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_hipscope_au AFTER UPDATE OF surgery_date ON "rc_hipscope" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_hipscope.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hipscope.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_hiparthroplasty_ai AFTER INSERT ON "rc_hiparthroplasty" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hiparthroplasty.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_hiparthroplasty_ad AFTER DELETE ON "rc_hiparthroplasty" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_hiparthroplasty.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_hiparthroplasty_au AFTER UPDATE OF surgery_date ON "rc_hiparthroplasty" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_hiparthroplasty.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hiparthroplasty.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_kneearthroplasty_ai AFTER INSERT ON "rc_kneearthroplasty" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneearthroplasty.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_kneearthroplasty_ad AFTER DELETE ON "rc_kneearthroplasty" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_kneearthroplasty.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_kneearthroplasty_au AFTER UPDATE OF surgery_date ON "rc_kneearthroplasty" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_kneearthroplasty.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneearthroplasty.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_other_ai AFTER INSERT ON "rc_other" BEGIN
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_other.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_other_ad AFTER DELETE ON "rc_other" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_other.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS stat_counter_rc_other_au AFTER UPDATE OF surgery_date ON "rc_other" BEGIN
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_other.month' AND bucket = coalesce(strftime('%Y-%m', old.surgery_date), 'unknown') AND 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_other.month', coalesce(strftime('%Y-%m', new.surgery_date), 'unknown'), 1 WHERE 1 ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        END""",
+        "DELETE FROM stat_counter",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.status', CASE WHEN "patient".is_deleted THEN 'deleted' ELSE 'active' END, count(*) FROM "patient" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.sex', coalesce("patient".sex, 'unknown'), count(*) FROM "patient" WHERE "patient".is_deleted = 0 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.state', coalesce("patient".state, 'unknown'), count(*) FROM "patient" WHERE "patient".is_deleted = 0 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.type', coalesce("encounter".encounter_type, 'unknown'), count(*) FROM "encounter" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.month', coalesce(strftime('%Y-%m', "encounter".encounter_date), 'unknown'), count(*) FROM "encounter" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_rotatorcuff.month', coalesce(strftime('%Y-%m', "rc_rotatorcuff".date_of_surgery), 'unknown'), count(*) FROM "rc_rotatorcuff" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneescope.month', coalesce(strftime('%Y-%m', "rc_kneescope".surgery_date), 'unknown'), count(*) FROM "rc_kneescope" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderscope.month', coalesce(strftime('%Y-%m', "rc_shoulderscope".surgery_date), 'unknown'), count(*) FROM "rc_shoulderscope" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderarthroplasty.month', coalesce(strftime('%Y-%m', "rc_shoulderarthroplasty".surgery_date), 'unknown'), count(*) FROM "rc_shoulderarthroplasty" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hipscope.month', coalesce(strftime('%Y-%m', "rc_hipscope".surgery_date), 'unknown'), count(*) FROM "rc_hipscope" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hiparthroplasty.month', coalesce(strftime('%Y-%m', "rc_hiparthroplasty".surgery_date), 'unknown'), count(*) FROM "rc_hiparthroplasty" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneearthroplasty.month', coalesce(strftime('%Y-%m', "rc_kneearthroplasty".surgery_date), 'unknown'), count(*) FROM "rc_kneearthroplasty" WHERE 1 GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_other.month', coalesce(strftime('%Y-%m', "rc_other".surgery_date), 'unknown'), count(*) FROM "rc_other" WHERE 1 GROUP BY 2""",
+    ],
+    "postgresql": [
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_patient() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.status' AND bucket = CASE WHEN OLD.is_deleted THEN 'deleted' ELSE 'active' END AND true;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.sex' AND bucket = coalesce(OLD.sex, 'unknown') AND NOT OLD.is_deleted;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'patient.state' AND bucket = coalesce(OLD.state, 'unknown') AND NOT OLD.is_deleted;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.status', CASE WHEN NEW.is_deleted THEN 'deleted' ELSE 'active' END, 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.sex', coalesce(NEW.sex, 'unknown'), 1 WHERE NOT NEW.is_deleted ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.state', coalesce(NEW.state, 'unknown'), 1 WHERE NOT NEW.is_deleted ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_patient ON "patient"',
+        'CREATE TRIGGER stat_counter_patient AFTER INSERT OR DELETE OR UPDATE OF is_deleted, sex, state ON "patient" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_patient()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_encounter() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'encounter.type' AND bucket = coalesce(OLD.encounter_type, 'unknown') AND true;
+        UPDATE stat_counter SET count = count - 1 WHERE metric = 'encounter.month' AND bucket = coalesce(to_char(OLD.encounter_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.type', coalesce(NEW.encounter_type, 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+        INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.month', coalesce(to_char(NEW.encounter_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_encounter ON "encounter"',
+        'CREATE TRIGGER stat_counter_encounter AFTER INSERT OR DELETE OR UPDATE OF encounter_type, encounter_date ON "encounter" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_encounter()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_rotatorcuff() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_rotatorcuff.month' AND bucket = coalesce(to_char(OLD.date_of_surgery, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_rotatorcuff.month', coalesce(to_char(NEW.date_of_surgery, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_rotatorcuff ON "rc_rotatorcuff"',
+        'CREATE TRIGGER stat_counter_rc_rotatorcuff AFTER INSERT OR DELETE OR UPDATE OF date_of_surgery ON "rc_rotatorcuff" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_rotatorcuff()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_kneescope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_kneescope.month' AND bucket = coalesce(to_char(OLD.surgery_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneescope.month', coalesce(to_char(NEW.surgery_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_kneescope ON "rc_kneescope"',
+        'CREATE TRIGGER stat_counter_rc_kneescope AFTER INSERT OR DELETE OR UPDATE OF surgery_date ON "rc_kneescope" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_kneescope()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_shoulderscope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_shoulderscope.month' AND bucket = coalesce(to_char(OLD.surgery_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderscope.month', coalesce(to_char(NEW.surgery_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_shoulderscope ON "rc_shoulderscope"',
+        'CREATE TRIGGER stat_counter_rc_shoulderscope AFTER INSERT OR DELETE OR UPDATE OF surgery_date ON "rc_shoulderscope" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_shoulderscope()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_shoulderarthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_shoulderarthroplasty.month' AND bucket = coalesce(to_char(OLD.surgery_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderarthroplasty.month', coalesce(to_char(NEW.surgery_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        'CREATE TRIGGER stat_counter_rc_shoulderarthroplasty AFTER INSERT OR DELETE OR UPDATE OF surgery_date ON "rc_shoulderarthroplasty" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_shoulderarthroplasty()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_hipscope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_hipscope.month' AND bucket = coalesce(to_char(OLD.surgery_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hipscope.month', coalesce(to_char(NEW.surgery_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_hipscope ON "rc_hipscope"',
+        'CREATE TRIGGER stat_counter_rc_hipscope AFTER INSERT OR DELETE OR UPDATE OF surgery_date ON "rc_hipscope" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_hipscope()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_hiparthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_hiparthroplasty.month' AND bucket = coalesce(to_char(OLD.surgery_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hiparthroplasty.month', coalesce(to_char(NEW.surgery_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        'CREATE TRIGGER stat_counter_rc_hiparthroplasty AFTER INSERT OR DELETE OR UPDATE OF surgery_date ON "rc_hiparthroplasty" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_hiparthroplasty()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_kneearthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_kneearthroplasty.month' AND bucket = coalesce(to_char(OLD.surgery_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneearthroplasty.month', coalesce(to_char(NEW.surgery_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        'CREATE TRIGGER stat_counter_rc_kneearthroplasty AFTER INSERT OR DELETE OR UPDATE OF surgery_date ON "rc_kneearthroplasty" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_kneearthroplasty()',
+        """CREATE OR REPLACE FUNCTION stat_counter_sync_rc_other() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE stat_counter SET count = count - 1 WHERE metric = 'rc_other.month' AND bucket = coalesce(to_char(OLD.surgery_date, 'YYYY-MM'), 'unknown') AND true;
+
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_other.month', coalesce(to_char(NEW.surgery_date, 'YYYY-MM'), 'unknown'), 1 WHERE true ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_other ON "rc_other"',
+        'CREATE TRIGGER stat_counter_rc_other AFTER INSERT OR DELETE OR UPDATE OF surgery_date ON "rc_other" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_rc_other()',
+        'LOCK TABLE "patient", "encounter", "rc_rotatorcuff", "rc_kneescope", "rc_shoulderscope", "rc_shoulderarthroplasty", "rc_hipscope", "rc_hiparthroplasty", "rc_kneearthroplasty", "rc_other" IN SHARE MODE',
+        "DELETE FROM stat_counter",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.status', CASE WHEN "patient".is_deleted THEN 'deleted' ELSE 'active' END, count(*) FROM "patient" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.sex', coalesce("patient".sex, 'unknown'), count(*) FROM "patient" WHERE NOT "patient".is_deleted GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'patient.state', coalesce("patient".state, 'unknown'), count(*) FROM "patient" WHERE NOT "patient".is_deleted GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.type', coalesce("encounter".encounter_type, 'unknown'), count(*) FROM "encounter" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'encounter.month', coalesce(to_char("encounter".encounter_date, 'YYYY-MM'), 'unknown'), count(*) FROM "encounter" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_rotatorcuff.month', coalesce(to_char("rc_rotatorcuff".date_of_surgery, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_rotatorcuff" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneescope.month', coalesce(to_char("rc_kneescope".surgery_date, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_kneescope" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderscope.month', coalesce(to_char("rc_shoulderscope".surgery_date, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_shoulderscope" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_shoulderarthroplasty.month', coalesce(to_char("rc_shoulderarthroplasty".surgery_date, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_shoulderarthroplasty" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hipscope.month', coalesce(to_char("rc_hipscope".surgery_date, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_hipscope" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_hiparthroplasty.month', coalesce(to_char("rc_hiparthroplasty".surgery_date, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_hiparthroplasty" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_kneearthroplasty.month', coalesce(to_char("rc_kneearthroplasty".surgery_date, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_kneearthroplasty" WHERE true GROUP BY 2""",
+        """INSERT INTO stat_counter (metric, bucket, count) SELECT 'rc_other.month', coalesce(to_char("rc_other".surgery_date, 'YYYY-MM'), 'unknown'), count(*) FROM "rc_other" WHERE true GROUP BY 2""",
+    ],
+}
+
+DOWNGRADE = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS stat_counter_patient_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_patient_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_patient_au",
+        "DROP TRIGGER IF EXISTS stat_counter_encounter_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_encounter_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_encounter_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_rotatorcuff_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_rotatorcuff_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_rotatorcuff_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_kneescope_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_kneescope_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_kneescope_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_shoulderscope_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_shoulderscope_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_shoulderscope_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_shoulderarthroplasty_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_shoulderarthroplasty_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_shoulderarthroplasty_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_hipscope_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_hipscope_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_hipscope_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_hiparthroplasty_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_hiparthroplasty_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_hiparthroplasty_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_kneearthroplasty_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_kneearthroplasty_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_kneearthroplasty_au",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_other_ai",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_other_ad",
+        "DROP TRIGGER IF EXISTS stat_counter_rc_other_au",
+    ],
+    "postgresql": [
+        'DROP TRIGGER IF EXISTS stat_counter_patient ON "patient"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_patient()",
+        'DROP TRIGGER IF EXISTS stat_counter_encounter ON "encounter"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_encounter()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_rotatorcuff ON "rc_rotatorcuff"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_rotatorcuff()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_kneescope ON "rc_kneescope"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_kneescope()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_shoulderscope ON "rc_shoulderscope"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_shoulderscope()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_shoulderarthroplasty()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_hipscope ON "rc_hipscope"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_hipscope()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_hiparthroplasty()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_kneearthroplasty()",
+        'DROP TRIGGER IF EXISTS stat_counter_rc_other ON "rc_other"',
+        "DROP FUNCTION IF EXISTS stat_counter_sync_rc_other()",
+    ],
+}
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    bind = op.get_bind()
+    for statement in statements.get(bind.dialect.name, []):
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    op.create_table('stat_counter',
+    sa.Column('metric', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('bucket', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'bucket')
+    )
+    # Counter triggers on every source table; counts are reconciled from existing rows
+    _execute(UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(DOWNGRADE)
+    op.drop_table('stat_counter')
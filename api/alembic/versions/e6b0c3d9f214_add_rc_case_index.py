@@ -0,0 +1,344 @@
+"""Add cross-procedure research case index
+
+Revision ID: e6b0c3d9f214
+Revises: d52e8f0a6b13
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b0c3d9f214'
+down_revision: Union[str, None] = 'd52e8f0a6b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# rc_* triggers and the initial rebuild as app.db.case_index generated them here;
+# the patient/encounter MRN triggers belong to b7d3e1f4a926
+UPGRADE = {
+    "sqlite": [
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_rotatorcuff_ai AFTER INSERT ON "rc_rotatorcuff" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'rotator-cuff', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.date_of_surgery;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_rotatorcuff_ad AFTER DELETE ON "rc_rotatorcuff" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'rotator-cuff' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_rotatorcuff_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, date_of_surgery ON "rc_rotatorcuff" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.date_of_surgery) WHERE procedure_type = 'rotator-cuff' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_kneescope_ai AFTER INSERT ON "rc_kneescope" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-surgical', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_kneescope_ad AFTER DELETE ON "rc_kneescope" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'knee-surgical' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_kneescope_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_kneescope" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date) WHERE procedure_type = 'knee-surgical' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_shoulderscope_ai AFTER INSERT ON "rc_shoulderscope" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-scope', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_shoulderscope_ad AFTER DELETE ON "rc_shoulderscope" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'shoulder-scope' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_shoulderscope_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_shoulderscope" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date) WHERE procedure_type = 'shoulder-scope' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_shoulderarthroplasty_ai AFTER INSERT ON "rc_shoulderarthroplasty" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-arthroplasty', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_shoulderarthroplasty_ad AFTER DELETE ON "rc_shoulderarthroplasty" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'shoulder-arthroplasty' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_shoulderarthroplasty_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_shoulderarthroplasty" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date) WHERE procedure_type = 'shoulder-arthroplasty' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_hipscope_ai AFTER INSERT ON "rc_hipscope" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-scope', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_hipscope_ad AFTER DELETE ON "rc_hipscope" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'hip-scope' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_hipscope_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_hipscope" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date) WHERE procedure_type = 'hip-scope' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_hiparthroplasty_ai AFTER INSERT ON "rc_hiparthroplasty" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-arthroplasty', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_hiparthroplasty_ad AFTER DELETE ON "rc_hiparthroplasty" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'hip-arthroplasty' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_hiparthroplasty_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_hiparthroplasty" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date) WHERE procedure_type = 'hip-arthroplasty' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_kneearthroplasty_ai AFTER INSERT ON "rc_kneearthroplasty" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-arthroplasty', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_kneearthroplasty_ad AFTER DELETE ON "rc_kneearthroplasty" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'knee-arthroplasty' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_kneearthroplasty_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_kneearthroplasty" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date) WHERE procedure_type = 'knee-arthroplasty' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_other_ai AFTER INSERT ON "rc_other" BEGIN
+        INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'other', new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_other_ad AFTER DELETE ON "rc_other" BEGIN
+        DELETE FROM rc_case_index WHERE procedure_type = 'other' AND case_id = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS rc_case_index_rc_other_au AFTER UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_other" BEGIN
+        UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT new.id, new.encounter_id, coalesce(new.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = new.encounter_id)), new.attending, new.fellow_or_pa, new.laterality, new.surgery_date) WHERE procedure_type = 'other' AND case_id = old.id;
+        END""",
+        "DELETE FROM rc_case_index",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'rotator-cuff', "rc_rotatorcuff".id, "rc_rotatorcuff".encounter_id, coalesce("rc_rotatorcuff".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_rotatorcuff".encounter_id)), "rc_rotatorcuff".attending, "rc_rotatorcuff".fellow_or_pa, "rc_rotatorcuff".laterality, "rc_rotatorcuff".date_of_surgery FROM "rc_rotatorcuff" ORDER BY "rc_rotatorcuff".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-surgical', "rc_kneescope".id, "rc_kneescope".encounter_id, coalesce("rc_kneescope".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_kneescope".encounter_id)), "rc_kneescope".attending, "rc_kneescope".fellow_or_pa, "rc_kneescope".laterality, "rc_kneescope".surgery_date FROM "rc_kneescope" ORDER BY "rc_kneescope".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-scope', "rc_shoulderscope".id, "rc_shoulderscope".encounter_id, coalesce("rc_shoulderscope".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_shoulderscope".encounter_id)), "rc_shoulderscope".attending, "rc_shoulderscope".fellow_or_pa, "rc_shoulderscope".laterality, "rc_shoulderscope".surgery_date FROM "rc_shoulderscope" ORDER BY "rc_shoulderscope".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-arthroplasty', "rc_shoulderarthroplasty".id, "rc_shoulderarthroplasty".encounter_id, coalesce("rc_shoulderarthroplasty".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_shoulderarthroplasty".encounter_id)), "rc_shoulderarthroplasty".attending, "rc_shoulderarthroplasty".fellow_or_pa, "rc_shoulderarthroplasty".laterality, "rc_shoulderarthroplasty".surgery_date FROM "rc_shoulderarthroplasty" ORDER BY "rc_shoulderarthroplasty".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-scope', "rc_hipscope".id, "rc_hipscope".encounter_id, coalesce("rc_hipscope".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_hipscope".encounter_id)), "rc_hipscope".attending, "rc_hipscope".fellow_or_pa, "rc_hipscope".laterality, "rc_hipscope".surgery_date FROM "rc_hipscope" ORDER BY "rc_hipscope".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-arthroplasty', "rc_hiparthroplasty".id, "rc_hiparthroplasty".encounter_id, coalesce("rc_hiparthroplasty".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_hiparthroplasty".encounter_id)), "rc_hiparthroplasty".attending, "rc_hiparthroplasty".fellow_or_pa, "rc_hiparthroplasty".laterality, "rc_hiparthroplasty".surgery_date FROM "rc_hiparthroplasty" ORDER BY "rc_hiparthroplasty".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-arthroplasty', "rc_kneearthroplasty".id, "rc_kneearthroplasty".encounter_id, coalesce("rc_kneearthroplasty".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_kneearthroplasty".encounter_id)), "rc_kneearthroplasty".attending, "rc_kneearthroplasty".fellow_or_pa, "rc_kneearthroplasty".laterality, "rc_kneearthroplasty".surgery_date FROM "rc_kneearthroplasty" ORDER BY "rc_kneearthroplasty".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'other', "rc_other".id, "rc_other".encounter_id, coalesce("rc_other".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_other".encounter_id)), "rc_other".attending, "rc_other".fellow_or_pa, "rc_other".laterality, "rc_other".surgery_date FROM "rc_other" ORDER BY "rc_other".id""",
+    ],
+    "postgresql": [
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_rotatorcuff() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'rotator-cuff', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.date_of_surgery;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.date_of_surgery) WHERE procedure_type = 'rotator-cuff' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'rotator-cuff' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_rotatorcuff ON "rc_rotatorcuff"',
+        'CREATE TRIGGER rc_case_index_rc_rotatorcuff AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, date_of_surgery ON "rc_rotatorcuff" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_rotatorcuff()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_kneescope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-surgical', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date) WHERE procedure_type = 'knee-surgical' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'knee-surgical' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_kneescope ON "rc_kneescope"',
+        'CREATE TRIGGER rc_case_index_rc_kneescope AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_kneescope" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_kneescope()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_shoulderscope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-scope', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date) WHERE procedure_type = 'shoulder-scope' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'shoulder-scope' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderscope ON "rc_shoulderscope"',
+        'CREATE TRIGGER rc_case_index_rc_shoulderscope AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_shoulderscope" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_shoulderscope()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_shoulderarthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-arthroplasty', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date) WHERE procedure_type = 'shoulder-arthroplasty' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'shoulder-arthroplasty' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        'CREATE TRIGGER rc_case_index_rc_shoulderarthroplasty AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_shoulderarthroplasty" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_shoulderarthroplasty()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_hipscope() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-scope', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date) WHERE procedure_type = 'hip-scope' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'hip-scope' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_hipscope ON "rc_hipscope"',
+        'CREATE TRIGGER rc_case_index_rc_hipscope AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_hipscope" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_hipscope()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_hiparthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-arthroplasty', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date) WHERE procedure_type = 'hip-arthroplasty' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'hip-arthroplasty' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        'CREATE TRIGGER rc_case_index_rc_hiparthroplasty AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_hiparthroplasty" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_hiparthroplasty()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_kneearthroplasty() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-arthroplasty', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date) WHERE procedure_type = 'knee-arthroplasty' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'knee-arthroplasty' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        'CREATE TRIGGER rc_case_index_rc_kneearthroplasty AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_kneearthroplasty" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_kneearthroplasty()',
+        """CREATE OR REPLACE FUNCTION rc_case_index_sync_rc_other() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'other', NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date;
+
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE rc_case_index SET (case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) = (SELECT NEW.id, NEW.encounter_id, coalesce(NEW.mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = NEW.encounter_id)), NEW.attending, NEW.fellow_or_pa, NEW.laterality, NEW.surgery_date) WHERE procedure_type = 'other' AND case_id = OLD.id;
+
+            ELSE
+                DELETE FROM rc_case_index WHERE procedure_type = 'other' AND case_id = OLD.id;
+
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql""",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_other ON "rc_other"',
+        'CREATE TRIGGER rc_case_index_rc_other AFTER INSERT OR DELETE OR UPDATE OF id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date ON "rc_other" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_rc_other()',
+        'LOCK TABLE "rc_rotatorcuff", "rc_kneescope", "rc_shoulderscope", "rc_shoulderarthroplasty", "rc_hipscope", "rc_hiparthroplasty", "rc_kneearthroplasty", "rc_other" IN SHARE MODE',
+        "DELETE FROM rc_case_index",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'rotator-cuff', "rc_rotatorcuff".id, "rc_rotatorcuff".encounter_id, coalesce("rc_rotatorcuff".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_rotatorcuff".encounter_id)), "rc_rotatorcuff".attending, "rc_rotatorcuff".fellow_or_pa, "rc_rotatorcuff".laterality, "rc_rotatorcuff".date_of_surgery FROM "rc_rotatorcuff" ORDER BY "rc_rotatorcuff".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-surgical', "rc_kneescope".id, "rc_kneescope".encounter_id, coalesce("rc_kneescope".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_kneescope".encounter_id)), "rc_kneescope".attending, "rc_kneescope".fellow_or_pa, "rc_kneescope".laterality, "rc_kneescope".surgery_date FROM "rc_kneescope" ORDER BY "rc_kneescope".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-scope', "rc_shoulderscope".id, "rc_shoulderscope".encounter_id, coalesce("rc_shoulderscope".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_shoulderscope".encounter_id)), "rc_shoulderscope".attending, "rc_shoulderscope".fellow_or_pa, "rc_shoulderscope".laterality, "rc_shoulderscope".surgery_date FROM "rc_shoulderscope" ORDER BY "rc_shoulderscope".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'shoulder-arthroplasty', "rc_shoulderarthroplasty".id, "rc_shoulderarthroplasty".encounter_id, coalesce("rc_shoulderarthroplasty".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_shoulderarthroplasty".encounter_id)), "rc_shoulderarthroplasty".attending, "rc_shoulderarthroplasty".fellow_or_pa, "rc_shoulderarthroplasty".laterality, "rc_shoulderarthroplasty".surgery_date FROM "rc_shoulderarthroplasty" ORDER BY "rc_shoulderarthroplasty".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-scope', "rc_hipscope".id, "rc_hipscope".encounter_id, coalesce("rc_hipscope".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_hipscope".encounter_id)), "rc_hipscope".attending, "rc_hipscope".fellow_or_pa, "rc_hipscope".laterality, "rc_hipscope".surgery_date FROM "rc_hipscope" ORDER BY "rc_hipscope".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'hip-arthroplasty', "rc_hiparthroplasty".id, "rc_hiparthroplasty".encounter_id, coalesce("rc_hiparthroplasty".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_hiparthroplasty".encounter_id)), "rc_hiparthroplasty".attending, "rc_hiparthroplasty".fellow_or_pa, "rc_hiparthroplasty".laterality, "rc_hiparthroplasty".surgery_date FROM "rc_hiparthroplasty" ORDER BY "rc_hiparthroplasty".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'knee-arthroplasty', "rc_kneearthroplasty".id, "rc_kneearthroplasty".encounter_id, coalesce("rc_kneearthroplasty".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_kneearthroplasty".encounter_id)), "rc_kneearthroplasty".attending, "rc_kneearthroplasty".fellow_or_pa, "rc_kneearthroplasty".laterality, "rc_kneearthroplasty".surgery_date FROM "rc_kneearthroplasty" ORDER BY "rc_kneearthroplasty".id""",
+        """INSERT INTO rc_case_index (procedure_type, case_id, encounter_id, mrn, attending, fellow_or_pa, laterality, surgery_date) SELECT 'other', "rc_other".id, "rc_other".encounter_id, coalesce("rc_other".mrn, (SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id WHERE encounter.id = "rc_other".encounter_id)), "rc_other".attending, "rc_other".fellow_or_pa, "rc_other".laterality, "rc_other".surgery_date FROM "rc_other" ORDER BY "rc_other".id""",
+    ],
+}
+
+DOWNGRADE = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_rotatorcuff_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_rotatorcuff_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_rotatorcuff_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_kneescope_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_kneescope_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_kneescope_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderscope_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderscope_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderscope_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderarthroplasty_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderarthroplasty_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderarthroplasty_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_hipscope_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_hipscope_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_hipscope_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_hiparthroplasty_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_hiparthroplasty_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_hiparthroplasty_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_kneearthroplasty_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_kneearthroplasty_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_kneearthroplasty_au",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_other_ai",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_other_ad",
+        "DROP TRIGGER IF EXISTS rc_case_index_rc_other_au",
+    ],
+    "postgresql": [
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_rotatorcuff ON "rc_rotatorcuff"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_rotatorcuff()",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_kneescope ON "rc_kneescope"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_kneescope()",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderscope ON "rc_shoulderscope"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_shoulderscope()",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_shoulderarthroplasty ON "rc_shoulderarthroplasty"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_shoulderarthroplasty()",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_hipscope ON "rc_hipscope"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_hipscope()",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_hiparthroplasty ON "rc_hiparthroplasty"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_hiparthroplasty()",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_kneearthroplasty ON "rc_kneearthroplasty"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_kneearthroplasty()",
+        'DROP TRIGGER IF EXISTS rc_case_index_rc_other ON "rc_other"',
+        "DROP FUNCTION IF EXISTS rc_case_index_sync_rc_other()",
+    ],
+}
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    bind = op.get_bind()
+    for statement in statements.get(bind.dialect.name, []):
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    op.create_table('rc_case_index',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('procedure_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('case_id', sa.Integer(), nullable=False),
+    sa.Column('encounter_id', sa.Integer(), nullable=False),
+    sa.Column('mrn', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+    sa.Column('attending', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('fellow_or_pa', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('laterality', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('surgery_date', sa.Date(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_rc_case_index_case', 'rc_case_index', ['procedure_type', 'case_id'], unique=True)
+    op.create_index('ix_rc_case_index_type_date', 'rc_case_index', ['procedure_type', 'surgery_date'], unique=False)
+    op.create_index('ix_rc_case_index_attending_date', 'rc_case_index', ['attending', 'surgery_date'], unique=False)
+    op.create_index('ix_rc_case_index_fellow_date', 'rc_case_index', ['fellow_or_pa', 'surgery_date'], unique=False)
+    op.create_index('ix_rc_case_index_surgery_date', 'rc_case_index', ['surgery_date'], unique=False)
+    op.create_index(op.f('ix_rc_case_index_encounter_id'), 'rc_case_index', ['encounter_id'], unique=False)
+    op.create_index(op.f('ix_rc_case_index_mrn'), 'rc_case_index', ['mrn'], unique=False)
+    # Triggers on every rc_* table; the index is populated from existing cases
+    _execute(UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(DOWNGRADE)
+    op.drop_index(op.f('ix_rc_case_index_mrn'), table_name='rc_case_index')
+    op.drop_index(op.f('ix_rc_case_index_encounter_id'), table_name='rc_case_index')
+    op.drop_index('ix_rc_case_index_surgery_date', table_name='rc_case_index')
+    op.drop_index('ix_rc_case_index_fellow_date', table_name='rc_case_index')
+    op.drop_index('ix_rc_case_index_attending_date', table_name='rc_case_index')
+    op.drop_index('ix_rc_case_index_type_date', table_name='rc_case_index')
+    op.drop_index('ix_rc_case_index_case', table_name='rc_case_index')
+    op.drop_table('rc_case_index')
@@ -0,0 +1,109 @@
+"""Add caseload rollups
+
+Revision ID: f3a7d1c08e52
+Revises: e6b0c3d9f214
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7d1c08e52'
+down_revision: Union[str, None] = 'e6b0c3d9f214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Change-timestamp indexes as app.db.caseload defined them at this revision
+UPGRADE = {
+    "sqlite": [
+        'CREATE INDEX IF NOT EXISTS ix_rc_rotatorcuff_changed_at ON "rc_rotatorcuff" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_kneescope_changed_at ON "rc_kneescope" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_shoulderscope_changed_at ON "rc_shoulderscope" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_shoulderarthroplasty_changed_at ON "rc_shoulderarthroplasty" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_hipscope_changed_at ON "rc_hipscope" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_hiparthroplasty_changed_at ON "rc_hiparthroplasty" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_kneearthroplasty_changed_at ON "rc_kneearthroplasty" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_other_changed_at ON "rc_other" (coalesce(updated_at, created_at))',
+    ],
+    "postgresql": [
+        'CREATE INDEX IF NOT EXISTS ix_rc_rotatorcuff_changed_at ON "rc_rotatorcuff" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_kneescope_changed_at ON "rc_kneescope" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_shoulderscope_changed_at ON "rc_shoulderscope" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_shoulderarthroplasty_changed_at ON "rc_shoulderarthroplasty" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_hipscope_changed_at ON "rc_hipscope" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_hiparthroplasty_changed_at ON "rc_hiparthroplasty" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_kneearthroplasty_changed_at ON "rc_kneearthroplasty" (coalesce(updated_at, created_at))',
+        'CREATE INDEX IF NOT EXISTS ix_rc_other_changed_at ON "rc_other" (coalesce(updated_at, created_at))',
+    ],
+}
+
+DOWNGRADE = {
+    "sqlite": [
+        "DROP INDEX IF EXISTS ix_rc_rotatorcuff_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_kneescope_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_shoulderscope_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_shoulderarthroplasty_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_hipscope_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_hiparthroplasty_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_kneearthroplasty_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_other_changed_at",
+    ],
+    "postgresql": [
+        "DROP INDEX IF EXISTS ix_rc_rotatorcuff_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_kneescope_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_shoulderscope_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_shoulderarthroplasty_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_hipscope_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_hiparthroplasty_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_kneearthroplasty_changed_at",
+        "DROP INDEX IF EXISTS ix_rc_other_changed_at",
+    ],
+}
+
+
+def _execute(statements: dict[str, list[str]]) -> None:
+    bind = op.get_bind()
+    for statement in statements.get(bind.dialect.name, []):
+        bind.exec_driver_sql(statement)
+
+
+def upgrade() -> None:
+    op.create_table('caseload_rollup',
+    sa.Column('role', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('person', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('procedure_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('month', sqlmodel.sql.sqltypes.AutoString(length=7), nullable=False),
+    sa.Column('case_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('role', 'person', 'procedure_type', 'month')
+    )
+    op.create_table('caseload_case',
+    sa.Column('procedure_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('case_id', sa.Integer(), nullable=False),
+    sa.Column('attending', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('fellow_or_pa', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('month', sqlmodel.sql.sqltypes.AutoString(length=7), nullable=False),
+    sa.PrimaryKeyConstraint('procedure_type', 'case_id')
+    )
+    op.create_table('caseload_watermark',
+    sa.Column('procedure_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('high_water', sa.DateTime(), nullable=True),
+    sa.Column('case_count', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('procedure_type')
+    )
+    # Change-timestamp indexes on every rc_* table. The rollups start empty: with
+    # no watermark the app's first periodic refresh counts every case, or run
+    # `python -m app.cli caseload-refresh --full`
+    _execute(UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(DOWNGRADE)
+    op.drop_table('caseload_watermark')
+    op.drop_table('caseload_case')
+    op.drop_table('caseload_rollup')
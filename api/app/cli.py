@@ -0,0 +1,143 @@
+"""
+Maintenance commands for the SurgeonTrainer database
+
+Usage (from api/):
+    python -m app.cli search-backfill
+    python -m app.cli match-keys-backfill
+    python -m app.cli stats-reconcile
+    python -m app.cli case-index-rebuild
+    python -m app.cli caseload-refresh [--full]
+    python -m app.cli export [TABLE ...] [--format parquet|arrow] [--out DIR] [--chunk-rows N]
+    python -m app.cli index-advisor [--check] [--emit-migration]
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+from app.db import case_index, caseload, export, fulltext, stats
+from app.db.core import RoutingSession, create_db_and_tables, engine, read_engine
+from app.db.crud import patient as patient_crud
+
+
+def search_backfill(args: argparse.Namespace) -> None:
+    """Create any missing full-text indexes and rebuild them from existing rows"""
+    create_db_and_tables()
+    with engine.begin() as connection:
+        patients = fulltext.backfill_patient_search(connection)
+        entries = fulltext.backfill_clinical_text_search(connection)
+    print(f"Patient search index rebuilt over {patients} patients")
+    print(f"Clinical text index rebuilt with {entries} entries")
+
+
+def match_keys_backfill(args: argparse.Namespace) -> None:
+    """Recompute patient matching keys (normalized MRN, phonetic names)"""
+    with RoutingSession() as session:
+        count = patient_crud.backfill_match_keys(session)
+    print(f"Matching keys recomputed for {count} patients")
+
+
+def stats_reconcile(args: argparse.Namespace) -> None:
+    """Rebuild the stats counters from the source tables"""
+    create_db_and_tables()
+    with engine.begin() as connection:
+        buckets = stats.reconcile(connection)
+    print(f"Stats counters rebuilt: {buckets} buckets")
+
+
+def case_index_rebuild(args: argparse.Namespace) -> None:
+    """Repopulate the cross-procedure research case index from every rc_* table"""
+    create_db_and_tables()
+    with engine.begin() as connection:
+        cases = case_index.rebuild_case_index(connection)
+    print(f"Research case index rebuilt over {cases} cases")
+
+
+def caseload_refresh(args: argparse.Namespace) -> None:
+    """Apply rc_* changes since the last refresh to the caseload rollups"""
+    create_db_and_tables()
+    read = caseload.refresh(full=args.full)
+    print(f"Caseload rollups refreshed from {sum(read.values())} changed cases")
+
+
+def export_tables(args: argparse.Namespace) -> None:
+    """Write tables as Parquet files or Arrow IPC streams, one file per table"""
+    unknown = sorted(set(args.tables) - set(export.EXPORT_TABLES))
+    if unknown:
+        sys.exit(f"Unknown export tables: {', '.join(unknown)}")
+    try:
+        export.require_pyarrow()
+    except export.ExportUnavailable as exc:
+        sys.exit(str(exc))
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    extension = export.EXPORT_FORMATS[args.format][1]
+    with read_engine.connect() as connection:
+        for table in args.tables or sorted(export.EXPORT_TABLES):
+            path = out / f"{table}.{extension}"
+            rows = export.export_table(connection, table, str(path), args.format, args.chunk_rows)
+            print(f"{table}: {rows} rows -> {path}")
+
+
+def index_advisor(args: argparse.Namespace) -> None:
+    """EXPLAIN the hot CRUD queries and propose indexes for any that scan or sort"""
+    from app.db import index_advisor as advisor
+
+    create_db_and_tables()
+    findings = advisor.analyze(engine)
+    proposals = list(dict.fromkeys(p for finding in findings for p in finding.proposals))
+    problems = [finding for finding in findings if finding.issues]
+
+    for finding in problems:
+        print(f"{finding.query}:")
+        for issue in finding.issues:
+            print(f"  {issue.kind} on {issue.table} ({issue.detail})")
+        for proposal in finding.proposals:
+            print(f"  proposed: {proposal.ddl(engine.dialect.name)}")
+    print(f"{len(findings)} statements explained, {len(problems)} with scans or sorts, "
+          f"{len(proposals)} indexes proposed")
+
+    if args.emit_migration and proposals:
+        print(f"Migration written to {advisor.emit_migration(proposals)}")
+    if args.check and any(issue.kind == "full scan" for finding in problems for issue in finding.issues):
+        sys.exit(1)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="SurgeonTrainer maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("search-backfill", help=search_backfill.__doc__)
+    backfill.set_defaults(handler=search_backfill)
+
+    match_keys = commands.add_parser("match-keys-backfill", help=match_keys_backfill.__doc__)
+    match_keys.set_defaults(handler=match_keys_backfill)
+
+    reconcile = commands.add_parser("stats-reconcile", help=stats_reconcile.__doc__)
+    reconcile.set_defaults(handler=stats_reconcile)
+
+    rebuild = commands.add_parser("case-index-rebuild", help=case_index_rebuild.__doc__)
+    rebuild.set_defaults(handler=case_index_rebuild)
+
+    refresh = commands.add_parser("caseload-refresh", help=caseload_refresh.__doc__)
+    refresh.add_argument("--full", action="store_true", help="recount every case instead of only changes")
+    refresh.set_defaults(handler=caseload_refresh)
+
+    dump = commands.add_parser("export", help=export_tables.__doc__)
+    dump.add_argument("tables", nargs="*", metavar="TABLE", help="tables to export (default: all)")
+    dump.add_argument("--format", choices=sorted(export.EXPORT_FORMATS), default="parquet")
+    dump.add_argument("--out", default="export", help="output directory")
+    dump.add_argument("--chunk-rows", type=int, default=None, help="rows per row group / record batch")
+    dump.set_defaults(handler=export_tables)
+
+    advisor = commands.add_parser("index-advisor", help=index_advisor.__doc__)
+    advisor.add_argument("--check", action="store_true", help="exit 1 if any hot query does a full table scan")
+    advisor.add_argument("--emit-migration", action="store_true", help="write the proposals as an Alembic migration")
+    advisor.set_defaults(handler=index_advisor)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Response compression - gzip, brotli or zstd negotiated from Accept-Encoding
+
+An ASGI middleware rather than BaseHTTPMiddleware, so streamed responses
+(NDJSON/CSV lists, exports) are compressed chunk by chunk as they are sent:
+each chunk is flushed to the client instead of waiting for the whole body.
+Bodies sent in one piece below COMPRESSION_MINIMUM_SIZE go out as they are.
+gzip is always available; brotli and zstd need the "compression" extra and
+are skipped, with a warning, when configured but not installed.
+"""
+import functools
+import logging
+import zlib
+from typing import Any, Callable, Iterable, Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bodies of these types are compressed; images, Parquet and the like already are
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/vnd.apache.arrow.stream")
+
+
+class Compressor(Protocol):
+    """One response's stream; flush() emits everything so far in a form the client can decode on its own"""
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._stream = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._stream.compress(data)
+
+    def flush(self) -> bytes:
+        return self._stream.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._stream.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        import brotli
+        self._stream = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._stream.process(data)
+
+    def flush(self) -> bytes:
+        return self._stream.flush()
+
+    def finish(self) -> bytes:
+        return self._stream.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        import zstandard
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._stream = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._stream.compress(data)
+
+    def flush(self) -> bytes:
+        return self._stream.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._stream.flush()
+
+
+# Content-Encoding -> (compressor class taking a level, module it needs, setting holding the level)
+CODECS: dict[str, tuple[Callable[[int], Compressor], Optional[str], str]] = {
+    "gzip": (_Gzip, None, "compression_gzip_level"),
+    "br": (_Brotli, "brotli", "compression_brotli_quality"),
+    "zstd": (_Zstd, "zstandard", "compression_zstd_level"),
+}
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def codec_factories(names: Optional[Iterable[str]] = None) -> dict[str, Callable[[], Compressor]]:
+    """Content-Encoding -> compressor factory at the configured level, in server preference order"""
+    if names is None:
+        names = [name.strip() for name in settings.compression_codecs.split(",") if name.strip()]
+    factories = {}
+    for name in names:
+        if name not in CODECS:
+            raise ValueError(f"Unknown compression codec: {name}")
+        codec, module, level_setting = CODECS[name]
+        if module is not None and not _installed(module):
+            logger.warning("%s compression needs %s: pip install 'surgeontrainer-api[compression]'", name, module)
+            continue
+        factories[name] = functools.partial(codec, getattr(settings, level_setting))
+    return factories
+
+
+def choose_encoding(accept_encoding: str, codecs: Iterable[str]) -> Optional[str]:
+    """The client's highest-q codec among ours; ties go to the earlier (server-preferred) one"""
+    ranks: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name:
+            ranks[name.lower()] = quality
+    best, best_quality = None, 0.0
+    for codec in codecs:
+        quality = ranks.get(codec, ranks.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+def _compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses with the best codec the client accepts"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        codecs: Optional[dict[str, Callable[[], Compressor]]] = None,
+        minimum_size: Optional[int] = None
+    ):
+        self.app = app
+        self.codecs = codec_factories() if codecs is None else codecs
+        self.minimum_size = settings.compression_minimum_size if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.codecs:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        responder = _Responder(send, encoding, self.codecs.get(encoding), self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _Responder:
+    """send() wrapper deciding on the first body chunk whether the response gets compressed"""
+
+    def __init__(self, send: Send, encoding: Optional[str], factory: Any, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.factory = factory
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor: Optional[Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message  # held until the first body chunk shows the size
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        if self.passthrough:
+            await self.send(message)
+            return
+        if self.compressor is None:
+            await self._first_chunk(message)
+            return
+        body, more = message.get("body", b""), message.get("more_body", False)
+        data = self.compressor.compress(body) + (self.compressor.flush() if more else self.compressor.finish())
+        await self.send({"type": "http.response.body", "body": data, "more_body": more})
+
+    async def _first_chunk(self, message: Message) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        body, more = message.get("body", b""), message.get("more_body", False)
+        if not _compressible(headers) or self.start["status"] in (204, 304):
+            self.passthrough = True
+        else:
+            headers.add_vary_header("Accept-Encoding")
+            self.passthrough = self.encoding is None or (not more and len(body) < self.minimum_size)
+        if self.passthrough:
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        self.compressor = self.factory()
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The encoded bytes differ per codec, so the validator can only be weak
+            headers["ETag"] = "W/" + etag
+        if more:
+            del headers["Content-Length"]
+            data = self.compressor.compress(body) + self.compressor.flush()
+        else:
+            data = self.compressor.compress(body) + self.compressor.finish()
+            headers["Content-Length"] = str(len(data))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more})
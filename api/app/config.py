@@ -1,7 +1,7 @@
 """Application configuration."""
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -15,6 +15,59 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./surgeontrainer.db"
     
+    # SQLite engine profile (ignored for other databases)
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size: int = -64000  # negative = KiB, so ~64 MB per connection
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_read_pool_size: int = 8  # bounded pool of reader connections
+    sqlite_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    
+    # Async data path - routes run CRUD on aiosqlite/asyncpg instead of the threadpool
+    async_database: bool = False
+    async_database_url: Optional[str] = None  # derived from database_url when unset
+    
+    # Group commit - queue writes from many requests into one transaction per batch
+    write_batching: bool = False
+    write_batch_window_ms: float = 5.0
+    write_batch_max_ops: int = 64
+
+    # Bulk inserts - POST .../bulk
+    bulk_max_rows: int = 50000  # rows accepted per request
+    bulk_chunk_size: int = 1000  # rows per INSERT statement and commit
+
+    # Batches - POST /batch
+    batch_max_operations: int = 100  # operations accepted per request
+
+    # Caches - "memory" (per worker) or sqlite:///path/cache.db (shared by workers on a host)
+    cache_backend: str = "memory"
+    patient_cache_size: int = 10000  # entries per cache (MRN -> id, id -> patient); 0 disables
+    patient_cache_ttl: float = 300.0  # seconds
+    response_cache_size: int = 5000  # cached GET responses; 0 disables
+    response_cache_max_bytes: int = 64 * 1024 * 1024  # byte budget for cached response bodies
+    response_cache_ttl: float = 60.0  # seconds; also bounds staleness across workers with CACHE_BACKEND=memory
+
+    # Idempotency keys - POST with an Idempotency-Key header replays its first response
+    idempotency_max_keys: int = 100000  # keys remembered (LRU); 0 disables
+    idempotency_max_bytes: int = 64 * 1024 * 1024  # byte budget for stored responses
+    idempotency_ttl: float = 24 * 60 * 60  # seconds a key is remembered
+
+    # Caseload rollups - /analytics/caseload
+    caseload_refresh_seconds: float = 60.0  # background refresh interval; 0 disables
+    caseload_refresh_overlap_seconds: float = 300.0  # re-read window for late-committing writes
+
+    # Columnar export - /export and the export CLI (needs pyarrow)
+    export_chunk_rows: int = 5000  # rows per fetch and per Parquet row group / Arrow batch
+    export_parquet_compression: str = "zstd"
+
+    # Response compression - codecs in server preference order ("" disables); br/zstd need the compression extra
+    compression_codecs: str = "zstd,br,gzip"
+    compression_minimum_size: int = 1024  # bytes; smaller single-chunk bodies are sent as they are
+    compression_gzip_level: int = 6  # 1-9
+    compression_brotli_quality: int = 4  # 0-11
+    compression_zstd_level: int = 3  # 1-22
+    
     # Security
     jwt_secret: str = "change_me_in_production"
     jwt_algorithm: str = "HS256"
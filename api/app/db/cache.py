@@ -0,0 +1,317 @@
+"""
+Bounded LRU/TTL caches with pluggable storage
+
+CACHE_BACKEND=memory keeps entries in each worker process. A
+sqlite:///path/to/cache.db backend keeps them in one local SQLite file, so
+every uvicorn worker on the host shares entries and sees invalidations.
+Either backend can also be held to a byte budget (max_bytes).
+"""
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+
+class MemoryBackend:
+    """
+    In-process LRU; least recently used entries go first once max_entries is
+    reached or, with max_bytes, once the entries' declared sizes add up to more
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple[float, Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, size = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: int = 0) -> None:
+        with self._lock:
+            self._store(key, value, ttl, size)
+
+    def add(self, key: Hashable, value: Any, ttl: float, size: int = 0) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                return False
+            self._store(key, value, ttl, size)
+            return True
+
+    def _store(self, key: Hashable, value: Any, ttl: float, size: int) -> None:
+        # Caller holds the lock
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would evict everything else and still not fit
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[2]
+        self._entries[key] = (time.monotonic() + ttl, value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            self._bytes -= self._entries.popitem(last=False)[1][2]
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteBackend:
+    """
+    LRU in a local SQLite file shared by every worker process. Values are
+    pickled, so the file must be private to the deployment (it holds the same
+    data as the database). Each namespace gets its own table. Entry sizes are
+    the pickled lengths; max_entries and max_bytes are enforced every 256 writes.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int, max_bytes: Optional[int] = None):
+        self.path = path
+        self.table = "cache_" + "".join(ch if ch.isalnum() else "_" for ch in namespace)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self.evictions = 0
+        self._connection().execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection().execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at ON {self.table} (accessed_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")  # a lost cache entry is only a miss
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (repr(key),)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (repr(key),))
+            return None
+        connection.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, repr(key)))
+        return pickle.loads(row[0])
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: int = 0) -> None:
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (repr(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now + ttl, now),
+        )
+        self._writes += 1
+        if self._writes % 256 == 0:
+            self._trim(connection, now)
+
+    def add(self, key: Hashable, value: Any, ttl: float, size: int = 0) -> bool:
+        now = time.time()
+        connection = self._connection()
+        # An expired entry no longer holds the key; the primary key makes the insert the claim
+        connection.execute(f"DELETE FROM {self.table} WHERE key = ? AND expires_at < ?", (repr(key), now))
+        added = connection.execute(
+            f"INSERT OR IGNORE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (repr(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now + ttl, now),
+        ).rowcount == 1
+        if added:
+            self._writes += 1
+            if self._writes % 256 == 0:
+                self._trim(connection, now)
+        return added
+
+    def _trim(self, connection: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the least recently used beyond max_entries or max_bytes"""
+        connection.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (now,))
+        trimmed = connection.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        if self.max_bytes is not None:
+            trimmed += connection.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM ("
+                f"SELECT key, sum(length(value)) OVER (ORDER BY accessed_at DESC) AS total FROM {self.table}"
+                ") WHERE total > ?)",
+                (self.max_bytes,),
+            ).rowcount
+        self.evictions += max(trimmed, 0)
+
+    def delete(self, key: Hashable) -> None:
+        self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (repr(key),))
+
+    def clear(self) -> None:
+        self._connection().execute(f"DELETE FROM {self.table}")
+
+    def nbytes(self) -> int:
+        statement = f"SELECT coalesce(sum(length(value)), 0) FROM {self.table}"
+        return self._connection().execute(statement).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connection().execute(f"SELECT count(*) FROM {self.table}").fetchone()[0]
+
+
+class Cache:
+    """A named cache with a default TTL and hit/miss counters"""
+
+    def __init__(self, namespace: str, backend: Any, ttl: float):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: int = 0) -> None:
+        """size counts against the backend's max_bytes (the SQLite backend measures it itself)"""
+        self.backend.set(key, value, self.ttl if ttl is None else ttl, size)
+
+    def add(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: int = 0) -> bool:
+        """Set key only if it is absent or expired; True when this call set it (a claim on the key)"""
+        return self.backend.add(key, value, self.ttl if ttl is None else ttl, size)
+
+    def delete(self, *keys: Hashable) -> None:
+        for key in keys:
+            self.backend.delete(key)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """Counters for this worker; size is shared when the backend is"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.backend.evictions,
+            "size": len(self.backend),
+            "bytes": self.backend.nbytes(),
+        }
+
+
+def invalidate_after_commit(session: Session, cache: Cache, *keys: Hashable) -> None:
+    """
+    Drop keys now and again when session's transaction ends. The second pass
+    matters under group commit, where the write only becomes visible when the
+    whole batch commits and a concurrent read may have re-cached the old row.
+    """
+    cache.delete(*keys)
+    session.info.setdefault("cache_invalidations", []).append((cache, keys))
+
+
+_write_listeners: list[Callable[[str], None]] = []
+
+
+def on_table_write(listener: Callable[[str], None]) -> None:
+    """
+    Call listener(table_name) whenever a session writes to a table: at the
+    write and again when the transaction ends, for the same reason as
+    invalidate_after_commit. Covers the CRUD modules' INSERT/UPDATE/DELETE
+    statements as well as flushed ORM changes.
+    """
+    _write_listeners.append(listener)
+
+
+def _written(session: Session, table_names: set) -> None:
+    session.info.setdefault("written_tables", set()).update(table_names)
+    for table_name in table_names:
+        for listener in _write_listeners:
+            listener(table_name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(state: Any) -> None:
+    if _write_listeners and (state.is_insert or state.is_update or state.is_delete):
+        _written(state.session, {state.statement.table.name})
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session: Session, flush_context: Any) -> None:
+    if _write_listeners:
+        objects = [*session.new, *session.dirty, *session.deleted]
+        _written(session, {obj.__table__.name for obj in objects if hasattr(obj, "__table__")})
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _run_invalidations(session: Session, transaction: Any) -> None:
+    if transaction.parent is not None:
+        return
+    for cache, keys in session.info.pop("cache_invalidations", []):
+        cache.delete(*keys)
+    for table_name in session.info.pop("written_tables", ()):
+        for listener in _write_listeners:
+            listener(table_name)
+
+
+_caches: dict[str, Cache] = {}
+
+
+def create_cache(namespace: str, max_entries: int, ttl: float, max_bytes: Optional[int] = None) -> Cache:
+    """Build a cache on the configured backend and register it for stats"""
+    url = settings.cache_backend
+    if url == "memory":
+        backend = MemoryBackend(max_entries, max_bytes)
+    elif url.startswith("sqlite:///"):
+        backend = SqliteBackend(url[len("sqlite:///"):], namespace, max_entries, max_bytes)
+    else:
+        raise ValueError(f"Unsupported CACHE_BACKEND: {url}")
+    cache = Cache(namespace, backend, ttl)
+    _caches[namespace] = cache
+    return cache
+
+
+def cache_stats() -> dict:
+    """Stats for every registered cache, by namespace"""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
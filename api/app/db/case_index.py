@@ -0,0 +1,221 @@
+"""
+Research case index - rc_case_index rows mirrored from every rc_* table
+
+Each rc_* table has triggers that insert, update and delete its row in
+rc_case_index, so the cross-procedure index is current inside the same
+transaction as the case write, whichever path made it (single create, bulk
+insert, UPDATE ... RETURNING). The MRN falls back to the patient's when the
+case itself has none, so triggers on patient (MRN changes) and encounter
+(moved to another patient) refresh the MRN of the index rows below them.
+"""
+import logging
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+logger = logging.getLogger(__name__)
+
+INDEX_COLUMNS = ("encounter_id", "mrn", "attending", "fellow_or_pa", "laterality", "surgery_date")
+
+
+def _sources() -> list[tuple[str, str, str]]:
+    """(slug, table, surgery date column) for every research case table"""
+    return [
+        (slug, case_type.model.__tablename__, case_type.surgery_date)
+        for slug, case_type in RESEARCH_CASE_TYPES.items()
+    ]
+
+
+def _values(row: str, surgery_date: str) -> str:
+    """Index column values (INDEX_COLUMNS order) taken from a case row"""
+    patient_mrn = (
+        f"(SELECT patient.mrn FROM encounter JOIN patient ON patient.id = encounter.patient_id "
+        f"WHERE encounter.id = {row}.encounter_id)"
+    )
+    return (
+        f"{row}.encounter_id, coalesce({row}.mrn, {patient_mrn}), {row}.attending, "
+        f"{row}.fellow_or_pa, {row}.laterality, {row}.{surgery_date}"
+    )
+
+
+def _insert(slug: str, row: str, surgery_date: str) -> str:
+    return (
+        f"INSERT INTO rc_case_index (procedure_type, case_id, {', '.join(INDEX_COLUMNS)}) "
+        f"SELECT '{slug}', {row}.id, {_values(row, surgery_date)};\n"
+    )
+
+
+def _update(slug: str, old: str, new: str, surgery_date: str) -> str:
+    """Update in place so the index row keeps its id (the paging key)"""
+    return (
+        f"UPDATE rc_case_index SET (case_id, {', '.join(INDEX_COLUMNS)}) = "
+        f"(SELECT {new}.id, {_values(new, surgery_date)}) "
+        f"WHERE procedure_type = '{slug}' AND case_id = {old}.id;\n"
+    )
+
+
+def _delete(slug: str, row: str) -> str:
+    return f"DELETE FROM rc_case_index WHERE procedure_type = '{slug}' AND case_id = {row}.id;\n"
+
+
+def _refresh_mrn(encounters: str) -> str:
+    """Recompute the MRN of the index rows for cases on encounters (a SQL list or subquery)"""
+    statements = ""
+    for slug, table, _ in _sources():
+        statements += (
+            f"UPDATE rc_case_index SET mrn = (SELECT coalesce(rc.mrn, patient.mrn) FROM \"{table}\" AS rc "
+            f"JOIN encounter ON encounter.id = rc.encounter_id JOIN patient ON patient.id = encounter.patient_id "
+            f"WHERE rc.id = rc_case_index.case_id) "
+            f"WHERE procedure_type = '{slug}' AND encounter_id IN ({encounters});\n"
+        )
+    return statements
+
+
+# (table, column whose change moves the MRN, encounters affected by a changed row)
+_MRN_SOURCES = (
+    ("patient", "mrn", "SELECT id FROM encounter WHERE patient_id = {row}.id"),
+    ("encounter", "patient_id", "{row}.id"),
+)
+
+
+def _watched(surgery_date: str) -> str:
+    return ", ".join(("id", "encounter_id", "mrn", "attending", "fellow_or_pa", "laterality", surgery_date))
+
+
+def _sqlite_ddl() -> list[str]:
+    statements = []
+    for slug, table, surgery_date in _sources():
+        statements += [
+            f'CREATE TRIGGER IF NOT EXISTS rc_case_index_{table}_ai AFTER INSERT ON "{table}" BEGIN\n'
+            f"{_insert(slug, 'new', surgery_date)}END",
+            f'CREATE TRIGGER IF NOT EXISTS rc_case_index_{table}_ad AFTER DELETE ON "{table}" BEGIN\n'
+            f"{_delete(slug, 'old')}END",
+            f'CREATE TRIGGER IF NOT EXISTS rc_case_index_{table}_au AFTER UPDATE OF {_watched(surgery_date)} '
+            f'ON "{table}" BEGIN\n{_update(slug, "old", "new", surgery_date)}END',
+        ]
+    for table, column, encounters in _MRN_SOURCES:
+        statements.append(
+            f'CREATE TRIGGER IF NOT EXISTS rc_case_index_{table}_au AFTER UPDATE OF {column} ON "{table}" '
+            f"WHEN old.{column} IS NOT new.{column} BEGIN\n{_refresh_mrn(encounters.format(row='new'))}END"
+        )
+    return statements
+
+
+def _sqlite_drop() -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS rc_case_index_{table}_{suffix}"
+        for _, table, _ in _sources() for suffix in ("ai", "ad", "au")
+    ]
+
+
+def _pg_ddl() -> list[str]:
+    statements = []
+    for slug, table, surgery_date in _sources():
+        statements += [
+            f"""
+            CREATE OR REPLACE FUNCTION rc_case_index_sync_{table}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    {_insert(slug, 'NEW', surgery_date)}
+                ELSIF TG_OP = 'UPDATE' THEN
+                    {_update(slug, 'OLD', 'NEW', surgery_date)}
+                ELSE
+                    {_delete(slug, 'OLD')}
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            f'DROP TRIGGER IF EXISTS rc_case_index_{table} ON "{table}"',
+            f'CREATE TRIGGER rc_case_index_{table} AFTER INSERT OR DELETE OR UPDATE OF {_watched(surgery_date)} '
+            f'ON "{table}" FOR EACH ROW EXECUTE FUNCTION rc_case_index_sync_{table}()',
+        ]
+    for table, column, encounters in _MRN_SOURCES:
+        statements += [
+            f"""
+            CREATE OR REPLACE FUNCTION rc_case_index_sync_{table}() RETURNS trigger AS $$
+            BEGIN
+                {_refresh_mrn(encounters.format(row='NEW'))}
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            f'DROP TRIGGER IF EXISTS rc_case_index_{table} ON "{table}"',
+            f'CREATE TRIGGER rc_case_index_{table} AFTER UPDATE OF {column} ON "{table}" FOR EACH ROW '
+            f"WHEN (OLD.{column} IS DISTINCT FROM NEW.{column}) EXECUTE FUNCTION rc_case_index_sync_{table}()",
+        ]
+    return statements
+
+
+def _pg_drop() -> list[str]:
+    statements = []
+    for _, table, _ in _sources():
+        statements += [
+            f'DROP TRIGGER IF EXISTS rc_case_index_{table} ON "{table}"',
+            f"DROP FUNCTION IF EXISTS rc_case_index_sync_{table}()",
+        ]
+    return statements
+
+
+def install_case_index(connection: Connection) -> None:
+    """
+    Create the index triggers (idempotent). The index is rebuilt when the
+    triggers are new, judged by the newest one (the patient MRN trigger), so a
+    database indexed before that trigger existed gets its MRNs refreshed.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        created = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'rc_case_index_patient_au'"
+        ).first() is None
+        statements = _sqlite_ddl()
+    elif dialect == "postgresql":
+        created = connection.exec_driver_sql("SELECT to_regproc('rc_case_index_sync_patient')").scalar() is None
+        statements = _pg_ddl()
+    else:
+        logger.warning("No research case index triggers for %s", dialect)
+        return
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    if created:
+        rebuild_case_index(connection)
+
+
+def drop_case_index(connection: Connection) -> None:
+    """Remove the index triggers (the rc_case_index table itself is left to the caller)"""
+    drop_mrn_triggers(connection)
+    statements = {"sqlite": _sqlite_drop, "postgresql": _pg_drop}.get(connection.dialect.name, list)()
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def drop_mrn_triggers(connection: Connection) -> None:
+    """Remove only the patient and encounter triggers that refresh index MRNs"""
+    dialect = connection.dialect.name
+    for table, _, _ in _MRN_SOURCES:
+        if dialect == "sqlite":
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS rc_case_index_{table}_au")
+        elif dialect == "postgresql":
+            connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS rc_case_index_{table} ON "{table}"')
+            connection.exec_driver_sql(f"DROP FUNCTION IF EXISTS rc_case_index_sync_{table}()")
+
+
+def rebuild_case_index(connection: Connection) -> int:
+    """Repopulate rc_case_index from every rc_* table; returns rows indexed"""
+    if connection.dialect.name == "postgresql":
+        tables = ", ".join(f'"{table}"' for _, table, _ in _sources())
+        connection.exec_driver_sql(f"LOCK TABLE {tables} IN SHARE MODE")
+    connection.exec_driver_sql("DELETE FROM rc_case_index")
+    for slug, table, surgery_date in _sources():
+        row = f'"{table}"'
+        connection.exec_driver_sql(
+            f"INSERT INTO rc_case_index (procedure_type, case_id, {', '.join(INDEX_COLUMNS)}) "
+            f"SELECT '{slug}', {row}.id, {_values(row, surgery_date)} FROM {row} ORDER BY {row}.id"
+        )
+    return connection.exec_driver_sql("SELECT count(*) FROM rc_case_index").scalar_one()
+
+
+def install(engine: Engine) -> None:
+    """Create the triggers that keep rc_case_index current"""
+    with engine.begin() as connection:
+        install_case_index(connection)
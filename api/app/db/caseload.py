@@ -0,0 +1,241 @@
+"""
+Caseload rollups - monthly case counts per attending / fellow_or_pa and procedure type
+
+A refresh reads only the rc_* rows whose coalesce(updated_at, created_at)
+is at or past that table's high-water mark, less an overlap window for
+transactions that committed after a later-stamped one. Each changed case is
+moved out of the buckets it was last counted in (caseload_case) and into its
+current ones, so re-reading a row inside the overlap is harmless. Deletes
+leave no timestamp behind: when a table's row count (from stat_counter) no
+longer matches the cases counted for it, the refresh diffs ids as well.
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+import anyio
+from sqlalchemy import delete as sa_delete, exists, func, insert as sa_insert, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.db.crud import stats as stats_crud
+from app.db.models.caseload import CaseloadCase, CaseloadRollup, CaseloadWatermark
+from app.db.research_cases import RESEARCH_CASE_TYPES, ResearchCaseType
+
+logger = logging.getLogger(__name__)
+
+ROLES = ("attending", "fellow_or_pa")
+UNKNOWN_MONTH = "unknown"
+REFRESH_CHUNK = 1000
+REFRESH_LOCK_KEY = 0x6361_7365  # pg_advisory_xact_lock key serializing refreshes
+
+
+def _changed_at(model: Any) -> Any:
+    return func.coalesce(model.updated_at, model.created_at)
+
+
+def _month(value: Optional[date]) -> str:
+    return value.strftime("%Y-%m") if value else UNKNOWN_MONTH
+
+
+def install_caseload(connection: Connection) -> None:
+    """Index every rc_* table on its change timestamp so a refresh reads only what changed"""
+    for case_type in RESEARCH_CASE_TYPES.values():
+        table = case_type.model.__tablename__
+        connection.exec_driver_sql(
+            f'CREATE INDEX IF NOT EXISTS ix_{table}_changed_at ON "{table}" (coalesce(updated_at, created_at))'
+        )
+
+
+def drop_caseload(connection: Connection) -> None:
+    """Remove the change-timestamp indexes"""
+    for case_type in RESEARCH_CASE_TYPES.values():
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS ix_{case_type.model.__tablename__}_changed_at")
+
+
+def _lock(session: Session) -> None:
+    """Serialize refreshes; two concurrent ones would both apply the same deltas"""
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY})
+    else:
+        # SQLite: the writer connection opens transactions with BEGIN IMMEDIATE
+        session.connection()
+
+
+def _count(
+    deltas: Counter,
+    slug: str,
+    attending: Optional[str],
+    fellow_or_pa: Optional[str],
+    month: str,
+    n: int
+) -> None:
+    for role, person in zip(ROLES, (attending, fellow_or_pa)):
+        if person:
+            deltas[(role, person, slug, month)] += n
+
+
+def _apply_rows(session: Session, case_type: ResearchCaseType, rows: list, deltas: Counter) -> int:
+    """Recount changed (id, attending, fellow_or_pa, surgery date) rows; returns cases newly counted"""
+    slug = case_type.slug
+    ids = [row[0] for row in rows]
+    previous = {
+        case.case_id: case for case in session.exec(
+            select(CaseloadCase).where(CaseloadCase.procedure_type == slug, CaseloadCase.case_id.in_(ids))
+        )
+    }
+    snapshots = []
+    for case_id, attending, fellow_or_pa, surgery_date in rows:
+        month = _month(surgery_date)
+        old = previous.get(case_id)
+        if old is not None:
+            if (old.attending, old.fellow_or_pa, old.month) == (attending, fellow_or_pa, month):
+                continue
+            _count(deltas, slug, old.attending, old.fellow_or_pa, old.month, -1)
+        _count(deltas, slug, attending, fellow_or_pa, month, 1)
+        snapshots.append({
+            "procedure_type": slug, "case_id": case_id,
+            "attending": attending, "fellow_or_pa": fellow_or_pa, "month": month,
+        })
+    if snapshots:
+        changed = [snapshot["case_id"] for snapshot in snapshots]
+        session.execute(
+            sa_delete(CaseloadCase).where(CaseloadCase.procedure_type == slug, CaseloadCase.case_id.in_(changed))
+        )
+        session.execute(sa_insert(CaseloadCase), snapshots)
+    return sum(1 for snapshot in snapshots if snapshot["case_id"] not in previous)
+
+
+def _remove_cases(session: Session, slug: str, cases: list[CaseloadCase], deltas: Counter) -> None:
+    for case in cases:
+        _count(deltas, slug, case.attending, case.fellow_or_pa, case.month, -1)
+    session.execute(
+        sa_delete(CaseloadCase).where(
+            CaseloadCase.procedure_type == slug, CaseloadCase.case_id.in_([case.case_id for case in cases])
+        )
+    )
+
+
+def _refresh_table(
+    session: Session,
+    case_type: ResearchCaseType,
+    mark: Optional[CaseloadWatermark],
+    deltas: Counter
+) -> tuple[int, Optional[datetime], int]:
+    """Apply one table's changes; returns (rows read, new high-water mark, cases counted)"""
+    model = case_type.model
+    changed_at = _changed_at(model)
+    columns = (model.id, model.attending, model.fellow_or_pa, getattr(model, case_type.surgery_date))
+    high_water = mark.high_water if mark else None
+    counted = mark.case_count if mark else 0
+
+    criteria = []
+    if high_water is not None:
+        criteria.append(changed_at >= high_water - timedelta(seconds=settings.caseload_refresh_overlap_seconds))
+    read = 0
+    last_id = 0
+    while True:
+        chunk = session.execute(
+            select(*columns, changed_at)
+            .where(model.id > last_id, *criteria)
+            .order_by(model.id)
+            .limit(REFRESH_CHUNK)
+        ).all()
+        if not chunk:
+            break
+        counted += _apply_rows(session, case_type, [row[:4] for row in chunk], deltas)
+        latest = max(row[4] for row in chunk)
+        high_water = latest if high_water is None else max(high_water, latest)
+        read += len(chunk)
+        last_id = chunk[-1][0]
+
+    # Deletes (and rows committed too late for the overlap) only show up as a count mismatch
+    metric = f"{model.__tablename__}.month"
+    rows = sum(stats_crud.get_counts(session, metric)[metric].values())
+    if rows != counted:
+        removed = session.exec(
+            select(CaseloadCase).where(
+                CaseloadCase.procedure_type == case_type.slug,
+                ~exists().where(model.id == CaseloadCase.case_id)
+            )
+        ).all()
+        if removed:
+            _remove_cases(session, case_type.slug, removed, deltas)
+        missed = session.execute(
+            select(*columns).where(
+                ~exists().where(CaseloadCase.procedure_type == case_type.slug, CaseloadCase.case_id == model.id)
+            )
+        ).all()
+        if missed:
+            counted += _apply_rows(session, case_type, missed, deltas)
+        counted -= len(removed)
+        read += len(missed) + len(removed)
+    return read, high_water, counted
+
+
+def _apply_deltas(session: Session, deltas: Counter) -> None:
+    for (role, person, slug, month), delta in deltas.items():
+        if not delta:
+            continue
+        bucket = session.get(CaseloadRollup, (role, person, slug, month))
+        if bucket is None:
+            if delta > 0:
+                session.add(CaseloadRollup(
+                    role=role, person=person, procedure_type=slug, month=month, case_count=delta
+                ))
+        elif bucket.case_count + delta <= 0:
+            session.delete(bucket)
+        else:
+            bucket.case_count += delta
+
+
+def refresh_caseload(session: Session, full: bool = False) -> dict[str, int]:
+    """
+    Bring the rollup up to date in one transaction; full=True recounts from
+    scratch. Returns rows read per procedure type.
+    """
+    _lock(session)
+    if full:
+        for model in (CaseloadRollup, CaseloadCase, CaseloadWatermark):
+            session.execute(sa_delete(model))
+    marks = {mark.procedure_type: mark for mark in session.exec(select(CaseloadWatermark))}
+
+    deltas: Counter = Counter()
+    read = {}
+    now = datetime.utcnow()
+    for slug, case_type in RESEARCH_CASE_TYPES.items():
+        read[slug], high_water, counted = _refresh_table(session, case_type, marks.get(slug), deltas)
+        mark = marks.get(slug) or CaseloadWatermark(procedure_type=slug)
+        mark.high_water, mark.case_count, mark.refreshed_at = high_water, counted, now
+        session.add(mark)
+    _apply_deltas(session, deltas)
+    session.commit()
+    return read
+
+
+def refresh(full: bool = False) -> dict[str, int]:
+    """Run a refresh in its own session"""
+    from app.db.core import RoutingSession
+
+    with RoutingSession() as session:
+        return refresh_caseload(session, full=full)
+
+
+async def refresh_periodically(interval: float) -> None:
+    """Background loop started by the app lifespan"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            read = await anyio.to_thread.run_sync(refresh)
+            logger.debug("Caseload refresh read %s rows", sum(read.values()))
+        except Exception:
+            logger.exception("Caseload refresh failed")
+
+
+def install(engine: Engine) -> None:
+    """Create the indexes incremental refreshes read through"""
+    with engine.begin() as connection:
+        install_caseload(connection)
@@ -1,20 +1,92 @@
 """
 Database core module - Connection management and session handling
 """
+from fastapi import Request
 from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy.pool import StaticPool
-from typing import Generator
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from functools import partial
+from typing import Any, AsyncGenerator, Callable, Generator, Optional, TypeVar
+import anyio
+import asyncio
 from ..config import settings
+from .write_coordinator import GroupCommitMixin, WriteCoordinator
+
+T = TypeVar("T")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    """True for in-memory SQLite URLs, which cannot be shared across a pool"""
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _apply_sqlite_pragmas(engine: Engine, read_only: bool = False) -> None:
+    """Tune every new SQLite connection as soon as the pool opens it"""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA cache_size={settings.sqlite_cache_size}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        if read_only:
+            # Guard rail: a write routed to a reader fails loudly instead of
+            # contending with the writer connection for the database lock
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    if not read_only:
+        # pysqlite defers BEGIN until the first DML statement, which breaks
+        # SAVEPOINTs; take over transaction control and grab the write lock
+        # up front since this connection is the only writer anyway
+        @event.listens_for(engine, "connect")
+        def _disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _create_sqlite_engine(url: str, pool_size: int, read_only: bool = False) -> Engine:
+    """Create a bounded SQLite engine with the configured pragmas"""
+    sqlite_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=settings.sqlite_pool_timeout,
+        echo=settings.debug
+    )
+    _apply_sqlite_pragmas(sqlite_engine, read_only=read_only)
+    return sqlite_engine
+
 
 # Create engine with connection pooling
-if settings.database_url.startswith("sqlite"):
-    # SQLite-specific configuration
+if settings.database_url.startswith("sqlite") and _is_sqlite_memory(settings.database_url):
+    # In-memory SQLite only exists on a single connection
     engine = create_engine(
         settings.database_url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
         echo=settings.debug
     )
+    read_engine = engine
+elif settings.database_url.startswith("sqlite"):
+    # SQLite allows one writer at a time, so all writes share a single
+    # connection while reads fan out over a bounded WAL reader pool
+    engine = _create_sqlite_engine(settings.database_url, pool_size=1)
+    read_engine = _create_sqlite_engine(
+        settings.database_url,
+        pool_size=settings.sqlite_read_pool_size,
+        read_only=True
+    )
 else:
     # PostgreSQL or other databases
     engine = create_engine(
@@ -24,11 +96,117 @@ else:
         max_overflow=20,
         echo=settings.debug
     )
+    read_engine = engine
+
+
+def _async_database_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgres:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+
+def _create_async_engines(url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """Create (writer, reader) async engines mirroring the sync profile"""
+    if url.startswith("sqlite") and _is_sqlite_memory(url):
+        memory_engine = create_async_engine(url, poolclass=StaticPool, echo=settings.debug)
+        return memory_engine, memory_engine
+    if url.startswith("sqlite"):
+        engines = []
+        for pool_size, read_only in ((1, False), (settings.sqlite_read_pool_size, True)):
+            sqlite_engine = create_async_engine(
+                url,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=pool_size,
+                max_overflow=0,
+                pool_timeout=settings.sqlite_pool_timeout,
+                echo=settings.debug
+            )
+            _apply_sqlite_pragmas(sqlite_engine.sync_engine, read_only=read_only)
+            engines.append(sqlite_engine)
+        return engines[0], engines[1]
+    pg_engine = create_async_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        echo=settings.debug
+    )
+    return pg_engine, pg_engine
+
+
+# Async engines only exist when the async data path is switched on, so the
+# async drivers (aiosqlite/asyncpg) stay optional for sync deployments
+async_engine: Optional[AsyncEngine] = None
+async_read_engine: Optional[AsyncEngine] = None
+if settings.async_database:
+    async_engine, async_read_engine = _create_async_engines(
+        settings.async_database_url or _async_database_url(settings.database_url)
+    )
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the reader engine and everything else
+    (flushes, INSERT/UPDATE/DELETE, DDL, raw SQL) to the writer engine.
+    Once a transaction has touched the writer, its remaining reads stay on the
+    writer so they see their own uncommitted changes.
+    """
+
+    def __init__(self, *args, writer: Engine = None, reader: Engine = None, **kwargs):
+        # CRUD writes return rows via RETURNING; don't expire them on commit
+        # or serializing the response would re-SELECT every row
+        kwargs.setdefault("expire_on_commit", False)
+        super().__init__(*args, **kwargs)
+        self._writer = writer if writer is not None else engine
+        self._reader = reader if reader is not None else read_engine
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            not self._wrote
+            and not self._flushing
+            and clause is not None
+            and clause.is_select
+        ):
+            return self._reader
+        self._wrote = True
+        return self._writer
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session, transaction):
+    """Release writer stickiness when the outermost transaction ends"""
+    if transaction.parent is None:
+        session._wrote = False
+
+
+class GroupCommitSession(GroupCommitMixin, RoutingSession):
+    """Writer session shared by all units in a write-coordinator batch"""
+
+
+# Opt-in group commit; units still see their own writes via writer stickiness
+write_coordinator: Optional[WriteCoordinator] = None
+if settings.write_batching:
+    write_coordinator = WriteCoordinator(
+        GroupCommitSession,
+        window_ms=settings.write_batch_window_ms,
+        max_batch=settings.write_batch_max_ops
+    )
 
 
 def create_db_and_tables():
-    """Create all tables in the database"""
+    """Create all tables in the database, plus the trigger-maintained indexes and counters over them"""
+    from . import case_index, caseload, fulltext, models, stats, versions  # noqa: F401 - registers every table
+
     SQLModel.metadata.create_all(engine)
+    fulltext.install(engine)
+    stats.install(engine)
+    case_index.install(engine)
+    caseload.install(engine)
+    versions.install(engine)
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -36,5 +214,69 @@ def get_session() -> Generator[Session, None, None]:
     Dependency to get database session
     Usage: db: Session = Depends(get_session)
     """
-    with Session(engine) as session:
+    with RoutingSession() as session:
         yield session
+
+
+class Database:
+    """
+    Awaitable handle used by async routes to run CRUD functions.
+    CRUD functions keep their sync (session, ...) signature: on the async path
+    they run on the AsyncSession's greenlet via run_sync, otherwise they run
+    in a worker thread against a regular RoutingSession.
+    """
+
+    def __init__(self, session: Session | AsyncSession, coordinated: bool = True):
+        self.session = session
+        self.coordinated = coordinated  # False keeps write() on this session (POST /batch)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn(session, *args, **kwargs) without blocking the event loop"""
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await anyio.to_thread.run_sync(partial(fn, self.session, *args, **kwargs))
+
+    async def write(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Like run(), but routed through the write coordinator when batching is on"""
+        if write_coordinator is not None and self.coordinated:
+            return await asyncio.wrap_future(write_coordinator.submit(fn, *args, **kwargs))
+        return await self.run(fn, *args, **kwargs)
+
+
+async def get_database(request: Request) -> AsyncGenerator[Database, None]:
+    """
+    Dependency to get an awaitable database handle
+    Usage: db: Database = Depends(get_database)
+    Operations run by POST /batch share the batch's handle instead.
+    """
+    shared = request.scope.get("batch_database")
+    if shared is not None:
+        yield shared
+        return
+    if async_engine is not None:
+        async with AsyncSession(
+            sync_session_class=RoutingSession,
+            writer=async_engine.sync_engine,
+            reader=async_read_engine.sync_engine,
+            expire_on_commit=False
+        ) as session:
+            yield Database(session)
+    else:
+        session = RoutingSession()
+        try:
+            yield Database(session)
+        finally:
+            await anyio.to_thread.run_sync(session.close)
+
+
+async def dispose_engines() -> None:
+    """Drain queued writes and close pooled connections on shutdown"""
+    if write_coordinator is not None:
+        await anyio.to_thread.run_sync(write_coordinator.stop)
+    if async_engine is not None:
+        await async_engine.dispose()
+        if async_read_engine is not async_engine:
+            await async_read_engine.dispose()
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
@@ -0,0 +1,258 @@
+"""
+Generic CRUD engine - model-parameterized operations shared by every table.
+Writes are a single INSERT/UPDATE/DELETE ... RETURNING statement, so a create,
+PATCH or delete never re-reads the row it just touched.
+"""
+from contextlib import contextmanager
+from sqlmodel import Session, SQLModel, select
+from sqlalchemy import delete as sa_delete, insert as sa_insert, update as sa_update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Result, Row
+from typing import Any, Iterator, Optional, Sequence, Type, TypeVar
+from datetime import datetime
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+STREAM_CHUNK_ROWS = 1000  # rows fetched per round trip when streaming plain tuples
+
+
+def _columns(model: Type[ModelT], data: dict) -> dict:
+    """
+    data narrowed to model's columns. Some create/update schemas carry fields
+    their table lacks; building the model ignored them, and INSERT/UPDATE
+    statements must too.
+    """
+    columns = model.__table__.c
+    return {key: value for key, value in data.items() if key in columns}
+
+
+def create(session: Session, model: Type[ModelT], data: dict) -> ModelT:
+    """Insert a row and return it as loaded by INSERT ... RETURNING"""
+    statement = sa_insert(model).values(**_columns(model, data)).returning(model)
+    obj = session.scalars(statement).one()
+    session.commit()
+    return obj
+
+
+@contextmanager
+def deferred_commit(session: Session) -> Iterator[Session]:
+    """
+    Run several CRUD writes as one transaction. Inside the block their own
+    commit() only flushes, as under group commit; the block commits once when
+    it exits cleanly. If it raises, nothing is committed and the caller's
+    rollback (session close, or the write coordinator's savepoint) discards it all.
+    """
+    commit = session.commit
+    session.commit = session.flush
+    try:
+        yield session
+    finally:
+        session.commit = commit
+    session.commit()
+
+
+def _select_fields(model: Type[ModelT], fields: Sequence[str]) -> Any:
+    """
+    SELECT of the primary key plus the named columns (other names are skipped).
+    Plain rows, not ORM objects: load_only() would still build every instance
+    and attach a deferred loader per unloaded column, costing about as much as
+    loading the whole row.
+    """
+    table = model.__table__
+    return select(table.c.id, *(table.c[name] for name in fields if name in table.c and name != "id"))
+
+
+def get(
+    session: Session,
+    model: Type[ModelT],
+    obj_id: int,
+    *criteria: Any,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[ModelT | Row]:
+    """Get a row by primary key, optionally narrowed by extra criteria; fields= selects only those columns"""
+    if fields is not None:
+        return session.execute(_select_fields(model, fields).where(model.id == obj_id, *criteria)).first()
+    return session.exec(select(model).where(model.id == obj_id, *criteria)).first()
+
+
+def get_by(
+    session: Session,
+    model: Type[ModelT],
+    *criteria: Any,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[ModelT | Row]:
+    """Get the first row matching criteria; fields= selects only those columns"""
+    if fields is not None:
+        return session.execute(_select_fields(model, fields).where(*criteria)).first()
+    return session.exec(select(model).where(*criteria)).first()
+
+
+def get_many(
+    session: Session,
+    model: Type[ModelT],
+    *criteria: Any,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
+) -> list[ModelT] | list[Row] | Result:
+    """
+    Get rows matching criteria in primary-key order.
+    With after_id, pages by keyset (id > after_id) and ignores skip, so deep
+    pages cost the same as the first; otherwise falls back to OFFSET paging.
+    With columns, returns a server-side (yield_per) result of those columns
+    (names the table lacks are skipped) as plain tuples instead of ORM objects.
+    With fields, returns Rows of the primary key and those columns.
+    """
+    if columns is not None:
+        table = model.__table__
+        statement = select(*(table.c[name] for name in columns if name in table.c)).where(*criteria)
+    elif fields is not None:
+        statement = _select_fields(model, fields).where(*criteria)
+    else:
+        statement = select(model).where(*criteria)
+    if after_id is not None:
+        statement = statement.where(model.id > after_id)
+    elif skip:
+        statement = statement.offset(skip)
+    statement = statement.order_by(model.id).limit(limit)
+    if columns is not None:
+        return session.execute(statement.execution_options(yield_per=STREAM_CHUNK_ROWS))
+    if fields is not None:
+        return session.execute(statement).all()
+    return session.exec(statement).all()
+
+
+def update(
+    session: Session,
+    model: Type[ModelT],
+    obj_id: int,
+    update_data: dict,
+    *criteria: Any
+) -> Optional[ModelT]:
+    """PATCH semantics: apply non-null values and stamp updated_at"""
+    values = {key: value for key, value in update_data.items() if value is not None}
+    values["updated_at"] = datetime.utcnow()
+    return set_values(session, model, obj_id, values, *criteria)
+
+
+def set_values(
+    session: Session,
+    model: Type[ModelT],
+    obj_id: int,
+    values: dict,
+    *criteria: Any
+) -> Optional[ModelT]:
+    """
+    Write values as given (None included) with UPDATE ... RETURNING.
+    Returns None when no row matches obj_id and criteria. An instance of the
+    row already in the session (created earlier in the same transaction) is
+    refreshed from RETURNING; synchronize_session=False would leave it stale.
+    """
+    statement = (
+        sa_update(model)
+        .where(model.id == obj_id, *criteria)
+        .values(**_columns(model, values))
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+    obj = session.scalars(statement).one_or_none()
+    session.commit()
+    return obj
+
+
+def delete(session: Session, model: Type[ModelT], obj_id: int, *criteria: Any) -> bool:
+    """Hard delete a row with DELETE ... RETURNING; False when nothing matched"""
+    statement = (
+        sa_delete(model)
+        .where(model.id == obj_id, *criteria)
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_id = session.execute(statement).scalar_one_or_none()
+    session.commit()
+    return deleted_id is not None
+
+
+def bulk_create(
+    session: Session,
+    model: Type[ModelT],
+    rows: list[dict],
+    unique_key: Optional[str] = None,
+    references: Optional[tuple[str, Type[SQLModel]]] = None,
+    chunk_size: int = 1000
+) -> list[dict]:
+    """
+    Insert many already-validated rows and report on each one, in input order.
+
+    Referenced parents (e.g. ("patient_id", Patient)) and existing unique keys
+    are checked with one IN query per chunk instead of a lookup per row; rows
+    that fail either check, or repeat a unique key earlier in the batch, are
+    reported and skipped. The rest go in as chunked multi-row INSERT ...
+    RETURNING statements, each chunk committed on its own. A chunk that still
+    hits an IntegrityError (a concurrent writer) is retried row by row so only
+    the offending rows are reported.
+
+    Each report entry is {"status": "created" | "conflict" | "invalid",
+    "id": ..., "detail": ...}.
+    """
+    rows = [_columns(model, row) for row in rows]
+    results: list[Optional[dict]] = [None] * len(rows)
+
+    if references is not None:
+        key, parent = references
+        found = _existing_values(session, parent.id, {row[key] for row in rows}, chunk_size)
+        for index, row in enumerate(rows):
+            if row[key] not in found:
+                results[index] = {"status": "invalid", "id": None, "detail": f"{key} {row[key]} does not exist"}
+
+    if unique_key is not None:
+        candidates = [index for index, result in enumerate(results) if result is None]
+        taken = _existing_values(
+            session, getattr(model, unique_key), {rows[index][unique_key] for index in candidates}, chunk_size
+        )
+        for index in candidates:
+            value = rows[index][unique_key]
+            if value in taken:
+                results[index] = {"status": "conflict", "id": None, "detail": f"{unique_key} {value} already exists"}
+            taken.add(value)
+
+    pending = [index for index, result in enumerate(results) if result is None]
+    statement = sa_insert(model).returning(model.id, sort_by_parameter_order=True)
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        try:
+            with session.begin_nested():
+                ids = session.scalars(statement, [rows[index] for index in chunk]).all()
+        except IntegrityError:
+            ids = None
+        if ids is None:
+            for index in chunk:
+                results[index] = _insert_one(session, model, rows[index])
+        else:
+            for index, obj_id in zip(chunk, ids):
+                results[index] = {"status": "created", "id": obj_id, "detail": None}
+        session.commit()
+
+    return results
+
+
+def _existing_values(session: Session, column: Any, values: set, chunk_size: int) -> set:
+    """Which of values are already present in column"""
+    values = [value for value in values if value is not None]
+    found = set()
+    for start in range(0, len(values), chunk_size):
+        statement = select(column).where(column.in_(values[start:start + chunk_size]))
+        found.update(session.exec(statement).all())
+    return found
+
+
+def _insert_one(session: Session, model: Type[ModelT], row: dict) -> dict:
+    """Insert one row inside a SAVEPOINT and report the outcome"""
+    try:
+        with session.begin_nested():
+            obj_id = session.execute(sa_insert(model).values(**row).returning(model.id)).scalar_one()
+    except IntegrityError as e:
+        return {"status": "conflict", "id": None, "detail": str(e.orig)}
+    return {"status": "created", "id": obj_id, "detail": None}
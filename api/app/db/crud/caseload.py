@@ -0,0 +1,35 @@
+"""
+Caseload reads served from the caseload_rollup table (see app.db.caseload)
+"""
+from sqlmodel import Session, func, select
+from typing import Optional
+from app.db.models.caseload import CaseloadRollup, CaseloadWatermark
+
+
+def get_caseload(
+    session: Session,
+    role: Optional[str] = None,
+    person: Optional[str] = None,
+    procedure_types: Optional[list[str]] = None,
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None
+) -> dict:
+    """Monthly counts matching the filters (months are YYYY-MM, inclusive) and when they were refreshed"""
+    criteria = []
+    if role is not None:
+        criteria.append(CaseloadRollup.role == role)
+    if person is not None:
+        criteria.append(CaseloadRollup.person == person)
+    if procedure_types:
+        criteria.append(CaseloadRollup.procedure_type.in_(procedure_types))
+    if month_from is not None:
+        criteria.append(CaseloadRollup.month >= month_from)
+    if month_to is not None:
+        criteria.append(CaseloadRollup.month <= month_to)
+    rows = session.exec(
+        select(CaseloadRollup)
+        .where(*criteria)
+        .order_by(CaseloadRollup.role, CaseloadRollup.person, CaseloadRollup.procedure_type, CaseloadRollup.month)
+    ).all()
+    refreshed_at = session.exec(select(func.min(CaseloadWatermark.refreshed_at))).one()
+    return {"refreshed_at": refreshed_at, "rows": rows}
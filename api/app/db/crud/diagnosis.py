@@ -2,34 +2,37 @@
 Diagnosis CRUD operations
 """
 from sqlmodel import Session, select
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Sequence
+from app.db.crud import base
 from app.db.models.diagnosis import Diagnosis
 
 
 def create_diagnosis(session: Session, diagnosis_data: dict) -> Diagnosis:
     """Create a new diagnosis"""
-    diagnosis = Diagnosis(**diagnosis_data)
-    session.add(diagnosis)
-    session.commit()
-    session.refresh(diagnosis)
-    return diagnosis
+    return base.create(session, Diagnosis, diagnosis_data)
 
 
-def get_diagnosis(session: Session, diagnosis_id: int) -> Optional[Diagnosis]:
+def get_diagnosis(
+    session: Session,
+    diagnosis_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Diagnosis]:
     """Get diagnosis by ID"""
-    statement = select(Diagnosis).where(Diagnosis.id == diagnosis_id)
-    return session.exec(statement).first()
+    return base.get(session, Diagnosis, diagnosis_id, fields=fields)
 
 
 def get_diagnoses(
     session: Session,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[Diagnosis]:
     """Get list of diagnoses with pagination"""
-    statement = select(Diagnosis).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    return base.get_many(
+        session, Diagnosis, skip=skip, limit=limit, after_id=after_id, columns=columns, fields=fields
+    )
 
 
 def get_encounter_diagnoses(
@@ -47,27 +50,9 @@ def update_diagnosis(
     update_data: dict
 ) -> Optional[Diagnosis]:
     """Update diagnosis record"""
-    diagnosis = get_diagnosis(session, diagnosis_id)
-    if not diagnosis:
-        return None
-    
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(diagnosis, key, value)
-    
-    diagnosis.updated_at = datetime.utcnow()
-    session.add(diagnosis)
-    session.commit()
-    session.refresh(diagnosis)
-    return diagnosis
+    return base.update(session, Diagnosis, diagnosis_id, update_data)
 
 
 def delete_diagnosis(session: Session, diagnosis_id: int) -> bool:
     """Delete a diagnosis"""
-    diagnosis = get_diagnosis(session, diagnosis_id)
-    if not diagnosis:
-        return False
-    
-    session.delete(diagnosis)
-    session.commit()
-    return True
+    return base.delete(session, Diagnosis, diagnosis_id)
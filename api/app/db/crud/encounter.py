@@ -1,48 +1,66 @@
 """
 Encounter CRUD operations
 """
-from sqlmodel import Session, select
-from typing import Optional
-from datetime import datetime
+from sqlmodel import Session
+from typing import Optional, Sequence
+from app.db.crud import base
 from app.db.models.encounter import Encounter
+from app.db.models.patient import Patient
 
 
 def create_encounter(session: Session, encounter_data: dict) -> Encounter:
     """Create a new encounter"""
-    encounter = Encounter(**encounter_data)
-    session.add(encounter)
-    session.commit()
-    session.refresh(encounter)
-    return encounter
+    return base.create(session, Encounter, encounter_data)
 
 
-def get_encounter(session: Session, encounter_id: int) -> Optional[Encounter]:
+def bulk_create_encounters(session: Session, rows: list[dict], chunk_size: int = 1000) -> list[dict]:
+    """Insert many encounters; rows for unknown patients are reported as invalid"""
+    return base.bulk_create(session, Encounter, rows, references=("patient_id", Patient), chunk_size=chunk_size)
+
+
+def get_encounter(
+    session: Session,
+    encounter_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Encounter]:
     """Get encounter by ID"""
-    statement = select(Encounter).where(Encounter.id == encounter_id)
-    return session.exec(statement).first()
+    return base.get(session, Encounter, encounter_id, fields=fields)
 
 
 def get_encounters(
     session: Session,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[Encounter]:
     """Get list of encounters with pagination"""
-    statement = select(Encounter).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    return base.get_many(
+        session, Encounter, skip=skip, limit=limit, after_id=after_id, columns=columns, fields=fields
+    )
 
 
 def get_patient_encounters(
     session: Session,
     patient_id: int,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[Encounter]:
     """Get all encounters for a specific patient"""
-    statement = select(Encounter).where(
-        Encounter.patient_id == patient_id
-    ).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    return base.get_many(
+        session,
+        Encounter,
+        Encounter.patient_id == patient_id,
+        skip=skip,
+        limit=limit,
+        after_id=after_id,
+        columns=columns,
+        fields=fields
+    )
 
 
 def update_encounter(
@@ -51,27 +69,9 @@ def update_encounter(
     update_data: dict
 ) -> Optional[Encounter]:
     """Update encounter record"""
-    encounter = get_encounter(session, encounter_id)
-    if not encounter:
-        return None
-    
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(encounter, key, value)
-    
-    encounter.updated_at = datetime.utcnow()
-    session.add(encounter)
-    session.commit()
-    session.refresh(encounter)
-    return encounter
+    return base.update(session, Encounter, encounter_id, update_data)
 
 
 def delete_encounter(session: Session, encounter_id: int) -> bool:
     """Delete an encounter"""
-    encounter = get_encounter(session, encounter_id)
-    if not encounter:
-        return False
-    
-    session.delete(encounter)
-    session.commit()
-    return True
+    return base.delete(session, Encounter, encounter_id)
@@ -0,0 +1,61 @@
+"""
+Case intake CRUD - patient, encounter and research case written as one transaction
+"""
+from sqlmodel import Session
+from types import ModuleType
+from typing import Optional
+from app.db.crud import base, encounter as encounter_crud, patient as patient_crud
+
+# /patients/match score from which a patient the intake is not attached to is
+# reported as a possible duplicate
+POSSIBLE_MATCH_SCORE = 0.6
+
+PATIENT_FIELDS = ("mrn", "first_name", "middle_name", "last_name", "date_of_birth", "sex")
+ENCOUNTER_FIELDS = (
+    "encounter_type", "encounter_date", "chief_complaint", "location", "attending_physician", "status", "notes"
+)
+
+
+def resolve_patient(session: Session, intake: dict) -> tuple[Optional[int], list[int]]:
+    """
+    (id of the existing patient the intake belongs to or None, ids of possible
+    duplicates). The same MRN is the same patient; an MRN that only matches once
+    normalized (x-1 / X1) also needs the same date of birth. Other candidates
+    scoring POSSIBLE_MATCH_SCORE or more are only reported.
+    """
+    candidates = patient_crud.match_patients(
+        session,
+        mrn=intake["mrn"],
+        first_name=intake["first_name"],
+        last_name=intake["last_name"],
+        date_of_birth=intake["date_of_birth"]
+    )
+    for patient, _, matched in candidates:
+        if patient.mrn == intake["mrn"] or ("mrn" in matched and "date_of_birth" in matched):
+            return patient.id, []
+    return None, [patient.id for patient, score, _ in candidates if score >= POSSIBLE_MATCH_SCORE]
+
+
+def create_case(session: Session, intake: dict, case_crud: ModuleType, case_data: dict) -> dict:
+    """
+    Match or create the patient, then create the encounter and the research
+    case (via case_crud, from case_data minus encounter_id), committing once.
+    A failure at any step leaves nothing behind.
+    """
+    with base.deferred_commit(session):
+        patient_id, possible_duplicates = resolve_patient(session, intake)
+        patient_created = patient_id is None
+        if patient_created:
+            patient_data = {key: intake[key] for key in PATIENT_FIELDS if intake[key] is not None}
+            patient_id = patient_crud.create_patient(session, patient_data).id
+        encounter_data = {"patient_id": patient_id, **{key: intake[key] for key in ENCOUNTER_FIELDS}}
+        encounter_id = encounter_crud.create_encounter(session, encounter_data).id
+        research_case_id = case_crud.create_case(session, {**case_data, "encounter_id": encounter_id}).id
+    return {
+        "patient_id": patient_id,
+        "encounter_id": encounter_id,
+        "research_case_id": research_case_id,
+        "procedure_type": intake["procedure_type"],
+        "patient_created": patient_created,
+        "possible_duplicates": possible_duplicates,
+    }
@@ -1,50 +1,105 @@
 """
 Patient CRUD operations
 """
+from sqlalchemy import false, or_, update as sa_update
 from sqlmodel import Session, select
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Sequence
+from datetime import date, datetime
+from app.config import settings
+from app.db import cache, fulltext, matching
+from app.db.core import engine
+from app.db.crud import base
 from app.db.models.patient import Patient
 
 
+# MRN -> patient id and patient id -> row. Rows are cached as plain dicts and
+# rebuilt into detached Patient objects; writes drop the affected entries.
+mrn_cache = cache.create_cache("patient-mrn", settings.patient_cache_size, settings.patient_cache_ttl)
+row_cache = cache.create_cache("patient", settings.patient_cache_size, settings.patient_cache_ttl)
+
+
+def _from_cache(row: dict) -> Patient:
+    """
+    Rebuild a transient Patient the way the ORM loads one (state dict filled
+    directly); Patient(**row) would re-run validation at ~40x the cost
+    """
+    patient = Patient.__mapper__.class_manager.new_instance()
+    patient.__dict__.update(row)
+    return patient
+
+
+def _remember(patient: Patient) -> None:
+    row_cache.set(patient.id, patient.model_dump())
+    mrn_cache.set(patient.mrn, patient.id)
+
+
+def _forget(session: Session, patient: Optional[Patient], patient_id: int) -> None:
+    cache.invalidate_after_commit(session, row_cache, patient_id)
+    if patient is not None:
+        cache.invalidate_after_commit(session, mrn_cache, patient.mrn)
+
+
 def create_patient(session: Session, patient_data: dict) -> Patient:
     """Create a new patient"""
-    patient = Patient(**patient_data)
-    session.add(patient)
-    session.commit()
-    session.refresh(patient)
-    return patient
+    return base.create(session, Patient, {**patient_data, **matching.blocking_keys(patient_data)})
 
 
-def get_patient(session: Session, patient_id: int) -> Optional[Patient]:
-    """Get patient by ID (excluding soft-deleted)"""
-    statement = select(Patient).where(
-        Patient.id == patient_id,
-        Patient.is_deleted == False
-    )
-    return session.exec(statement).first()
+def bulk_create_patients(session: Session, rows: list[dict], chunk_size: int = 1000) -> list[dict]:
+    """Insert many patients; MRNs already on file (deleted or not) are reported as conflicts"""
+    rows = [{**row, **matching.blocking_keys(row)} for row in rows]
+    return base.bulk_create(session, Patient, rows, unique_key="mrn", chunk_size=chunk_size)
+
+
+def get_patient(
+    session: Session,
+    patient_id: int,
+    fields: Optional[Sequence[str]] = None,
+    changed_at: Optional[datetime] = None
+) -> Optional[Patient]:
+    """
+    Get patient by ID (excluding soft-deleted). A cached row is returned whole
+    even with fields; a partial row loaded for fields is not cached. With
+    changed_at (the version a conditional GET's ETag names), a cached row
+    last changed at any other time is stale and the row is read again.
+    """
+    row = row_cache.get(patient_id)
+    if row is not None and (changed_at is None or (row["updated_at"] or row["created_at"]) == changed_at):
+        return _from_cache(row)
+    patient = base.get(session, Patient, patient_id, Patient.is_deleted == false(), fields=fields)
+    if patient is not None and fields is None:
+        _remember(patient)
+    return patient
 
 
 def get_patient_by_mrn(session: Session, mrn: str) -> Optional[Patient]:
     """Get patient by MRN"""
-    statement = select(Patient).where(
-        Patient.mrn == mrn,
-        Patient.is_deleted == False
-    )
-    return session.exec(statement).first()
+    patient_id = mrn_cache.get(mrn)
+    if patient_id is not None:
+        patient = get_patient(session, patient_id)
+        # The MRN may have been changed on another worker since it was cached
+        if patient is not None and patient.mrn == mrn:
+            return patient
+        mrn_cache.delete(mrn)
+    patient = base.get_by(session, Patient, Patient.mrn == mrn, Patient.is_deleted == false())
+    if patient is not None:
+        _remember(patient)
+    return patient
 
 
 def get_patients(
     session: Session,
     skip: int = 0,
     limit: int = 100,
-    include_deleted: bool = False
+    include_deleted: bool = False,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[Patient]:
     """Get list of patients with pagination"""
-    statement = select(Patient).offset(skip).limit(limit)
-    if not include_deleted:
-        statement = statement.where(Patient.is_deleted == False)
-    return session.exec(statement).all()
+    criteria = [] if include_deleted else [Patient.is_deleted == false()]
+    return base.get_many(
+        session, Patient, *criteria, skip=skip, limit=limit, after_id=after_id, columns=columns, fields=fields
+    )
 
 
 def search_patients(
@@ -53,15 +108,84 @@ def search_patients(
     skip: int = 0,
     limit: int = 100
 ) -> list[Patient]:
-    """Search patients by name or MRN"""
-    search_pattern = f"%{search_term}%"
-    statement = select(Patient).where(
-        (Patient.first_name.contains(search_term)) |
-        (Patient.last_name.contains(search_term)) |
-        (Patient.mrn.contains(search_term)),
-        Patient.is_deleted == False
-    ).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    """
+    Search patients by name or MRN through the full-text index. Every word
+    of the term must match as a prefix; results are ranked best match first.
+    """
+    statement = fulltext.patient_search_statement(engine.dialect.name, search_term)
+    if statement is None:
+        return []
+    return session.exec(statement.offset(skip).limit(limit)).all()
+
+
+def match_patients(
+    session: Session,
+    mrn: Optional[str] = None,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    date_of_birth: Optional[date] = None,
+    min_score: float = 0.0,
+    limit: int = 10
+) -> list[tuple[Patient, float, list[str]]]:
+    """
+    Likely existing records for a patient, best first, as (patient, score,
+    matched fields). Candidates come from indexed probes on the blocking keys:
+    normalized MRN, DOB + phonetic last or first name, and both phonetic names
+    (which still finds a mistyped DOB).
+    """
+    probe = matching.blocking_keys({"mrn": mrn, "first_name": first_name, "last_name": last_name})
+    mrn_key, first_key, last_key = probe["mrn_key"], probe["first_name_key"], probe["last_name_key"]
+
+    blocks = []
+    if mrn_key:
+        blocks.append(Patient.mrn_key == mrn_key)
+    if date_of_birth is not None and last_key:
+        blocks.append((Patient.date_of_birth == date_of_birth) & (Patient.last_name_key == last_key))
+    if date_of_birth is not None and first_key:
+        blocks.append((Patient.date_of_birth == date_of_birth) & (Patient.first_name_key == first_key))
+    if first_key and last_key:
+        blocks.append((Patient.last_name_key == last_key) & (Patient.first_name_key == first_key))
+    if not blocks:
+        return []
+
+    statement = select(Patient).where(or_(*blocks), Patient.is_deleted == false()).limit(200)
+    scored = []
+    for patient in session.exec(statement).all():
+        score, matched = matching.score_candidate(patient, mrn, first_name, last_name, date_of_birth)
+        if score >= min_score:
+            scored.append((patient, score, matched))
+    # On equal scores an MRN match ranks first
+    scored.sort(key=lambda item: (-item[1], "mrn" not in item[2], item[0].id))
+    return scored[:limit]
+
+
+def backfill_match_keys(session: Session, chunk_size: int = 1000) -> int:
+    """Recompute every patient's blocking keys (after a migration or a key change)"""
+    updated = 0
+    last_id = 0
+    while True:
+        statement = (
+            select(Patient.id, Patient.mrn, Patient.first_name, Patient.last_name)
+            .where(Patient.id > last_id)
+            .order_by(Patient.id)
+            .limit(chunk_size)
+        )
+        rows = session.exec(statement).all()
+        if not rows:
+            return updated
+        session.execute(
+            sa_update(Patient),
+            [
+                {"id": row.id, **matching.blocking_keys({
+                    "mrn": row.mrn, "first_name": row.first_name, "last_name": row.last_name
+                })}
+                for row in rows
+            ]
+        )
+        session.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
+        row_cache.delete(*(row.id for row in rows))
 
 
 def update_patient(
@@ -70,44 +194,32 @@ def update_patient(
     update_data: dict
 ) -> Optional[Patient]:
     """Update patient record"""
-    patient = get_patient(session, patient_id)
-    if not patient:
-        return None
-    
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(patient, key, value)
-    
-    patient.updated_at = datetime.utcnow()
-    session.add(patient)
-    session.commit()
-    session.refresh(patient)
+    update_data = {**update_data, **matching.blocking_keys(update_data)}
+    patient = base.update(session, Patient, patient_id, update_data, Patient.is_deleted == false())
+    _forget(session, patient, patient_id)
     return patient
 
 
 def delete_patient(session: Session, patient_id: int) -> bool:
     """Soft delete a patient"""
-    patient = get_patient(session, patient_id)
-    if not patient:
-        return False
-    
-    patient.is_deleted = True
-    patient.deleted_at = datetime.utcnow()
-    session.add(patient)
-    session.commit()
-    return True
+    deleted = base.set_values(
+        session,
+        Patient,
+        patient_id,
+        {"is_deleted": True, "deleted_at": datetime.utcnow()},
+        Patient.is_deleted == false()
+    )
+    _forget(session, deleted, patient_id)
+    return deleted is not None
 
 
 def restore_patient(session: Session, patient_id: int) -> Optional[Patient]:
     """Restore a soft-deleted patient"""
-    statement = select(Patient).where(Patient.id == patient_id)
-    patient = session.exec(statement).first()
-    if not patient:
-        return None
-    
-    patient.is_deleted = False
-    patient.deleted_at = None
-    session.add(patient)
-    session.commit()
-    session.refresh(patient)
+    patient = base.set_values(
+        session,
+        Patient,
+        patient_id,
+        {"is_deleted": False, "deleted_at": None}
+    )
+    _forget(session, patient, patient_id)
     return patient
@@ -2,34 +2,37 @@
 Procedure CRUD operations
 """
 from sqlmodel import Session, select
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Sequence
+from app.db.crud import base
 from app.db.models.procedure import Procedure
 
 
 def create_procedure(session: Session, procedure_data: dict) -> Procedure:
     """Create a new procedure"""
-    procedure = Procedure(**procedure_data)
-    session.add(procedure)
-    session.commit()
-    session.refresh(procedure)
-    return procedure
+    return base.create(session, Procedure, procedure_data)
 
 
-def get_procedure(session: Session, procedure_id: int) -> Optional[Procedure]:
+def get_procedure(
+    session: Session,
+    procedure_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Procedure]:
     """Get procedure by ID"""
-    statement = select(Procedure).where(Procedure.id == procedure_id)
-    return session.exec(statement).first()
+    return base.get(session, Procedure, procedure_id, fields=fields)
 
 
 def get_procedures(
     session: Session,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[Procedure]:
     """Get list of procedures with pagination"""
-    statement = select(Procedure).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    return base.get_many(
+        session, Procedure, skip=skip, limit=limit, after_id=after_id, columns=columns, fields=fields
+    )
 
 
 def get_encounter_procedures(
@@ -47,27 +50,9 @@ def update_procedure(
     update_data: dict
 ) -> Optional[Procedure]:
     """Update procedure record"""
-    procedure = get_procedure(session, procedure_id)
-    if not procedure:
-        return None
-    
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(procedure, key, value)
-    
-    procedure.updated_at = datetime.utcnow()
-    session.add(procedure)
-    session.commit()
-    session.refresh(procedure)
-    return procedure
+    return base.update(session, Procedure, procedure_id, update_data)
 
 
 def delete_procedure(session: Session, procedure_id: int) -> bool:
     """Delete a procedure"""
-    procedure = get_procedure(session, procedure_id)
-    if not procedure:
-        return False
-    
-    session.delete(procedure)
-    session.commit()
-    return True
+    return base.delete(session, Procedure, procedure_id)
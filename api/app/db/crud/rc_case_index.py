@@ -0,0 +1,41 @@
+"""
+Cross-procedure research case lookups served from rc_case_index
+"""
+from sqlmodel import Session
+from typing import Optional, Sequence
+from datetime import date
+from app.db.crud import base
+from app.db.models.rc_case_index import RcCaseIndex
+
+
+def get_cases(
+    session: Session,
+    procedure_types: Optional[list[str]] = None,
+    attending: Optional[str] = None,
+    fellow_or_pa: Optional[str] = None,
+    mrn: Optional[str] = None,
+    laterality: Optional[str] = None,
+    surgery_date_from: Optional[date] = None,
+    surgery_date_to: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None
+) -> list[RcCaseIndex]:
+    """Index rows of every procedure type matching all given filters (dates inclusive)"""
+    criteria = []
+    if procedure_types:
+        criteria.append(RcCaseIndex.procedure_type.in_(procedure_types))
+    if attending is not None:
+        criteria.append(RcCaseIndex.attending == attending)
+    if fellow_or_pa is not None:
+        criteria.append(RcCaseIndex.fellow_or_pa == fellow_or_pa)
+    if mrn is not None:
+        criteria.append(RcCaseIndex.mrn == mrn)
+    if laterality is not None:
+        criteria.append(RcCaseIndex.laterality == laterality)
+    if surgery_date_from is not None:
+        criteria.append(RcCaseIndex.surgery_date >= surgery_date_from)
+    if surgery_date_to is not None:
+        criteria.append(RcCaseIndex.surgery_date <= surgery_date_to)
+    return base.get_many(session, RcCaseIndex, *criteria, skip=skip, limit=limit, after_id=after_id, columns=columns)
@@ -1,41 +1,58 @@
 """
 Rotator Cuff CRUD operations
 """
-from sqlmodel import Session, select
-from typing import Optional
-from datetime import datetime
+from sqlmodel import Session
+from typing import Optional, Sequence
+from app.db.crud import base
 from app.db.models.rc_rotatorcuff import RcRotatorCuff
+from app.db.models.encounter import Encounter
 
 
 def create_case(session: Session, case_data: dict) -> RcRotatorCuff:
     """Create a new rotator cuff case"""
-    case = RcRotatorCuff(**case_data)
-    session.add(case)
-    session.commit()
-    session.refresh(case)
-    return case
+    return base.create(session, RcRotatorCuff, case_data)
 
 
-def get_case(session: Session, case_id: int) -> Optional[RcRotatorCuff]:
+def bulk_create_cases(session: Session, rows: list[dict], chunk_size: int = 1000) -> list[dict]:
+    """Insert many rotator cuff cases; one case per encounter"""
+    return base.bulk_create(
+        session, RcRotatorCuff, rows,
+        unique_key="encounter_id", references=("encounter_id", Encounter), chunk_size=chunk_size
+    )
+
+
+def get_case(
+    session: Session,
+    case_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[RcRotatorCuff]:
     """Get rotator cuff case by ID"""
-    statement = select(RcRotatorCuff).where(RcRotatorCuff.id == case_id)
-    return session.exec(statement).first()
+    return base.get(session, RcRotatorCuff, case_id, fields=fields)
 
 
-def get_case_by_encounter(session: Session, encounter_id: int) -> Optional[RcRotatorCuff]:
+def get_case_by_encounter(
+    session: Session,
+    encounter_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[RcRotatorCuff]:
     """Get rotator cuff case by encounter ID"""
-    statement = select(RcRotatorCuff).where(RcRotatorCuff.encounter_id == encounter_id)
-    return session.exec(statement).first()
+    return base.get_by(
+        session, RcRotatorCuff, RcRotatorCuff.encounter_id == encounter_id, fields=fields
+    )
 
 
 def get_cases(
     session: Session,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[RcRotatorCuff]:
     """Get list of rotator cuff cases with pagination"""
-    statement = select(RcRotatorCuff).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    return base.get_many(
+        session, RcRotatorCuff, skip=skip, limit=limit, after_id=after_id, columns=columns, fields=fields
+    )
 
 
 def update_case(
@@ -44,27 +61,9 @@ def update_case(
     update_data: dict
 ) -> Optional[RcRotatorCuff]:
     """Update rotator cuff case"""
-    case = get_case(session, case_id)
-    if not case:
-        return None
-    
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(case, key, value)
-    
-    case.updated_at = datetime.utcnow()
-    session.add(case)
-    session.commit()
-    session.refresh(case)
-    return case
+    return base.update(session, RcRotatorCuff, case_id, update_data)
 
 
 def delete_case(session: Session, case_id: int) -> bool:
     """Delete a rotator cuff case"""
-    case = get_case(session, case_id)
-    if not case:
-        return False
-    
-    session.delete(case)
-    session.commit()
-    return True
+    return base.delete(session, RcRotatorCuff, case_id)
@@ -1,41 +1,58 @@
 """
 Shoulder Arthroplasty CRUD operations
 """
-from sqlmodel import Session, select
-from typing import Optional
-from datetime import datetime
+from sqlmodel import Session
+from typing import Optional, Sequence
+from app.db.crud import base
 from app.db.models.rc_shoulderarthroplasty import RcShoulderArthroplasty
+from app.db.models.encounter import Encounter
 
 
 def create_case(session: Session, case_data: dict) -> RcShoulderArthroplasty:
     """Create a new shoulder arthroplasty case"""
-    case = RcShoulderArthroplasty(**case_data)
-    session.add(case)
-    session.commit()
-    session.refresh(case)
-    return case
+    return base.create(session, RcShoulderArthroplasty, case_data)
 
 
-def get_case(session: Session, case_id: int) -> Optional[RcShoulderArthroplasty]:
+def bulk_create_cases(session: Session, rows: list[dict], chunk_size: int = 1000) -> list[dict]:
+    """Insert many shoulder arthroplasty cases; one case per encounter"""
+    return base.bulk_create(
+        session, RcShoulderArthroplasty, rows,
+        unique_key="encounter_id", references=("encounter_id", Encounter), chunk_size=chunk_size
+    )
+
+
+def get_case(
+    session: Session,
+    case_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[RcShoulderArthroplasty]:
     """Get shoulder arthroplasty case by ID"""
-    statement = select(RcShoulderArthroplasty).where(RcShoulderArthroplasty.id == case_id)
-    return session.exec(statement).first()
+    return base.get(session, RcShoulderArthroplasty, case_id, fields=fields)
 
 
-def get_case_by_encounter(session: Session, encounter_id: int) -> Optional[RcShoulderArthroplasty]:
+def get_case_by_encounter(
+    session: Session,
+    encounter_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[RcShoulderArthroplasty]:
     """Get shoulder arthroplasty case by encounter ID"""
-    statement = select(RcShoulderArthroplasty).where(RcShoulderArthroplasty.encounter_id == encounter_id)
-    return session.exec(statement).first()
+    return base.get_by(
+        session, RcShoulderArthroplasty, RcShoulderArthroplasty.encounter_id == encounter_id, fields=fields
+    )
 
 
 def get_cases(
     session: Session,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[RcShoulderArthroplasty]:
     """Get list of shoulder arthroplasty cases with pagination"""
-    statement = select(RcShoulderArthroplasty).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    return base.get_many(
+        session, RcShoulderArthroplasty, skip=skip, limit=limit, after_id=after_id, columns=columns, fields=fields
+    )
 
 
 def update_case(
@@ -44,27 +61,9 @@ def update_case(
     update_data: dict
 ) -> Optional[RcShoulderArthroplasty]:
     """Update shoulder arthroplasty case"""
-    case = get_case(session, case_id)
-    if not case:
-        return None
-    
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(case, key, value)
-    
-    case.updated_at = datetime.utcnow()
-    session.add(case)
-    session.commit()
-    session.refresh(case)
-    return case
+    return base.update(session, RcShoulderArthroplasty, case_id, update_data)
 
 
 def delete_case(session: Session, case_id: int) -> bool:
     """Delete a shoulder arthroplasty case"""
-    case = get_case(session, case_id)
-    if not case:
-        return False
-    
-    session.delete(case)
-    session.commit()
-    return True
+    return base.delete(session, RcShoulderArthroplasty, case_id)
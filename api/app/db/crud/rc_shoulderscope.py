@@ -1,41 +1,58 @@
 """
 Shoulder Scope CRUD operations
 """
-from sqlmodel import Session, select
-from typing import Optional
-from datetime import datetime
+from sqlmodel import Session
+from typing import Optional, Sequence
+from app.db.crud import base
 from app.db.models.rc_shoulderscope import RcShoulderScope
+from app.db.models.encounter import Encounter
 
 
 def create_case(session: Session, case_data: dict) -> RcShoulderScope:
     """Create a new shoulder scope case"""
-    case = RcShoulderScope(**case_data)
-    session.add(case)
-    session.commit()
-    session.refresh(case)
-    return case
+    return base.create(session, RcShoulderScope, case_data)
 
 
-def get_case(session: Session, case_id: int) -> Optional[RcShoulderScope]:
+def bulk_create_cases(session: Session, rows: list[dict], chunk_size: int = 1000) -> list[dict]:
+    """Insert many shoulder scope cases; one case per encounter"""
+    return base.bulk_create(
+        session, RcShoulderScope, rows,
+        unique_key="encounter_id", references=("encounter_id", Encounter), chunk_size=chunk_size
+    )
+
+
+def get_case(
+    session: Session,
+    case_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[RcShoulderScope]:
     """Get shoulder scope case by ID"""
-    statement = select(RcShoulderScope).where(RcShoulderScope.id == case_id)
-    return session.exec(statement).first()
+    return base.get(session, RcShoulderScope, case_id, fields=fields)
 
 
-def get_case_by_encounter(session: Session, encounter_id: int) -> Optional[RcShoulderScope]:
+def get_case_by_encounter(
+    session: Session,
+    encounter_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[RcShoulderScope]:
     """Get shoulder scope case by encounter ID"""
-    statement = select(RcShoulderScope).where(RcShoulderScope.encounter_id == encounter_id)
-    return session.exec(statement).first()
+    return base.get_by(
+        session, RcShoulderScope, RcShoulderScope.encounter_id == encounter_id, fields=fields
+    )
 
 
 def get_cases(
     session: Session,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> list[RcShoulderScope]:
     """Get list of shoulder scope cases with pagination"""
-    statement = select(RcShoulderScope).offset(skip).limit(limit)
-    return session.exec(statement).all()
+    return base.get_many(
+        session, RcShoulderScope, skip=skip, limit=limit, after_id=after_id, columns=columns, fields=fields
+    )
 
 
 def update_case(
@@ -44,27 +61,9 @@ def update_case(
     update_data: dict
 ) -> Optional[RcShoulderScope]:
     """Update shoulder scope case"""
-    case = get_case(session, case_id)
-    if not case:
-        return None
-    
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(case, key, value)
-    
-    case.updated_at = datetime.utcnow()
-    session.add(case)
-    session.commit()
-    session.refresh(case)
-    return case
+    return base.update(session, RcShoulderScope, case_id, update_data)
 
 
 def delete_case(session: Session, case_id: int) -> bool:
     """Delete a shoulder scope case"""
-    case = get_case(session, case_id)
-    if not case:
-        return False
-    
-    session.delete(case)
-    session.commit()
-    return True
+    return base.delete(session, RcShoulderScope, case_id)
@@ -0,0 +1,33 @@
+"""
+Clinical text search operations
+"""
+from sqlmodel import Session
+from typing import Optional
+from app.db import fulltext
+from app.db.core import engine
+
+
+def search_clinical_text(
+    session: Session,
+    search_term: str,
+    entity_types: Optional[list[str]] = None,
+    skip: int = 0,
+    limit: int = 50
+) -> list[dict]:
+    """Ranked hits across every indexed free-text column"""
+    statement = fulltext.clinical_text_search_statement(
+        engine.dialect.name, search_term, entity_types, skip=skip, limit=limit
+    )
+    if statement is None:
+        return []
+    hits = []
+    for key, score, snippet in session.execute(statement):
+        entity_type, entity_id, field = fulltext.decode_clinical_key(key)
+        hits.append({
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "field": field,
+            "snippet": snippet,
+            "score": score,
+        })
+    return hits
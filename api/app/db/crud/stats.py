@@ -0,0 +1,56 @@
+"""
+Statistics read from the stat_counter rollups (see app.db.stats)
+"""
+from sqlmodel import Session, select
+from app.db.models.stat_counter import StatCounter
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+
+def get_counts(session: Session, *metrics: str) -> dict[str, dict[str, int]]:
+    """Non-empty buckets of each metric, as {metric: {bucket: count}}"""
+    counts: dict[str, dict[str, int]] = {metric: {} for metric in metrics}
+    statement = (
+        select(StatCounter)
+        .where(StatCounter.metric.in_(metrics), StatCounter.count > 0)
+        .order_by(StatCounter.metric, StatCounter.bucket)
+    )
+    for counter in session.exec(statement):
+        counts[counter.metric][counter.bucket] = counter.count
+    return counts
+
+
+def get_patient_stats(session: Session) -> dict:
+    """Patient totals by status, and active patients by sex and state"""
+    counts = get_counts(session, "patient.status", "patient.sex", "patient.state")
+    by_status = counts["patient.status"]
+    return {
+        "total_patients": by_status.get("active", 0),
+        "deleted_patients": by_status.get("deleted", 0),
+        "by_status": by_status,
+        "by_sex": counts["patient.sex"],
+        "by_state": counts["patient.state"],
+    }
+
+
+def get_encounter_stats(session: Session) -> dict:
+    """Encounter totals by type and by month of encounter_date"""
+    counts = get_counts(session, "encounter.type", "encounter.month")
+    return {
+        "total_encounters": sum(counts["encounter.type"].values()),
+        "by_type": counts["encounter.type"],
+        "by_month": counts["encounter.month"],
+    }
+
+
+def get_case_stats(session: Session) -> dict:
+    """Research case totals per procedure type, by month of surgery"""
+    metrics = {slug: f"{case_type.model.__tablename__}.month" for slug, case_type in RESEARCH_CASE_TYPES.items()}
+    counts = get_counts(session, *metrics.values())
+    by_procedure = {
+        slug: {"total": sum(counts[metric].values()), "by_month": counts[metric]}
+        for slug, metric in metrics.items()
+    }
+    return {
+        "total_cases": sum(procedure["total"] for procedure in by_procedure.values()),
+        "by_procedure": by_procedure,
+    }
@@ -0,0 +1,77 @@
+"""
+Patient timeline - the whole chart for one patient in a fixed number of queries
+"""
+from sqlmodel import Session, select
+from typing import Any, Optional, Type
+from app.db.crud import patient as patient_crud
+from app.db.models.diagnosis import Diagnosis
+from app.db.models.encounter import Encounter
+from app.db.models.procedure import Procedure
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+TIMELINE_SECTIONS = ("diagnoses", "procedures", "research_cases")
+IN_LIST_CHUNK = 500
+
+
+def _by_encounter(session: Session, model: Type[Any], encounter_ids: list[int]) -> dict[int, list[Any]]:
+    """Rows of model for every encounter id, grouped by encounter, in id order"""
+    grouped: dict[int, list[Any]] = {}
+    for start in range(0, len(encounter_ids), IN_LIST_CHUNK):
+        statement = (
+            select(model)
+            .where(model.encounter_id.in_(encounter_ids[start:start + IN_LIST_CHUNK]))
+            .order_by(model.id)
+        )
+        for row in session.exec(statement):
+            grouped.setdefault(row.encounter_id, []).append(row)
+    return grouped
+
+
+def get_patient_timeline(
+    session: Session,
+    patient_id: int,
+    depth: int = 2,
+    sections: Optional[list[str]] = None
+) -> Optional[dict]:
+    """
+    Patient, their encounters (oldest first) and each encounter's diagnoses,
+    procedures and research cases. Children are loaded with one IN query per
+    table over all encounter ids, so the query count does not grow with the
+    number of encounters. depth 0 stops at the patient, 1 at encounters;
+    sections limits which children are loaded at depth 2.
+    """
+    patient = patient_crud.get_patient(session, patient_id)
+    if patient is None:
+        return None
+    timeline: dict = {"patient": patient}
+    if depth < 1:
+        return timeline
+
+    encounters = session.exec(
+        select(Encounter)
+        .where(Encounter.patient_id == patient_id)
+        .order_by(Encounter.encounter_date, Encounter.id)
+    ).all()
+    nodes = [{"encounter": encounter} for encounter in encounters]
+    timeline["encounters"] = nodes
+    if depth < 2 or not encounters:
+        return timeline
+
+    sections = TIMELINE_SECTIONS if sections is None else sections
+    encounter_ids = [encounter.id for encounter in encounters]
+    if "diagnoses" in sections:
+        diagnoses = _by_encounter(session, Diagnosis, encounter_ids)
+        for node in nodes:
+            node["diagnoses"] = diagnoses.get(node["encounter"].id, [])
+    if "procedures" in sections:
+        procedures = _by_encounter(session, Procedure, encounter_ids)
+        for node in nodes:
+            node["procedures"] = procedures.get(node["encounter"].id, [])
+    if "research_cases" in sections:
+        for node in nodes:
+            node["research_cases"] = {}
+        by_id = {node["encounter"].id: node for node in nodes}
+        for slug, case_type in RESEARCH_CASE_TYPES.items():
+            for encounter_id, cases in _by_encounter(session, case_type.model, encounter_ids).items():
+                by_id[encounter_id]["research_cases"][slug] = cases[0]  # one case per encounter per table
+    return timeline
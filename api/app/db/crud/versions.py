@@ -0,0 +1,26 @@
+"""
+Change markers for conditional GETs - a table's version counter (see app.db.versions) or a row's timestamps
+"""
+from typing import Any, Optional
+from sqlmodel import Session, SQLModel, select
+from sqlalchemy import false
+from sqlalchemy.engine import Row
+from app.db.models.table_version import TableVersion
+
+
+def get_table_version(session: Session, table_name: str) -> Optional[Row]:
+    """(version, changed_at) of a table, or None before its first write"""
+    statement = select(TableVersion.version, TableVersion.changed_at).where(TableVersion.table_name == table_name)
+    return session.execute(statement).first()
+
+
+def get_row_stamp(session: Session, table_name: str, key: Any, column: str = "id") -> Optional[Row]:
+    """
+    (id, created_at, updated_at) of the row whose column equals key, without
+    loading the row itself. Soft-deleted rows are treated as missing.
+    """
+    table = SQLModel.metadata.tables[table_name]
+    statement = select(table.c.id, table.c.created_at, table.c.updated_at).where(table.c[column] == key)
+    if "is_deleted" in table.c:
+        statement = statement.where(table.c.is_deleted == false())
+    return session.execute(statement).first()
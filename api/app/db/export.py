@@ -0,0 +1,166 @@
+"""
+Columnar export - research case and EMR tables as Parquet or Arrow IPC
+
+Rows are fetched in fixed-size chunks through a server-side cursor
+(yield_per / stream_results) and each chunk is written as one Parquet row
+group or Arrow record batch, typed from the table's columns so booleans,
+floats and dates arrive as such. Memory stays at about one chunk however
+large the table is. pyarrow is optional (the "export" extra) and is only
+imported when an export runs.
+"""
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+from sqlalchemy import Table, select, types
+from sqlalchemy.engine import Connection
+
+from app.config import settings
+from app.db.core import read_engine
+from app.db.models import Diagnosis, Encounter, Patient, Procedure
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}  # format -> (media type, file extension)
+
+EXPORT_TABLES: dict[str, Table] = {
+    model.__tablename__: model.__table__ for model in (Patient, Encounter, Diagnosis, Procedure)
+} | {
+    case_type.model.__tablename__: case_type.model.__table__ for case_type in RESEARCH_CASE_TYPES.values()
+}
+
+
+class ExportUnavailable(RuntimeError):
+    """pyarrow is not installed"""
+
+
+def require_pyarrow() -> Any:
+    """Import pyarrow on first use; raises ExportUnavailable when it is missing"""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise ExportUnavailable(
+            "Columnar export needs pyarrow: pip install 'surgeontrainer-api[export]'"
+        ) from exc
+    return pyarrow
+
+
+def _arrow_type(pa: Any, column_type: types.TypeEngine) -> Any:
+    if isinstance(column_type, types.Boolean):
+        return pa.bool_()
+    if isinstance(column_type, types.Integer):
+        return pa.int64()
+    if isinstance(column_type, types.Numeric):
+        return pa.float64()
+    if isinstance(column_type, types.DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, types.Date):
+        return pa.date32()
+    if isinstance(column_type, types.Time):
+        return pa.time64("us")
+    if isinstance(column_type, types.LargeBinary):
+        return pa.binary()
+    return pa.string()
+
+
+def arrow_schema(table: Table) -> Any:
+    """Arrow schema matching the table's columns"""
+    pa = require_pyarrow()
+    return pa.schema([pa.field(column.name, _arrow_type(pa, column.type)) for column in table.columns])
+
+
+def iter_batches(connection: Connection, table: Table, chunk_rows: Optional[int] = None) -> Iterator[Any]:
+    """Record batches of at most chunk_rows rows, in primary key order"""
+    pa = require_pyarrow()
+    schema = arrow_schema(table)
+    chunk_rows = chunk_rows or settings.export_chunk_rows
+    result = connection.execution_options(yield_per=chunk_rows).execute(
+        select(table).order_by(*table.primary_key.columns)
+    )
+    for rows in result.partitions():
+        columns = zip(*rows)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        )
+
+
+def _write_batches(
+    connection: Connection,
+    table: Table,
+    sink: Union[str, BinaryIO],
+    fmt: str,
+    chunk_rows: Optional[int]
+) -> Iterator[int]:
+    """Write the table to sink, yielding each batch's row count once it is in the sink"""
+    pa = require_pyarrow()
+    schema = arrow_schema(table)
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression=settings.export_parquet_compression)
+    elif fmt == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    with writer:
+        for batch in iter_batches(connection, table, chunk_rows):
+            # One write per batch, so each chunk is its own Parquet row group
+            writer.write_batch(batch)
+            yield batch.num_rows
+
+
+def export_table(
+    connection: Connection,
+    table_name: str,
+    sink: Union[str, BinaryIO],
+    fmt: str = "parquet",
+    chunk_rows: Optional[int] = None
+) -> int:
+    """Write one table to a path or binary file; returns rows written"""
+    return sum(_write_batches(connection, EXPORT_TABLES[table_name], sink, fmt, chunk_rows))
+
+
+class _ChunkSink:
+    """Write-only file object drained after every batch, so a stream never holds more than one"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_export(table_name: str, fmt: str = "parquet", chunk_rows: Optional[int] = None) -> Iterator[bytes]:
+    """Encoded table, one chunk per batch, read over its own reader connection"""
+    sink = _ChunkSink()
+    with read_engine.connect() as connection:
+        for _ in _write_batches(connection, EXPORT_TABLES[table_name], sink, fmt, chunk_rows):
+            yield sink.drain()
+    # Parquet footer / Arrow end-of-stream marker
+    yield sink.drain()
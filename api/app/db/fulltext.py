@@ -0,0 +1,384 @@
+"""
+Full-text search indexes - FTS5 on SQLite, tsvector/GIN on PostgreSQL
+
+Indexes are maintained by the database itself (SQLite triggers, a PostgreSQL
+expression index), so every write path - single creates, bulk inserts and
+UPDATE ... RETURNING - keeps them current without ORM events.
+"""
+import logging
+import re
+from sqlalchemy import Float, Integer, false, func, literal_column, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import select
+from typing import Any, Optional
+
+from app.db.models.patient import Patient
+
+logger = logging.getLogger(__name__)
+
+# --- Patient name / MRN search -------------------------------------------
+
+PATIENT_FTS_WEIGHTS = (10.0, 5.0, 5.0)  # bm25 column weights: MRN hits rank first
+
+SQLITE_PATIENT_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS patient_fts USING fts5(
+        mrn, first_name, last_name,
+        content='patient', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS patient_fts_ai AFTER INSERT ON patient BEGIN
+        INSERT INTO patient_fts(rowid, mrn, first_name, last_name)
+        VALUES (new.id, new.mrn, new.first_name, new.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS patient_fts_ad AFTER DELETE ON patient BEGIN
+        INSERT INTO patient_fts(patient_fts, rowid, mrn, first_name, last_name)
+        VALUES ('delete', old.id, old.mrn, old.first_name, old.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS patient_fts_au AFTER UPDATE OF mrn, first_name, last_name ON patient BEGIN
+        INSERT INTO patient_fts(patient_fts, rowid, mrn, first_name, last_name)
+        VALUES ('delete', old.id, old.mrn, old.first_name, old.last_name);
+        INSERT INTO patient_fts(rowid, mrn, first_name, last_name)
+        VALUES (new.id, new.mrn, new.first_name, new.last_name);
+    END
+    """,
+]
+
+SQLITE_PATIENT_DROP = [
+    "DROP TRIGGER IF EXISTS patient_fts_au",
+    "DROP TRIGGER IF EXISTS patient_fts_ad",
+    "DROP TRIGGER IF EXISTS patient_fts_ai",
+    "DROP TABLE IF EXISTS patient_fts",
+]
+
+# The query must repeat this expression verbatim for the planner to use the index
+PG_PATIENT_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(mrn, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'B')"
+)
+
+PG_PATIENT_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_patient_search ON patient USING gin (({PG_PATIENT_DOCUMENT}))",
+]
+
+PG_PATIENT_DROP = [
+    "DROP INDEX IF EXISTS ix_patient_search",
+]
+
+
+def search_terms(search_term: str) -> list[str]:
+    """Split user input into lower-case word tokens, the same way both indexes tokenize"""
+    return re.findall(r"\w+", search_term.lower())
+
+
+def _has_table(connection: Connection, name: str) -> bool:
+    row = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).first()
+    return row is not None
+
+
+def install_patient_search(connection: Connection) -> None:
+    """Create the patient search index (idempotent); a new SQLite index is backfilled"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        created = not _has_table(connection, "patient_fts")
+        for statement in SQLITE_PATIENT_DDL:
+            connection.exec_driver_sql(statement)
+        if created:
+            backfill_patient_search(connection)
+    elif dialect == "postgresql":
+        for statement in PG_PATIENT_DDL:
+            connection.exec_driver_sql(statement)
+    else:
+        logger.warning("No full-text patient search for %s; falling back to LIKE", dialect)
+
+
+def drop_patient_search(connection: Connection) -> None:
+    """Remove the patient search index and its triggers"""
+    dialect = connection.dialect.name
+    statements = {"sqlite": SQLITE_PATIENT_DROP, "postgresql": PG_PATIENT_DROP}.get(dialect, [])
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def backfill_patient_search(connection: Connection) -> int:
+    """Rebuild the patient search index from the patient table; returns rows indexed"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        connection.exec_driver_sql("INSERT INTO patient_fts(patient_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        connection.exec_driver_sql("REINDEX INDEX ix_patient_search")
+    return connection.exec_driver_sql("SELECT count(*) FROM patient").scalar_one()
+
+
+def patient_search_statement(dialect: str, search_term: str) -> Optional[Any]:
+    """
+    SELECT of non-deleted patients matching every word of search_term as a
+    prefix, best match first. None when the term has no searchable words.
+    """
+    terms = search_terms(search_term)
+    if not terms:
+        return None
+
+    if dialect == "sqlite":
+        weights = ", ".join(str(weight) for weight in PATIENT_FTS_WEIGHTS)
+        hits = (
+            text(
+                f"SELECT rowid AS id, bm25(patient_fts, {weights}) AS score "
+                "FROM patient_fts WHERE patient_fts MATCH :query"
+            )
+            .bindparams(query=" ".join(f'"{term}"*' for term in terms))
+            .columns(id=Integer, score=Float)
+            .subquery("hits")
+        )
+        return (
+            select(Patient)
+            .join(hits, Patient.id == hits.c.id)
+            .where(Patient.is_deleted == false())
+            .order_by(hits.c.score, Patient.id)
+        )
+
+    if dialect == "postgresql":
+        document = literal_column(f"({PG_PATIENT_DOCUMENT})")
+        query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        return (
+            select(Patient)
+            .where(document.op("@@")(query), Patient.is_deleted == false())
+            .order_by(func.ts_rank(document, query).desc(), Patient.id)
+        )
+
+    # No full-text support: substring match on each word
+    criteria = [
+        Patient.first_name.contains(term) | Patient.last_name.contains(term) | Patient.mrn.contains(term)
+        for term in terms
+    ]
+    return select(Patient).where(*criteria, Patient.is_deleted == false()).order_by(Patient.id)
+
+
+# --- Clinical free-text search --------------------------------------------
+
+# (slot, table, column) for every indexed free-text column. Index rows are keyed
+# by entity_id * SLOT_RANGE + slot, so slots are part of the stored data: never
+# renumber or reuse one, only append.
+CLINICAL_TEXT_SOURCES = [
+    (1, "procedure", "operative_report"),
+    (2, "procedure", "complications"),
+    (3, "procedure", "notes"),
+    (4, "encounter", "chief_complaint"),
+    (5, "encounter", "notes"),
+    (6, "diagnosis", "notes"),
+    (7, "rc_other", "procedure_description"),
+    (8, "rc_other", "complications_intraop"),
+    (9, "rc_other", "complications_postop"),
+    (10, "rc_other", "notes"),
+    (11, "rc_rotatorcuff", "other_comments"),
+    (12, "rc_shoulderscope", "other_comments"),
+    (13, "rc_shoulderscope", "ac_technique_notes"),
+    (14, "rc_kneescope", "intraop_complications_explanation"),
+    (15, "rc_hiparthroplasty", "complications_intraop"),
+    (16, "rc_hiparthroplasty", "complications_postop"),
+    (17, "rc_hiparthroplasty", "notes"),
+    (18, "rc_kneearthroplasty", "complications_intraop"),
+    (19, "rc_kneearthroplasty", "complications_postop"),
+    (20, "rc_kneearthroplasty", "notes"),
+    (21, "rc_shoulderarthroplasty", "glenoid_notes"),
+]
+SLOT_RANGE = 1024
+CLINICAL_TEXT_SLOTS = {slot: (table, column) for slot, table, column in CLINICAL_TEXT_SOURCES}
+SNIPPET_START, SNIPPET_STOP = "<mark>", "</mark>"
+
+
+def _sources_by_table() -> dict[str, list[tuple[int, str]]]:
+    tables: dict[str, list[tuple[int, str]]] = {}
+    for slot, table, column in CLINICAL_TEXT_SOURCES:
+        tables.setdefault(table, []).append((slot, column))
+    return tables
+
+
+def _sqlite_clinical_ddl() -> list[str]:
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS clinical_text_fts USING fts5("
+        "body, tokenize='porter unicode61 remove_diacritics 2')"
+    ]
+    for table, sources in _sources_by_table().items():
+        inserts = "".join(
+            f"INSERT INTO clinical_text_fts(rowid, body) SELECT new.id * {SLOT_RANGE} + {slot}, new.{column} "
+            f"WHERE new.{column} IS NOT NULL;\n"
+            for slot, column in sources
+        )
+        deletes = "".join(
+            f"DELETE FROM clinical_text_fts WHERE rowid = old.id * {SLOT_RANGE} + {slot};\n"
+            for slot, column in sources
+        )
+        columns = ", ".join(column for _, column in sources)
+        statements += [
+            f'CREATE TRIGGER IF NOT EXISTS clinical_text_{table}_ai AFTER INSERT ON "{table}" BEGIN\n{inserts}END',
+            f'CREATE TRIGGER IF NOT EXISTS clinical_text_{table}_ad AFTER DELETE ON "{table}" BEGIN\n{deletes}END',
+            f'CREATE TRIGGER IF NOT EXISTS clinical_text_{table}_au AFTER UPDATE OF {columns} ON "{table}" BEGIN\n'
+            f"{deletes}{inserts}END",
+        ]
+    return statements
+
+
+def _sqlite_clinical_drop() -> list[str]:
+    statements = []
+    for table in _sources_by_table():
+        statements += [f"DROP TRIGGER IF EXISTS clinical_text_{table}_{suffix}" for suffix in ("ai", "ad", "au")]
+    return statements + ["DROP TABLE IF EXISTS clinical_text_fts"]
+
+
+def _pg_clinical_ddl() -> list[str]:
+    statements = [
+        "CREATE TABLE IF NOT EXISTS clinical_text ("
+        "id bigint PRIMARY KEY, body text NOT NULL, "
+        "document tsvector GENERATED ALWAYS AS (to_tsvector('english', body)) STORED)",
+        "CREATE INDEX IF NOT EXISTS ix_clinical_text_document ON clinical_text USING gin (document)",
+    ]
+    for table, sources in _sources_by_table().items():
+        ids = ", ".join(f"OLD.id * {SLOT_RANGE} + {slot}" for slot, _ in sources)
+        values = ", ".join(f"({slot}, NEW.{column})" for slot, column in sources)
+        columns = ", ".join(column for _, column in sources)
+        statements += [
+            f"""
+            CREATE OR REPLACE FUNCTION clinical_text_sync_{table}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    DELETE FROM clinical_text WHERE id IN ({ids});
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO clinical_text (id, body)
+                    SELECT NEW.id * {SLOT_RANGE} + slot, body FROM (VALUES {values}) AS v(slot, body)
+                    WHERE body IS NOT NULL;
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            f'DROP TRIGGER IF EXISTS clinical_text_{table} ON "{table}"',
+            f'CREATE TRIGGER clinical_text_{table} AFTER INSERT OR DELETE OR UPDATE OF {columns} ON "{table}" '
+            f"FOR EACH ROW EXECUTE FUNCTION clinical_text_sync_{table}()",
+        ]
+    return statements
+
+
+def _pg_clinical_drop() -> list[str]:
+    statements = []
+    for table in _sources_by_table():
+        statements += [
+            f'DROP TRIGGER IF EXISTS clinical_text_{table} ON "{table}"',
+            f"DROP FUNCTION IF EXISTS clinical_text_sync_{table}()",
+        ]
+    return statements + ["DROP TABLE IF EXISTS clinical_text"]
+
+
+def install_clinical_text_search(connection: Connection) -> None:
+    """Create the clinical text index and its triggers (idempotent); a new index is backfilled"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        created = not _has_table(connection, "clinical_text_fts")
+        for statement in _sqlite_clinical_ddl():
+            connection.exec_driver_sql(statement)
+    elif dialect == "postgresql":
+        created = connection.exec_driver_sql("SELECT to_regclass('clinical_text')").scalar() is None
+        for statement in _pg_clinical_ddl():
+            connection.exec_driver_sql(statement)
+    else:
+        logger.warning("No clinical text search for %s", dialect)
+        return
+    if created:
+        backfill_clinical_text_search(connection)
+
+
+def drop_clinical_text_search(connection: Connection) -> None:
+    """Remove the clinical text index and its triggers"""
+    dialect = connection.dialect.name
+    statements = {"sqlite": _sqlite_clinical_drop, "postgresql": _pg_clinical_drop}.get(dialect, list)()
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def backfill_clinical_text_search(connection: Connection) -> int:
+    """Rebuild the clinical text index from every source column; returns entries indexed"""
+    dialect = connection.dialect.name
+    index_table = {"sqlite": "clinical_text_fts", "postgresql": "clinical_text"}.get(dialect)
+    if index_table is None:
+        return 0
+    key = "rowid" if dialect == "sqlite" else "id"
+    connection.exec_driver_sql(f"DELETE FROM {index_table}")
+    for slot, table, column in CLINICAL_TEXT_SOURCES:
+        connection.exec_driver_sql(
+            f"INSERT INTO {index_table} ({key}, body) "
+            f'SELECT id * {SLOT_RANGE} + {slot}, {column} FROM "{table}" WHERE {column} IS NOT NULL'
+        )
+    if dialect == "sqlite":
+        connection.exec_driver_sql("INSERT INTO clinical_text_fts(clinical_text_fts) VALUES ('optimize')")
+    return connection.exec_driver_sql(f"SELECT count(*) FROM {index_table}").scalar_one()
+
+
+def clinical_text_search_statement(
+    dialect: str,
+    search_term: str,
+    entity_types: Optional[list[str]] = None,
+    skip: int = 0,
+    limit: int = 50
+) -> Optional[Any]:
+    """
+    SELECT (key, score, snippet) rows over the clinical text index, best
+    match first. Every word must match (stemmed); a trailing * makes a word
+    a prefix. Decode key with decode_clinical_key. None when the term has
+    no searchable words.
+    """
+    words = re.findall(r"(\w+)(\*?)", search_term.lower())
+    if not words:
+        return None
+    slots = None
+    if entity_types:
+        slots = [slot for slot, table, _ in CLINICAL_TEXT_SOURCES if table in entity_types]
+
+    if dialect == "sqlite":
+        query = " ".join(f'"{word}"{star}' for word, star in words)
+        sql = (
+            "SELECT rowid AS key, bm25(clinical_text_fts) AS score, "
+            f"snippet(clinical_text_fts, 0, '{SNIPPET_START}', '{SNIPPET_STOP}', '…', 16) AS snippet "
+            "FROM clinical_text_fts WHERE clinical_text_fts MATCH :query"
+        )
+        order = "score"
+    elif dialect == "postgresql":
+        query = " & ".join(f"{word}{':*' if star else ''}" for word, star in words)
+        sql = (
+            "SELECT id AS key, ts_rank(document, q) AS score, "
+            f"ts_headline('english', body, q, 'StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, "
+            "MaxFragments=1, MaxWords=24, MinWords=8') AS snippet "
+            "FROM clinical_text, to_tsquery('english', :query) AS q WHERE document @@ q"
+        )
+        order = "score DESC"
+    else:
+        return None
+
+    if slots is not None:
+        sql += f" AND ({'rowid' if dialect == 'sqlite' else 'id'} % {SLOT_RANGE}) IN ({', '.join(map(str, slots)) or 'NULL'})"
+    return (
+        text(f"{sql} ORDER BY {order}, key LIMIT :limit OFFSET :skip")
+        .bindparams(query=query, limit=limit, skip=skip)
+        .columns(key=Integer, score=Float)
+    )
+
+
+def decode_clinical_key(key: int) -> tuple[str, int, str]:
+    """Index key -> (table, row id, column)"""
+    table, column = CLINICAL_TEXT_SLOTS[key % SLOT_RANGE]
+    return table, key // SLOT_RANGE, column
+
+
+def install(engine: Engine) -> None:
+    """Create every full-text index the app uses"""
+    with engine.begin() as connection:
+        install_patient_search(connection)
+        install_clinical_text_search(connection)
@@ -0,0 +1,338 @@
+"""
+Index advisor - EXPLAIN the statements hot CRUD paths issue and propose indexes
+
+The hot paths below are run through the real CRUD functions inside one
+transaction that is rolled back at the end (their commits only flush), so the
+advisor is safe to point at a live database. Every SELECT / UPDATE / DELETE
+they issue is recorded and explained; a full table scan or a temp-B-tree sort
+gets a proposed composite index, and literal predicates such as
+is_deleted = 0 become a partial index. Each proposal is created inside a
+savepoint and kept only if the planner then uses it. The patient row and MRN
+caches are emptied before each hot query, so a lookup they would answer still
+reaches the database and gets explained.
+"""
+import re
+from datetime import date, datetime
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+from uuid import uuid4
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+from app.db import models  # noqa: F401 - registers every table
+from app.db.core import GroupCommitSession, engine as default_engine
+from app.db.crud import diagnosis, encounter, patient, procedure, rc_case_index, search
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+
+def hot_queries() -> dict[str, Callable[[Any], Any]]:
+    """Named CRUD calls that sit on request paths; ids need not exist"""
+    queries = {
+        "patients.list": lambda s: patient.get_patients(s, limit=100),
+        "patients.list_after": lambda s: patient.get_patients(s, limit=100, after_id=1000),
+        "patients.get": lambda s: patient.get_patient(s, 1),
+        "patients.by_mrn": lambda s: patient.get_patient_by_mrn(s, "ADVISOR-MRN"),
+        "patients.search": lambda s: patient.search_patients(s, "smi", limit=20),
+        "patients.match": lambda s: patient.match_patients(
+            s, mrn="123", first_name="Jon", last_name="Smith", date_of_birth=None
+        ),
+        "patients.update": lambda s: patient.update_patient(s, 1, {"city": "Advisor"}),
+        "patients.delete": lambda s: patient.delete_patient(s, 1),
+        "patients.restore": lambda s: patient.restore_patient(s, 1),
+        "encounters.list": lambda s: encounter.get_encounters(s, limit=100),
+        "encounters.by_patient": lambda s: encounter.get_patient_encounters(s, 1, limit=100),
+        "encounters.by_patient_after": lambda s: encounter.get_patient_encounters(s, 1, limit=100, after_id=10),
+        "diagnoses.list": lambda s: diagnosis.get_diagnoses(s, limit=100),
+        "diagnoses.by_encounter": lambda s: diagnosis.get_encounter_diagnoses(s, 1),
+        "procedures.list": lambda s: procedure.get_procedures(s, limit=100),
+        "procedures.by_encounter": lambda s: procedure.get_encounter_procedures(s, 1),
+        "search.text": lambda s: search.search_clinical_text(s, "fracture"),
+    }
+    queries.update({
+        "rc.cases.by_attending": lambda s: rc_case_index.get_cases(
+            s, attending="Dr. Advisor", surgery_date_from=date(2025, 1, 1), surgery_date_to=date(2025, 12, 31)
+        ),
+        "rc.cases.by_fellow": lambda s: rc_case_index.get_cases(s, fellow_or_pa="Dr. Advisor"),
+        "rc.cases.by_type": lambda s: rc_case_index.get_cases(
+            s, procedure_types=["rotator-cuff"], surgery_date_from=date(2025, 1, 1)
+        ),
+        "rc.cases.by_mrn": lambda s: rc_case_index.get_cases(s, mrn="ADVISOR-MRN"),
+        "rc.cases.by_date": lambda s: rc_case_index.get_cases(
+            s, surgery_date_from=date(2025, 1, 1), surgery_date_to=date(2025, 12, 31)
+        ),
+    })
+    for slug, case_type in RESEARCH_CASE_TYPES.items():
+        queries[f"rc.{slug}.list"] = lambda s, crud=case_type.crud: crud.get_cases(s, limit=100)
+        queries[f"rc.{slug}.by_encounter"] = lambda s, crud=case_type.crud: crud.get_case_by_encounter(s, 1)
+    return queries
+
+
+class PlanIssue(NamedTuple):
+    """Something the planner does that an index could avoid"""
+    table: str
+    kind: str  # "full scan" | "temp sort"
+    detail: str
+
+
+class IndexProposal(NamedTuple):
+    """A candidate index; where_sqlite / where_pg are set for partial indexes"""
+    table: str
+    columns: tuple[str, ...]
+    where_sqlite: Optional[str] = None
+    where_pg: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        if not self.where_sqlite:
+            suffix = ""
+        else:
+            suffix = "_active" if self.where_sqlite == "is_deleted = 0" else "_partial"
+        return f"ix_{self.table}_{'_'.join(self.columns)}{suffix}"
+
+    def ddl(self, dialect: str) -> str:
+        where = self.where_sqlite if dialect == "sqlite" else self.where_pg
+        sql = f'CREATE INDEX {self.name} ON "{self.table}" ({", ".join(self.columns)})'
+        return f"{sql} WHERE {where}" if where else sql
+
+
+class Finding(NamedTuple):
+    """One recorded statement, its plan, and what to do about it"""
+    query: str
+    sql: str
+    plan: list[str]
+    issues: list[PlanIssue]
+    proposals: list[IndexProposal]
+
+
+@contextmanager
+def record_statements(engine: Engine) -> Iterator[list[tuple[str, Any]]]:
+    """Collect (sql, parameters) for every single-row SELECT/UPDATE/DELETE sent to engine"""
+    recorded: list[tuple[str, Any]] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        if not executemany and verb in ("SELECT", "UPDATE", "DELETE", "WITH"):
+            recorded.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield recorded
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _main_table(sql: str) -> Optional[str]:
+    match = re.search(r'\b(?:FROM|UPDATE)\s+"?(\w+)"?', sql, re.IGNORECASE)
+    return match.group(1) if match else None
+
+
+def _bounded_walk(sql: str) -> bool:
+    """An unfiltered ORDER BY id ... LIMIT reads the primary key in order and stops early"""
+    return not re.search(r"\bWHERE\b", sql, re.IGNORECASE) and bool(re.search(r"\bLIMIT\b", sql, re.IGNORECASE))
+
+
+def explain(connection: Connection, sql: str, parameters: Any) -> tuple[list[str], list[PlanIssue]]:
+    """Plan lines for a statement and the issues found in them"""
+    tables = set(SQLModel.metadata.tables)
+    plan: list[str] = []
+    issues: list[PlanIssue] = []
+
+    if connection.dialect.name == "sqlite":
+        for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters):
+            detail = row[-1]
+            plan.append(detail)
+            scan = re.match(r"SCAN (\w+)$", detail)
+            if scan and scan.group(1) in tables and not _bounded_walk(sql):
+                issues.append(PlanIssue(scan.group(1), "full scan", detail))
+            elif detail.startswith("USE TEMP B-TREE FOR ORDER BY"):
+                issues.append(PlanIssue(_main_table(sql) or "?", "temp sort", detail))
+        return plan, issues
+
+    # PostgreSQL: seq scans win on small tables, so ask whether an index could serve at all
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    try:
+        result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", parameters).scalar()
+    finally:
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = on")
+
+    def walk(node: dict, depth: int = 0) -> None:
+        node_type = node["Node Type"]
+        relation = node.get("Relation Name")
+        plan.append("  " * depth + node_type + (f" on {relation}" if relation else ""))
+        if node_type == "Seq Scan" and relation in tables and not _bounded_walk(sql):
+            issues.append(PlanIssue(relation, "full scan", node_type))
+        elif node_type == "Sort":
+            issues.append(PlanIssue(_main_table(sql) or "?", "temp sort", ", ".join(node.get("Sort Key", []))))
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(result[0]["Plan"])
+    return plan, issues
+
+
+def propose_index(sql: str, table: str) -> Optional[IndexProposal]:
+    """
+    Derive an index from a simple single-table statement: equality columns,
+    then IN columns, then the first range or ORDER BY column. Literal
+    predicates (is_deleted = 0 / false) become the partial-index condition.
+    """
+    if re.search(r"\bJOIN\b", sql, re.IGNORECASE):
+        return None
+    where_match = re.search(r"\bWHERE\b(.*?)(?:\bORDER BY\b|\bLIMIT\b|\bRETURNING\b|$)", sql, re.S | re.I)
+    order_match = re.search(r"\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|$)", sql, re.S | re.I)
+    where = where_match.group(1) if where_match else ""
+    column_ref = rf'"?{table}"?\."?(\w+)"?'
+
+    equality, in_list, ranges, literal = [], [], [], []
+    for column, operator, value in re.findall(rf"{column_ref}\s*(=|>=|<=|>|<|IN)\s*(\(|\?|%\(\w+\)s|\w+)", where):
+        if operator == "=" and re.fullmatch(r"\d+|true|false", value, re.I):
+            literal.append((column, value.lower()))
+        elif operator == "=":
+            equality.append(column)
+        elif operator.upper() == "IN":
+            in_list.append(column)
+        else:
+            ranges.append(column)
+    ordering = re.findall(column_ref, order_match.group(1)) if order_match else []
+
+    columns: list[str] = []
+    for column in equality + in_list + (ranges[:1] or ordering[:1]):
+        if column not in columns:
+            columns.append(column)
+    if not columns:
+        return None
+
+    if not literal:
+        return IndexProposal(table, tuple(columns))
+    as_sqlite = {"false": "0", "true": "1"}
+    as_pg = {"0": "false", "1": "true"}
+    return IndexProposal(
+        table,
+        tuple(columns),
+        where_sqlite=" AND ".join(f"{column} = {as_sqlite.get(value, value)}" for column, value in literal),
+        where_pg=" AND ".join(f"{column} = {as_pg.get(value, value)}" for column, value in literal),
+    )
+
+
+def _exists(connection: Connection, proposal: IndexProposal) -> bool:
+    """An index on the same leading columns is already there (the planner chose not to use it)"""
+    for index in inspect(connection).get_indexes(proposal.table):
+        if tuple(index["column_names"][:len(proposal.columns)]) == proposal.columns:
+            return True
+    return False
+
+
+def _helps(connection: Connection, proposal: IndexProposal, sql: str, parameters: Any) -> bool:
+    """Create the index in a savepoint and check the planner uses it to clear the issue"""
+    connection.exec_driver_sql("SAVEPOINT index_advisor")
+    try:
+        connection.exec_driver_sql(proposal.ddl(connection.dialect.name))
+        plan, issues = explain(connection, sql, parameters)
+        if connection.dialect.name == "sqlite":
+            used = any(proposal.name in line for line in plan)
+        else:
+            used = not any(issue.table == proposal.table for issue in issues)
+        return used and not any(issue.table == proposal.table for issue in issues)
+    finally:
+        connection.exec_driver_sql("ROLLBACK TO SAVEPOINT index_advisor")
+        connection.exec_driver_sql("RELEASE SAVEPOINT index_advisor")
+
+
+def _clear_caches() -> None:
+    """Empty the caches CRUD lookups answer from without SQL"""
+    patient.row_cache.clear()
+    patient.mrn_cache.clear()
+
+
+def analyze(engine: Engine = default_engine) -> list[Finding]:
+    """Run every hot query, explain what it sent and propose indexes"""
+    findings: list[Finding] = []
+    with GroupCommitSession(writer=engine, reader=engine) as session:
+        connection = session.connection()
+        try:
+            for name, query in hot_queries().items():
+                _clear_caches()
+                with record_statements(engine) as recorded:
+                    query(session)
+                seen = set()
+                for sql, parameters in recorded:
+                    if sql in seen:
+                        continue
+                    seen.add(sql)
+                    plan, issues = explain(connection, sql, parameters)
+                    proposals = []
+                    for table in dict.fromkeys(issue.table for issue in issues):
+                        proposal = propose_index(sql, table)
+                        if (
+                            proposal is not None
+                            and not _exists(connection, proposal)
+                            and _helps(connection, proposal, sql, parameters)
+                        ):
+                            proposals.append(proposal)
+                    findings.append(Finding(name, sql, plan, issues, proposals))
+        finally:
+            session.rollback()
+            # Rows cached from inside the rolled-back transaction must not outlive it
+            _clear_caches()
+    return findings
+
+
+def render_migration(proposals: list[IndexProposal], revision: str, down_revision: Optional[str]) -> str:
+    """An Alembic migration creating the proposed indexes"""
+    upgrade, downgrade = [], []
+    for proposal in proposals:
+        where = ""
+        if proposal.where_sqlite:
+            where = (
+                f",\n        sqlite_where=sa.text({proposal.where_sqlite!r}),"
+                f"\n        postgresql_where=sa.text({proposal.where_pg!r}),"
+            )
+        upgrade.append(
+            f"    op.create_index(\n        {proposal.name!r},\n        {proposal.table!r},\n"
+            f"        {list(proposal.columns)!r},\n        unique=False{where}\n    )"
+        )
+        downgrade.append(f"    op.drop_index({proposal.name!r}, table_name={proposal.table!r})")
+    return f'''"""Add indexes proposed by the index advisor
+
+Revision ID: {revision}
+Revises: {down_revision}
+Create Date: {datetime.now()}
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = {revision!r}
+down_revision: Union[str, None] = {down_revision!r}
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+{chr(10).join(upgrade) or "    pass"}
+
+
+def downgrade() -> None:
+{chr(10).join(reversed(downgrade)) or "    pass"}
+'''
+
+
+def emit_migration(proposals: list[IndexProposal]) -> Path:
+    """Write the proposals as a new migration on top of the current Alembic head"""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(Config(str(MIGRATIONS_DIR.parents[1] / "alembic.ini")))
+    revision = uuid4().hex[:12]
+    path = MIGRATIONS_DIR / f"{revision}_add_advised_indexes.py"
+    path.write_text(render_migration(proposals, revision, script.get_current_head()))
+    return path
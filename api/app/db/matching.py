@@ -0,0 +1,136 @@
+"""
+Patient matching - blocking keys stored on Patient and candidate scoring
+
+Keys are computed on every write to mrn / first_name / last_name, so a match
+lookup is a handful of indexed equality probes rather than a scan. Scoring
+then runs in Python over the few candidates those probes return.
+"""
+import re
+import unicodedata
+from datetime import date
+from difflib import SequenceMatcher
+from typing import Any, Optional
+
+# Soundex letter groups; vowels, H, W and Y code as 0 (separators)
+_PHONETIC_CODES = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+_PHONETIC_PREFIXES = (("KN", "N"), ("GN", "N"), ("PN", "N"), ("WR", "R"), ("PS", "S"), ("X", "S"))
+_PHONETIC_REWRITES = (("PH", "F"), ("SCH", "SK"), ("CK", "K"))
+
+KEY_FIELDS = (
+    ("mrn", "mrn_key"),
+    ("first_name", "first_name_key"),
+    ("last_name", "last_name_key"),
+)
+
+# Score weights; an exact normalized MRN plus DOB is already a confident match. A
+# different MRN is left out of the score rather than scored 0, or the MRN weight alone
+# would keep every record under another MRN below any useful threshold
+WEIGHTS = {"mrn": 0.5, "date_of_birth": 0.2, "last_name": 0.15, "first_name": 0.15}
+
+
+def _letters(value: str) -> str:
+    """Upper-case ASCII letters only, diacritics folded (Núñez -> NUNEZ)"""
+    folded = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Z]", "", folded.upper())
+
+
+def normalize_mrn(mrn: str) -> str:
+    """Upper-case alphanumerics with leading zeros dropped (mrn-00123 -> MRN00123, 00123 -> 123)"""
+    return re.sub(r"[^0-9A-Z]", "", mrn.upper()).lstrip("0")
+
+
+def phonetic_key(name: str) -> str:
+    """
+    Soundex variant that also codes the first letter, so names that differ
+    only in a same-sounding initial (Catherine / Kathryn, Carl / Karl) share
+    a key. A leading vowel is kept as 0; the key is capped at 6 digits.
+    """
+    letters = _letters(name)
+    for prefix, replacement in _PHONETIC_PREFIXES:
+        if letters.startswith(prefix):
+            letters = replacement + letters[len(prefix):]
+            break
+    for pattern, replacement in _PHONETIC_REWRITES:
+        letters = letters.replace(pattern, replacement)
+    if not letters:
+        return ""
+
+    key = ""
+    previous = None
+    for position, letter in enumerate(letters):
+        if letter in "HW" and position:
+            continue  # H and W do not separate equal codes
+        code = _PHONETIC_CODES.get(letter, "0")
+        if code != previous and (code != "0" or not position):
+            key += code
+        previous = code
+    return key[:6]
+
+
+def blocking_keys(data: dict) -> dict:
+    """
+    Key columns for whichever of mrn / first_name / last_name appear in data
+    (None when the source value is empty), ready to merge into an insert or
+    update
+    """
+    keys = {}
+    for field, key_field in KEY_FIELDS:
+        if field in data:
+            value = data[field]
+            if not value:
+                keys[key_field] = None
+            elif field == "mrn":
+                keys[key_field] = normalize_mrn(value) or None
+            else:
+                keys[key_field] = phonetic_key(value) or None
+    return keys
+
+
+def _similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Spelling similarity, floored at 0.9 when the names sound alike"""
+    if not a or not b:
+        return 0.0
+    ratio = SequenceMatcher(None, _letters(a), _letters(b)).ratio()
+    if ratio < 0.9 and phonetic_key(a) and phonetic_key(a) == phonetic_key(b):
+        return 0.9
+    return ratio
+
+
+def score_candidate(
+    patient: Any,
+    mrn: Optional[str] = None,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    date_of_birth: Optional[date] = None
+) -> tuple[float, list[str]]:
+    """
+    Weighted 0..1 score of a candidate against the probe, and the fields that
+    matched. Under a different MRN the score is the name and DOB agreement alone.
+    """
+    parts = {
+        "mrn": float(bool(mrn) and normalize_mrn(mrn) == patient.mrn_key),
+        "date_of_birth": float(date_of_birth is not None and date_of_birth == patient.date_of_birth),
+        "last_name": _similarity(last_name, patient.last_name),
+        "first_name": _similarity(first_name, patient.first_name),
+    }
+    # Only weigh the fields the caller actually supplied
+    supplied = {
+        "mrn": bool(mrn),
+        "date_of_birth": date_of_birth is not None,
+        "last_name": bool(last_name),
+        "first_name": bool(first_name),
+    }
+    weighed = [field for field, present in supplied.items() if present and (field != "mrn" or parts["mrn"])]
+    total = sum(WEIGHTS[field] for field in weighed)
+    if not total:
+        return 0.0, []
+    score = sum(WEIGHTS[field] * parts[field] for field in weighed) / total
+    matched = [field for field, value in parts.items() if value >= 0.85]
+    return round(score, 4), matched
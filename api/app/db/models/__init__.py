@@ -1,3 +1,41 @@
 """
 Database models package
 """
+# Importing the package registers every table on SQLModel.metadata
+from .patient import Patient
+from .encounter import Encounter
+from .diagnosis import Diagnosis
+from .procedure import Procedure
+from .rc_rotatorcuff import RcRotatorCuff
+from .rc_kneescope import RcKneeScope
+from .rc_shoulderscope import RcShoulderScope
+from .rc_shoulderarthroplasty import RcShoulderArthroplasty
+from .rc_hipscope import RcHipScope
+from .rc_hiparthroplasty import RcHipArthroplasty
+from .rc_kneearthroplasty import RcKneeArthroplasty
+from .rc_other import RcOther
+from .stat_counter import StatCounter
+from .rc_case_index import RcCaseIndex
+from .caseload import CaseloadCase, CaseloadRollup, CaseloadWatermark
+from .table_version import TableVersion
+
+__all__ = [
+    "Patient",
+    "Encounter",
+    "Diagnosis",
+    "Procedure",
+    "RcRotatorCuff",
+    "RcKneeScope",
+    "RcShoulderScope",
+    "RcShoulderArthroplasty",
+    "RcHipScope",
+    "RcHipArthroplasty",
+    "RcKneeArthroplasty",
+    "RcOther",
+    "StatCounter",
+    "RcCaseIndex",
+    "CaseloadCase",
+    "CaseloadRollup",
+    "CaseloadWatermark",
+    "TableVersion",
+]
@@ -0,0 +1,38 @@
+"""
+Caseload rollup models - monthly case counts per person and procedure type (see app.db.caseload)
+"""
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class CaseloadRollup(SQLModel, table=True):
+    """Cases one attending or fellow/PA did of one procedure type in one month"""
+    __tablename__ = "caseload_rollup"
+
+    role: str = Field(primary_key=True, max_length=20, description="attending/fellow_or_pa")
+    person: str = Field(primary_key=True, max_length=100)
+    procedure_type: str = Field(primary_key=True, max_length=50, description="Research case type slug")
+    month: str = Field(primary_key=True, max_length=7, description="YYYY-MM of the surgery date, or unknown")
+    case_count: int = Field(default=0)
+
+
+class CaseloadCase(SQLModel, table=True):
+    """What one research case is currently counted as in caseload_rollup"""
+    __tablename__ = "caseload_case"
+
+    procedure_type: str = Field(primary_key=True, max_length=50)
+    case_id: int = Field(primary_key=True)
+    attending: Optional[str] = Field(default=None, max_length=100)
+    fellow_or_pa: Optional[str] = Field(default=None, max_length=100)
+    month: str = Field(max_length=7)
+
+
+class CaseloadWatermark(SQLModel, table=True):
+    """Refresh progress for one rc_* table"""
+    __tablename__ = "caseload_watermark"
+
+    procedure_type: str = Field(primary_key=True, max_length=50)
+    high_water: Optional[datetime] = Field(default=None, description="Latest coalesce(updated_at, created_at) applied")
+    case_count: int = Field(default=0, description="Cases counted from this table")
+    refreshed_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,6 +1,7 @@
 """
 Patient model - Core EMR table for patient demographics and medical history
 """
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import date, datetime
@@ -9,6 +10,19 @@ from datetime import date, datetime
 class Patient(SQLModel, table=True):
     """Patient demographic and medical information"""
     __tablename__ = "patient"
+    __table_args__ = (
+        # Blocking indexes for /patients/match (see app.db.matching)
+        Index("ix_patient_dob_last_name_key", "date_of_birth", "last_name_key"),
+        Index("ix_patient_dob_first_name_key", "date_of_birth", "first_name_key"),
+        Index("ix_patient_name_keys", "last_name_key", "first_name_key"),
+        # Active-patient listing (WHERE is_deleted = 0 ORDER BY id); see app.db.index_advisor
+        Index(
+            "ix_patient_id_active",
+            "id",
+            sqlite_where=text("is_deleted = 0"),
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
     
     # Primary Key
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -45,6 +59,11 @@ class Patient(SQLModel, table=True):
     family_history: Optional[str] = Field(default=None, description="Free text")
     social_history: Optional[str] = Field(default=None, description="Free text")
     
+    # Matching keys - derived from mrn / names on every write
+    mrn_key: Optional[str] = Field(default=None, max_length=50, index=True, description="Normalized MRN")
+    first_name_key: Optional[str] = Field(default=None, max_length=10, description="Phonetic first name")
+    last_name_key: Optional[str] = Field(default=None, max_length=10, description="Phonetic last name")
+    
     # System Fields
     is_deleted: bool = Field(default=False, description="Soft delete flag")
     created_at: datetime = Field(default_factory=datetime.utcnow)
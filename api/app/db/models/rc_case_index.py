@@ -0,0 +1,34 @@
+"""
+Research case index model - common columns of every rc_* table, kept by triggers (see app.db.case_index)
+"""
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import date
+
+
+class RcCaseIndex(SQLModel, table=True):
+    """One research case of any procedure type"""
+    __tablename__ = "rc_case_index"
+    __table_args__ = (
+        Index("ix_rc_case_index_case", "procedure_type", "case_id", unique=True),
+        Index("ix_rc_case_index_type_date", "procedure_type", "surgery_date"),
+        Index("ix_rc_case_index_attending_date", "attending", "surgery_date"),
+        Index("ix_rc_case_index_fellow_date", "fellow_or_pa", "surgery_date"),
+        Index("ix_rc_case_index_surgery_date", "surgery_date"),
+    )
+
+    # Primary Key - stable across updates, so it doubles as the paging key
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    # Source case
+    procedure_type: str = Field(max_length=50, description="Research case type slug, e.g. rotator-cuff")
+    case_id: int
+    encounter_id: int = Field(index=True)
+
+    # Common case metadata
+    mrn: Optional[str] = Field(default=None, max_length=50, index=True)
+    attending: Optional[str] = Field(default=None, max_length=100)
+    fellow_or_pa: Optional[str] = Field(default=None, max_length=100)
+    laterality: Optional[str] = Field(default=None, max_length=20)
+    surgery_date: Optional[date] = Field(default=None)
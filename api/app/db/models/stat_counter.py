@@ -0,0 +1,13 @@
+"""
+StatCounter model - rollup counts kept current by database triggers (see app.db.stats)
+"""
+from sqlmodel import SQLModel, Field
+
+
+class StatCounter(SQLModel, table=True):
+    """One bucket of one rollup, e.g. metric=patient.sex, bucket=F"""
+    __tablename__ = "stat_counter"
+
+    metric: str = Field(primary_key=True, max_length=64)
+    bucket: str = Field(primary_key=True, max_length=64)
+    count: int = Field(default=0)
@@ -0,0 +1,15 @@
+"""
+TableVersion model - per-table change counters kept current by database triggers (see app.db.versions)
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+
+class TableVersion(SQLModel, table=True):
+    """Bumped by every INSERT, UPDATE or DELETE on table_name"""
+    __tablename__ = "table_version"
+
+    table_name: str = Field(primary_key=True, max_length=64)
+    version: int = Field(default=0)
+    changed_at: Optional[datetime] = Field(default=None)
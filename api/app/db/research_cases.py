@@ -0,0 +1,97 @@
+"""
+Research case registry - one entry per rc_* table, keyed by its API slug
+"""
+from types import ModuleType
+from typing import NamedTuple, Type
+from pydantic import BaseModel
+from sqlmodel import SQLModel
+
+from app.db.crud import (
+    rc_hiparthroplasty, rc_hipscope, rc_kneearthroplasty, rc_kneescope,
+    rc_other, rc_rotatorcuff, rc_shoulderarthroplasty, rc_shoulderscope,
+)
+from app.db.models.rc_hiparthroplasty import RcHipArthroplasty
+from app.db.models.rc_hipscope import RcHipScope
+from app.db.models.rc_kneearthroplasty import RcKneeArthroplasty
+from app.db.models.rc_kneescope import RcKneeScope
+from app.db.models.rc_other import RcOther
+from app.db.models.rc_rotatorcuff import RcRotatorCuff
+from app.db.models.rc_shoulderarthroplasty import RcShoulderArthroplasty
+from app.db.models.rc_shoulderscope import RcShoulderScope
+from app.db.schemas import (
+    rc_hiparthroplasty as hiparthroplasty_schemas,
+    rc_hipscope as hipscope_schemas,
+    rc_kneearthroplasty as kneearthroplasty_schemas,
+    rc_kneescope as kneescope_schemas,
+    rc_other as other_schemas,
+    rc_rotatorcuff as rotatorcuff_schemas,
+    rc_shoulderarthroplasty as shoulderarthroplasty_schemas,
+    rc_shoulderscope as shoulderscope_schemas,
+)
+
+
+class ResearchCaseType(NamedTuple):
+    """Everything needed to work with one research case table generically"""
+    slug: str
+    label: str
+    model: Type[SQLModel]
+    crud: ModuleType
+    create_schema: Type[BaseModel]
+    update_schema: Type[BaseModel]
+    response_schema: Type[BaseModel]
+    surgery_date: str = "surgery_date"  # column holding the date of surgery
+
+
+RESEARCH_CASE_TYPES: dict[str, ResearchCaseType] = {
+    entry.slug: entry for entry in (
+        ResearchCaseType(
+            "rotator-cuff", "Rotator Cuff", RcRotatorCuff, rc_rotatorcuff,
+            rotatorcuff_schemas.RcRotatorCuffCreate,
+            rotatorcuff_schemas.RcRotatorCuffUpdate,
+            rotatorcuff_schemas.RcRotatorCuffResponse,
+            surgery_date="date_of_surgery",
+        ),
+        ResearchCaseType(
+            "knee-surgical", "Knee Surgical", RcKneeScope, rc_kneescope,
+            kneescope_schemas.RcKneeSurgicalCreate,
+            kneescope_schemas.RcKneeSurgicalUpdate,
+            kneescope_schemas.RcKneeSurgicalResponse,
+        ),
+        ResearchCaseType(
+            "shoulder-scope", "Shoulder Scope", RcShoulderScope, rc_shoulderscope,
+            shoulderscope_schemas.RcShoulderScopeSurgicalCreate,
+            shoulderscope_schemas.RcShoulderScopeSurgicalUpdate,
+            shoulderscope_schemas.RcShoulderScopeSurgicalResponse,
+        ),
+        ResearchCaseType(
+            "shoulder-arthroplasty", "Shoulder Arthroplasty", RcShoulderArthroplasty, rc_shoulderarthroplasty,
+            shoulderarthroplasty_schemas.RcShoulderArthroplastySurgicalCreate,
+            shoulderarthroplasty_schemas.RcShoulderArthroplastySurgicalUpdate,
+            shoulderarthroplasty_schemas.RcShoulderArthroplastySurgicalResponse,
+        ),
+        ResearchCaseType(
+            "hip-scope", "Hip Scope", RcHipScope, rc_hipscope,
+            hipscope_schemas.RcHipSurgicalCreate,
+            hipscope_schemas.RcHipSurgicalUpdate,
+            hipscope_schemas.RcHipSurgicalResponse,
+        ),
+        ResearchCaseType(
+            "hip-arthroplasty", "Hip Arthroplasty", RcHipArthroplasty, rc_hiparthroplasty,
+            hiparthroplasty_schemas.RcHipArthroplastySurgicalCreate,
+            hiparthroplasty_schemas.RcHipArthroplastySurgicalUpdate,
+            hiparthroplasty_schemas.RcHipArthroplastySurgicalResponse,
+        ),
+        ResearchCaseType(
+            "knee-arthroplasty", "Knee Arthroplasty", RcKneeArthroplasty, rc_kneearthroplasty,
+            kneearthroplasty_schemas.RcKneeArthroplastySurgicalCreate,
+            kneearthroplasty_schemas.RcKneeArthroplastySurgicalUpdate,
+            kneearthroplasty_schemas.RcKneeArthroplastySurgicalResponse,
+        ),
+        ResearchCaseType(
+            "other", "Other Procedures", RcOther, rc_other,
+            other_schemas.RcOtherSurgicalCreate,
+            other_schemas.RcOtherSurgicalUpdate,
+            other_schemas.RcOtherSurgicalResponse,
+        ),
+    )
+}
@@ -0,0 +1,41 @@
+"""
+Batch schemas - POST /batch request of ordered API operations and its per-operation report
+"""
+from pydantic import BaseModel, Field
+from typing import Any, List, Literal, Optional
+from app.config import settings
+
+
+class BatchOperation(BaseModel):
+    """
+    One API call. path is relative to /api/v1 and may carry a query string.
+    Anywhere in path or body, ${ref.field} (or ${index.field}) is replaced by
+    that field of an earlier operation's response, e.g. "${visit.id}"; a body
+    value that is only a reference keeps the referenced value's type.
+    """
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str
+    body: Optional[Any] = None
+    ref: Optional[str] = None  # name later operations use to refer to this one
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of operations run in order in one session"""
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=settings.batch_max_operations)
+    atomic: bool = False  # True: the first failure rolls back every operation and skips the rest
+
+
+class BatchResult(BaseModel):
+    """Outcome for one operation, in request order"""
+    index: int
+    ref: Optional[str] = None
+    status: int  # the route's HTTP status; 424 when not run because an earlier operation failed
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    """Schema for a batch report"""
+    committed: bool
+    succeeded: int
+    failed: int
+    results: List[BatchResult]
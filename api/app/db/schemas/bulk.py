@@ -0,0 +1,21 @@
+"""
+Bulk insert schemas - per-row report returned by POST .../bulk
+"""
+from pydantic import BaseModel
+from typing import Any, List, Optional
+
+
+class BulkRowResult(BaseModel):
+    """Outcome for one submitted row"""
+    index: int
+    status: str  # created | conflict | invalid
+    id: Optional[int] = None
+    detail: Optional[Any] = None  # validation errors or conflict reason
+
+
+class BulkResponse(BaseModel):
+    """Schema for a bulk insert report"""
+    created: int
+    conflicts: int
+    invalid: int
+    results: List[BulkRowResult]
@@ -0,0 +1,24 @@
+"""
+Caseload schemas - Pydantic models for /analytics/caseload responses
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class CaseloadRow(BaseModel):
+    """Cases one person did of one procedure type in one month"""
+    role: str  # attending | fellow_or_pa
+    person: str
+    procedure_type: str
+    month: str  # YYYY-MM of the surgery date, or "unknown"
+    case_count: int
+
+    class Config:
+        from_attributes = True
+
+
+class CaseloadReport(BaseModel):
+    """Caseload rows; refreshed_at is null until the first refresh"""
+    refreshed_at: Optional[datetime] = None
+    rows: List[CaseloadRow]
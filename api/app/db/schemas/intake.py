@@ -0,0 +1,44 @@
+"""
+Case intake schemas - one payload creating a patient, encounter and research case together
+"""
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from datetime import date
+
+
+class CaseIntake(BaseModel):
+    """Schema for a case intake (the intake service's CaseCreatePayload)"""
+    # Patient - matched on MRN, name and DOB, or created
+    mrn: str
+    first_name: Optional[str] = None
+    middle_name: Optional[str] = None
+    last_name: Optional[str] = None
+    date_of_birth: date
+    sex: Literal["M", "F", "O"]
+
+    # Encounter
+    encounter_type: str = "surgery"
+    encounter_date: date
+    chief_complaint: Optional[str] = None
+    location: Optional[str] = None
+    attending_physician: Optional[str] = None
+    status: str = "active"
+    notes: Optional[str] = None
+
+    # Research case - procedure_type is a /rc slug (e.g. knee-surgical)
+    procedure_type: str
+    laterality: Optional[str] = None
+    fellow_or_pa: Optional[str] = None
+
+    # Original text, for the caller's audit trail; not stored
+    raw_note: Optional[str] = None
+
+
+class CaseIntakeResponse(BaseModel):
+    """Schema for the ids a case intake created or matched"""
+    patient_id: int
+    encounter_id: int
+    research_case_id: int
+    procedure_type: str
+    patient_created: bool
+    possible_duplicates: List[int] = []  # similar patients (e.g. another MRN) the case was not attached to
@@ -2,7 +2,7 @@
 Patient schemas - Pydantic models for API request/response validation
 """
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 
 
@@ -73,3 +73,10 @@ class PatientResponse(PatientBase):
     
     class Config:
         from_attributes = True
+
+
+class PatientMatch(BaseModel):
+    """Schema for a scored duplicate-patient candidate"""
+    patient: PatientResponse
+    score: float  # 0..1, weighted over the fields supplied
+    matched_on: List[str]  # fields that matched exactly or nearly
@@ -0,0 +1,22 @@
+"""
+Research case index schemas - Pydantic models for /rc/cases responses
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+
+
+class RcCaseIndexResponse(BaseModel):
+    """One research case of any type; fetch the full case from /rc/{procedure_type}/{case_id}"""
+    id: int
+    procedure_type: str
+    case_id: int
+    encounter_id: int
+    mrn: Optional[str] = None
+    attending: Optional[str] = None
+    fellow_or_pa: Optional[str] = None
+    laterality: Optional[str] = None
+    surgery_date: Optional[date] = None
+
+    class Config:
+        from_attributes = True
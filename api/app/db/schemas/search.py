@@ -0,0 +1,13 @@
+"""
+Search schemas - Pydantic models for search API responses
+"""
+from pydantic import BaseModel
+
+
+class TextSearchHit(BaseModel):
+    """One matching free-text field"""
+    entity_type: str  # source table, e.g. procedure, encounter, rc_other
+    entity_id: int
+    field: str
+    snippet: str  # matched terms wrapped in <mark></mark>
+    score: float  # bm25 on SQLite (lower is better), ts_rank on PostgreSQL (higher is better)
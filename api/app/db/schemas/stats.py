@@ -0,0 +1,33 @@
+"""
+Statistics schemas - Pydantic models for the /stats endpoints
+"""
+from pydantic import BaseModel
+from typing import Dict
+
+
+class PatientStats(BaseModel):
+    """Patient counts; by_sex and by_state cover active patients only"""
+    total_patients: int
+    deleted_patients: int
+    by_status: Dict[str, int]
+    by_sex: Dict[str, int]
+    by_state: Dict[str, int]
+
+
+class EncounterStats(BaseModel):
+    """Encounter counts; months are YYYY-MM of encounter_date"""
+    total_encounters: int
+    by_type: Dict[str, int]
+    by_month: Dict[str, int]
+
+
+class CaseTypeStats(BaseModel):
+    """Counts for one research case type; months are YYYY-MM of the surgery date"""
+    total: int
+    by_month: Dict[str, int]
+
+
+class CaseStats(BaseModel):
+    """Research case counts keyed by procedure type slug"""
+    total_cases: int
+    by_procedure: Dict[str, CaseTypeStats]
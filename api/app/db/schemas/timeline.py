@@ -0,0 +1,23 @@
+"""
+Timeline schemas - nested patient chart returned by /patients/{id}/timeline
+"""
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from app.db.schemas.diagnosis import DiagnosisResponse
+from app.db.schemas.encounter import EncounterResponse
+from app.db.schemas.patient import PatientResponse
+from app.db.schemas.procedure import ProcedureResponse
+
+
+class TimelineEncounter(BaseModel):
+    """One encounter and the sections requested for it (omitted sections are null)"""
+    encounter: EncounterResponse
+    diagnoses: Optional[List[DiagnosisResponse]] = None
+    procedures: Optional[List[ProcedureResponse]] = None
+    research_cases: Optional[Dict[str, Any]] = None  # procedure type slug -> case
+
+
+class PatientTimeline(BaseModel):
+    """Patient chart; encounters is null when depth is 0"""
+    patient: PatientResponse
+    encounters: Optional[List[TimelineEncounter]] = None
@@ -0,0 +1,203 @@
+"""
+Statistics rollups - per-bucket counts in stat_counter, maintained on write
+
+Like the full-text indexes, the counters are kept by the database itself
+(SQLite triggers, PostgreSQL trigger functions) rather than ORM events, so
+single creates, bulk inserts and UPDATE ... RETURNING all keep them current
+inside the writing transaction. Stats reads are then a primary-key range
+scan over a few dozen rows, however large the source tables grow.
+"""
+import logging
+from typing import NamedTuple, Optional
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "unknown"
+
+
+class Rollup(NamedTuple):
+    """
+    One counted dimension. bucket and condition are SQL templates over {row}
+    (NEW / OLD in triggers, the table itself when reconciling); a row only
+    counts while condition holds.
+    """
+    metric: str
+    table: str
+    columns: tuple[str, ...]  # source columns; updates to these move the row between buckets
+    sqlite_bucket: str
+    pg_bucket: str
+    sqlite_condition: str = "1"
+    pg_condition: str = "true"
+
+
+def _month(column: str) -> tuple[str, str]:
+    return (
+        f"coalesce(strftime('%Y-%m', {{row}}.{column}), '{UNKNOWN}')",
+        f"coalesce(to_char({{row}}.{column}, 'YYYY-MM'), '{UNKNOWN}')",
+    )
+
+
+def _value(column: str) -> str:
+    return f"coalesce({{row}}.{column}, '{UNKNOWN}')"
+
+
+_ACTIVE = ("{row}.is_deleted = 0", "NOT {row}.is_deleted")
+_STATUS = "CASE WHEN {row}.is_deleted THEN 'deleted' ELSE 'active' END"
+
+ROLLUPS: list[Rollup] = [
+    Rollup("patient.status", "patient", ("is_deleted",), _STATUS, _STATUS),
+    Rollup("patient.sex", "patient", ("sex", "is_deleted"), _value("sex"), _value("sex"), *_ACTIVE),
+    Rollup("patient.state", "patient", ("state", "is_deleted"), _value("state"), _value("state"), *_ACTIVE),
+    Rollup("encounter.type", "encounter", ("encounter_type",), _value("encounter_type"), _value("encounter_type")),
+    Rollup("encounter.month", "encounter", ("encounter_date",), *_month("encounter_date")),
+] + [
+    Rollup(f"{case_type.model.__tablename__}.month", case_type.model.__tablename__,
+           (case_type.surgery_date,), *_month(case_type.surgery_date))
+    for case_type in RESEARCH_CASE_TYPES.values()
+]
+
+
+def _rollups_by_table() -> dict[str, list[Rollup]]:
+    tables: dict[str, list[Rollup]] = {}
+    for rollup in ROLLUPS:
+        tables.setdefault(rollup.table, []).append(rollup)
+    return tables
+
+
+def _templates(rollup: Rollup, dialect: str) -> tuple[str, str]:
+    if dialect == "sqlite":
+        return rollup.sqlite_bucket, rollup.sqlite_condition
+    return rollup.pg_bucket, rollup.pg_condition
+
+
+def _changes(rollups: list[Rollup], dialect: str, old: Optional[str], new: Optional[str]) -> str:
+    """Trigger body moving a row out of its old buckets and into its new ones"""
+    statements = ""
+    for rollup in rollups:
+        bucket, condition = _templates(rollup, dialect)
+        if old:
+            statements += (
+                f"UPDATE stat_counter SET count = count - 1 WHERE metric = '{rollup.metric}' "
+                f"AND bucket = {bucket.format(row=old)} AND {condition.format(row=old)};\n"
+            )
+        if new:
+            statements += (
+                f"INSERT INTO stat_counter (metric, bucket, count) "
+                f"SELECT '{rollup.metric}', {bucket.format(row=new)}, 1 WHERE {condition.format(row=new)} "
+                f"ON CONFLICT (metric, bucket) DO UPDATE SET count = stat_counter.count + 1;\n"
+            )
+    return statements
+
+
+def _columns(rollups: list[Rollup]) -> str:
+    return ", ".join(dict.fromkeys(column for rollup in rollups for column in rollup.columns))
+
+
+def _sqlite_ddl() -> list[str]:
+    statements = []
+    for table, rollups in _rollups_by_table().items():
+        statements += [
+            f'CREATE TRIGGER IF NOT EXISTS stat_counter_{table}_ai AFTER INSERT ON "{table}" BEGIN\n'
+            f"{_changes(rollups, 'sqlite', None, 'new')}END",
+            f'CREATE TRIGGER IF NOT EXISTS stat_counter_{table}_ad AFTER DELETE ON "{table}" BEGIN\n'
+            f"{_changes(rollups, 'sqlite', 'old', None)}END",
+            f'CREATE TRIGGER IF NOT EXISTS stat_counter_{table}_au AFTER UPDATE OF {_columns(rollups)} '
+            f'ON "{table}" BEGIN\n{_changes(rollups, "sqlite", "old", "new")}END',
+        ]
+    return statements
+
+
+def _sqlite_drop() -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS stat_counter_{table}_{suffix}"
+        for table in _rollups_by_table() for suffix in ("ai", "ad", "au")
+    ]
+
+
+def _pg_ddl() -> list[str]:
+    statements = []
+    for table, rollups in _rollups_by_table().items():
+        statements += [
+            f"""
+            CREATE OR REPLACE FUNCTION stat_counter_sync_{table}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    {_changes(rollups, 'postgresql', 'OLD', None)}
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    {_changes(rollups, 'postgresql', None, 'NEW')}
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            f'DROP TRIGGER IF EXISTS stat_counter_{table} ON "{table}"',
+            f'CREATE TRIGGER stat_counter_{table} AFTER INSERT OR DELETE OR UPDATE OF {_columns(rollups)} '
+            f'ON "{table}" FOR EACH ROW EXECUTE FUNCTION stat_counter_sync_{table}()',
+        ]
+    return statements
+
+
+def _pg_drop() -> list[str]:
+    statements = []
+    for table in _rollups_by_table():
+        statements += [
+            f'DROP TRIGGER IF EXISTS stat_counter_{table} ON "{table}"',
+            f"DROP FUNCTION IF EXISTS stat_counter_sync_{table}()",
+        ]
+    return statements
+
+
+def install_stats(connection: Connection) -> None:
+    """Create the counter triggers (idempotent); counters are reconciled when the triggers are new"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        created = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'stat_counter_patient_ai'"
+        ).first() is None
+        statements = _sqlite_ddl()
+    elif dialect == "postgresql":
+        created = connection.exec_driver_sql("SELECT to_regproc('stat_counter_sync_patient')").scalar() is None
+        statements = _pg_ddl()
+    else:
+        logger.warning("No stats counters for %s", dialect)
+        return
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    if created:
+        reconcile(connection)
+
+
+def drop_stats(connection: Connection) -> None:
+    """Remove the counter triggers (the stat_counter table itself is left to the caller)"""
+    statements = {"sqlite": _sqlite_drop, "postgresql": _pg_drop}.get(connection.dialect.name, list)()
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def reconcile(connection: Connection) -> int:
+    """Recount every rollup from the source tables; returns buckets written"""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        # Hold off writers so no trigger update lands between the delete and the recount
+        tables = ", ".join(f'"{table}"' for table in _rollups_by_table())
+        connection.exec_driver_sql(f"LOCK TABLE {tables} IN SHARE MODE")
+    connection.exec_driver_sql("DELETE FROM stat_counter")
+    for rollup in ROLLUPS:
+        bucket, condition = _templates(rollup, dialect)
+        row = f'"{rollup.table}"'
+        connection.exec_driver_sql(
+            f"INSERT INTO stat_counter (metric, bucket, count) "
+            f"SELECT '{rollup.metric}', {bucket.format(row=row)}, count(*) FROM {row} "
+            f"WHERE {condition.format(row=row)} GROUP BY 2"
+        )
+    return connection.exec_driver_sql("SELECT count(*) FROM stat_counter").scalar_one()
+
+
+def install(engine: Engine) -> None:
+    """Create the counter triggers the stats endpoints read from"""
+    with engine.begin() as connection:
+        install_stats(connection)
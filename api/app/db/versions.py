@@ -0,0 +1,101 @@
+"""
+Table change counters - table_version rows bumped on every write
+
+List routes derive their ETags from these counters, so revalidating a list
+is one primary-key read of table_version instead of re-running the query.
+As with the stats counters the bump is done by the database itself (SQLite
+row triggers, PostgreSQL statement triggers), so single creates, bulk
+inserts and UPDATE ... RETURNING all move the version inside the writing
+transaction. changed_at (UTC) backs the lists' Last-Modified header.
+"""
+import logging
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+logger = logging.getLogger(__name__)
+
+VERSIONED_TABLES: tuple[str, ...] = ("patient", "encounter", "diagnosis", "procedure") + tuple(
+    case_type.model.__tablename__ for case_type in RESEARCH_CASE_TYPES.values()
+)
+
+
+def _bump(table: str, now: str) -> str:
+    """Upsert incrementing table's row; table and now are SQL expressions"""
+    return (
+        f"INSERT INTO table_version (table_name, version, changed_at) VALUES ({table}, 1, {now}) "
+        f"ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, changed_at = {now};\n"
+    )
+
+
+def _sqlite_ddl() -> list[str]:
+    statements = []
+    for table in VERSIONED_TABLES:
+        bump = _bump(f"'{table}'", "CURRENT_TIMESTAMP")
+        for suffix, operation in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+            statements.append(
+                f'CREATE TRIGGER IF NOT EXISTS table_version_{table}_{suffix} AFTER {operation} ON "{table}" BEGIN\n'
+                f"{bump}END"
+            )
+    return statements
+
+
+def _sqlite_drop() -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS table_version_{table}_{suffix}"
+        for table in VERSIONED_TABLES for suffix in ("ai", "au", "ad")
+    ]
+
+
+def _pg_ddl() -> list[str]:
+    statements = [
+        f"""
+        CREATE OR REPLACE FUNCTION table_version_bump() RETURNS trigger AS $$
+        BEGIN
+            {_bump("TG_TABLE_NAME", "timezone('utc', now())")}
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+    ]
+    for table in VERSIONED_TABLES:
+        # One bump per statement, however many rows it touched
+        statements += [
+            f'DROP TRIGGER IF EXISTS table_version_{table} ON "{table}"',
+            f'CREATE TRIGGER table_version_{table} AFTER INSERT OR UPDATE OR DELETE '
+            f'ON "{table}" FOR EACH STATEMENT EXECUTE FUNCTION table_version_bump()',
+        ]
+    return statements
+
+
+def _pg_drop() -> list[str]:
+    return [
+        f'DROP TRIGGER IF EXISTS table_version_{table} ON "{table}"' for table in VERSIONED_TABLES
+    ] + ["DROP FUNCTION IF EXISTS table_version_bump()"]
+
+
+def install_versions(connection: Connection) -> None:
+    """Create the version triggers (idempotent)"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = _sqlite_ddl()
+    elif dialect == "postgresql":
+        statements = _pg_ddl()
+    else:
+        logger.warning("No table version triggers for %s", dialect)
+        return
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def drop_versions(connection: Connection) -> None:
+    """Remove the version triggers (the table_version table itself is left to the caller)"""
+    statements = {"sqlite": _sqlite_drop, "postgresql": _pg_drop}.get(connection.dialect.name, list)()
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def install(engine: Engine) -> None:
+    """Create the triggers that keep table_version current"""
+    with engine.begin() as connection:
+        install_versions(connection)
@@ -0,0 +1,130 @@
+"""
+Group-commit write coordinator - batches write units of work into shared transactions
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitMixin:
+    """
+    Session mixin for write units run by the coordinator.
+    A unit's own commit() only flushes its changes into the shared
+    transaction; the coordinator commits the whole batch with commit_batch().
+    """
+
+    def commit(self) -> None:
+        self.flush()
+
+    def commit_batch(self) -> None:
+        super().commit()
+
+
+class WriteCoordinator:
+    """
+    Queues write units of work (fn(session, *args, **kwargs)) from many
+    requests and commits them together - one transaction, one fsync - every
+    `window_ms` milliseconds or every `max_batch` units, whichever comes first.
+
+    Each unit runs inside its own SAVEPOINT, so a failing unit (e.g. a unique
+    MRN violation) is rolled back and reported to its caller alone while the
+    rest of the batch still commits.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], window_ms: float = 5.0, max_batch: int = 64):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.units = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue a write unit; the future resolves once its batch has committed"""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def stop(self) -> None:
+        """Flush pending units and stop the background thread"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-coordinator", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: list[tuple]) -> None:
+        outcomes = []
+        try:
+            with self.session_factory() as session:
+                for fn, args, kwargs, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with session.begin_nested():
+                            result = fn(session, *args, **kwargs)
+                        outcomes.append((future, result, None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                session.commit_batch()
+        except Exception as e:
+            logger.exception("Write batch of %d units failed to commit", len(batch))
+            unit_errors = {id(future): error for future, _, error in outcomes if error is not None}
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(unit_errors.get(id(future), e))
+            return
+
+        self.batches += 1
+        self.units += len(outcomes)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Batch counters for monitoring"""
+        return {
+            "batches": self.batches,
+            "units": self.units,
+            "avg_batch_size": self.units / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
@@ -0,0 +1,181 @@
+"""
+Idempotency keys - a retried POST replays its first response
+
+A POST carrying an Idempotency-Key header claims that key (scoped to the
+path, query and Authorization) in the "idempotency" cache before the route
+runs. When it finishes, its status, headers and body replace the claim and
+are kept for IDEMPOTENCY_TTL; a retry with the same key and body gets them
+back (with Idempotent-Replayed: true) without the route or the database
+being touched. A retry while the first request is still running gets 409,
+the same key with a different body 422. 5xx responses and errors release
+the key so the retry runs for real.
+
+The store is bounded by IDEMPOTENCY_MAX_KEYS and IDEMPOTENCY_MAX_BYTES (LRU)
+on CACHE_BACKEND; with "memory" a key only protects retries that reach the
+same worker, the sqlite backend shares keys between workers on a host.
+"""
+import hashlib
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.db import cache
+
+store = cache.create_cache(
+    "idempotency", settings.idempotency_max_keys, settings.idempotency_ttl, settings.idempotency_max_bytes
+)
+
+MAX_KEY_LENGTH = 255
+PENDING_TTL = 300.0  # seconds a claim outlives a worker that died mid-request
+
+
+def _store_key(scope: Scope, headers: Headers, key: str) -> str:
+    """Fixed-size store key, so long keys and paths cost the same and one client can't replay another's"""
+    scoped = "\0".join((
+        scope["path"], scope.get("query_string", b"").decode("latin-1"), headers.get("authorization", ""), key
+    ))
+    return hashlib.blake2b(scoped.encode(), digest_size=16).hexdigest()
+
+
+def _claim(store_key: str, fingerprint: bytes) -> tuple[bool, Optional[tuple]]:
+    """
+    (True, None) once this request holds store_key, else (False, the entry
+    holding it). The entry can go between a failed add and the get (expired,
+    evicted, or released by a failed first request), so the add is tried
+    again; (False, None) if the key is lost to another request twice.
+    """
+    for _ in range(2):
+        if store.add(store_key, (fingerprint,), PENDING_TTL):
+            return True, None
+        entry = store.get(store_key)
+        if entry is not None:
+            return False, entry
+    return False, None
+
+
+async def _read_body(receive: Receive) -> Optional[bytes]:
+    """The whole request body, or None if the client disconnected first"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+class IdempotencyMiddleware:
+    """Replay the stored response for a POST whose Idempotency-Key was seen before"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not settings.idempotency_max_keys:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            detail = f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            await JSONResponse({"detail": detail}, status_code=400)(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        if body is None:
+            return
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        store_key = _store_key(scope, headers, key)
+        claimed, entry = _claim(store_key, fingerprint)
+        if not claimed:
+            # Without an entry to answer from, say the key is busy rather than run unclaimed
+            await self._answer_retry(entry or (fingerprint,), fingerprint, scope, receive, send)
+            return
+
+        sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        recorder = _Recorder(send, settings.idempotency_max_bytes)
+        try:
+            await self.app(scope, replay_receive, recorder)
+        except BaseException:
+            store.delete(store_key)
+            raise
+        result = recorder.result(fingerprint)
+        if result is None:
+            store.delete(store_key)
+        else:
+            store.set(store_key, result, size=len(result[3]) + sum(len(k) + len(v) for k, v in result[2]))
+
+    async def _answer_retry(
+        self, entry: tuple, fingerprint: bytes, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if entry[0] != fingerprint:
+            detail = "Idempotency-Key was already used with a different request body"
+            await JSONResponse({"detail": detail}, status_code=422)(scope, receive, send)
+            return
+        if len(entry) == 1:
+            detail = "A request with this Idempotency-Key is still in progress"
+            await JSONResponse({"detail": detail}, status_code=409, headers={"Retry-After": "1"})(
+                scope, receive, send
+            )
+            return
+        _, status, raw_headers, body, compressed = entry
+        if compressed:
+            body = zlib.decompress(body)
+        headers = [
+            *raw_headers,
+            (b"content-length", str(len(body)).encode()),
+            (b"idempotent-replayed", b"true"),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+
+class _Recorder:
+    """send() wrapper passing the response through while keeping a copy of it, up to limit bytes"""
+
+    def __init__(self, send: Send, limit: int):
+        self.send = send
+        self.limit = limit
+        self.status: Optional[int] = None
+        self.headers: list[tuple[bytes, bytes]] = []
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self.complete = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            # content-length is rebuilt on replay
+            self.headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"content-length"]
+        elif message["type"] == "http.response.body" and self.size <= self.limit:
+            body = message.get("body", b"")
+            self.size += len(body)
+            self.chunks.append(body)
+            self.complete = not message.get("more_body", False)
+        await self.send(message)
+
+    def result(self, fingerprint: bytes) -> Optional[tuple]:
+        """Stored form of the response, or None when it must not be replayed (5xx, unfinished, too big)"""
+        if not self.complete or self.size > self.limit or self.status is None or self.status >= 500:
+            return None
+        body = b"".join(self.chunks)
+        compressed = len(body) >= settings.compression_minimum_size
+        if compressed:
+            body = zlib.compress(body, 1)
+        return fingerprint, self.status, self.headers, body, compressed
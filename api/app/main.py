@@ -3,10 +3,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
+from .compression import CompressionMiddleware
 from .config import settings
-from .db.core import create_db_and_tables
+from .idempotency import IdempotencyMiddleware
+from .db import caseload
+from .db.core import create_db_and_tables, dispose_engines
 from .routes import router
 
 # Setup basic logging
@@ -24,9 +28,15 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name}...")
     create_db_and_tables()
     logger.info("Database tables created/verified")
+    refresher = None
+    if settings.caseload_refresh_seconds > 0:
+        refresher = asyncio.create_task(caseload.refresh_periodically(settings.caseload_refresh_seconds))
     yield
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}...")
+    if refresher is not None:
+        refresher.cancel()
+    await dispose_engines()
 
 
 # Create FastAPI app
@@ -37,6 +47,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Replay retried POSTs (added first, so it is innermost and stores uncompressed responses)
+app.add_middleware(IdempotencyMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -44,8 +57,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link", "X-Next-Cursor", "Idempotent-Replayed"],
 )
 
+# Compress large responses (added last, so it wraps CORS and sees the final headers)
+app.add_middleware(CompressionMiddleware)
+
 # Include main router with /api/v1 prefix
 app.include_router(router, prefix="/api/v1")
 
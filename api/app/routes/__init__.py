@@ -14,6 +14,13 @@ from .rc_hipscope import router as rc_hipscope_router
 from .rc_hiparthroplasty import router as rc_hiparthroplasty_router
 from .rc_kneearthroplasty import router as rc_kneearthroplasty_router
 from .rc_other import router as rc_other_router
+from .research_cases import router as research_cases_router
+from .search import router as search_router
+from .metrics import router as metrics_router
+from .analytics import router as analytics_router
+from .export import router as export_router
+from .intake import router as intake_router
+from .batch import router as batch_router
 
 # Create main router
 router = APIRouter()
@@ -29,6 +36,13 @@ router.include_router(patients_router, prefix="/patients", tags=["Patients"])
 router.include_router(encounters_router, prefix="/encounters", tags=["Encounters"])
 router.include_router(diagnoses_router, prefix="/diagnoses", tags=["Diagnoses"])
 router.include_router(procedures_router, prefix="/procedures", tags=["Procedures"])
+router.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
+router.include_router(search_router, prefix="/search", tags=["Search"])
+router.include_router(analytics_router, prefix="/analytics", tags=["Analytics"])
+router.include_router(export_router, prefix="/export", tags=["Export"])
+router.include_router(intake_router, prefix="/intake", tags=["Intake"])
+router.include_router(batch_router, prefix="/batch", tags=["Batch"])
+router.include_router(research_cases_router, prefix="/rc", tags=["Research Cases"])
 router.include_router(rc_rotatorcuff_router, prefix="/rc/rotator-cuff", tags=["Research Cases - Rotator Cuff"])
 router.include_router(rc_kneescope_router, prefix="/rc/knee-surgical", tags=["Research Cases - Knee Surgical"])
 router.include_router(rc_shoulderscope_router, prefix="/rc/shoulder-scope", tags=["Research Cases - Shoulder Scope"])
@@ -0,0 +1,43 @@
+"""
+Analytics routes - program-level reports served from precomputed rollups
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from app.db import caseload
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.db.crud import caseload as crud
+from app.db.research_cases import RESEARCH_CASE_TYPES
+from app.db.schemas.caseload import CaseloadReport
+
+router = APIRouter(route_class=SerializedRoute)
+
+MonthQuery = Query(None, pattern=r"^\d{4}-\d{2}$", description="YYYY-MM")
+
+
+@router.get("/caseload", response_model=CaseloadReport)
+async def get_caseload(
+    role: Optional[str] = Query(None, description="attending or fellow_or_pa"),
+    person: Optional[str] = Query(None),
+    procedure_type: Optional[List[str]] = Query(None, description="Research case type slug; repeat for several"),
+    month_from: Optional[str] = MonthQuery,
+    month_to: Optional[str] = MonthQuery,
+    refresh: bool = Query(False, description="Apply pending rc_* changes before reading"),
+    db: Database = Depends(get_database)
+):
+    """Monthly case counts per attending and fellow/PA by procedure type"""
+    if role is not None and role not in caseload.ROLES:
+        raise HTTPException(status_code=400, detail=f"Unknown role: {role}")
+    unknown = sorted(set(procedure_type or ()) - set(RESEARCH_CASE_TYPES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown research case types: {', '.join(unknown)}")
+    if refresh:
+        await db.run(caseload.refresh_caseload)
+    return await db.run(
+        crud.get_caseload,
+        role=role,
+        person=person,
+        procedure_types=procedure_type,
+        month_from=month_from,
+        month_to=month_to
+    )
@@ -0,0 +1,217 @@
+"""
+Batch route - many API operations in one request and one transaction
+
+Each operation is dispatched through the app's own router as an in-process
+sub-request, so it gets exactly the validation, checks and response of the
+route it names. All operations share the batch's database session: the
+routes' own commits only flush, and the batch commits once at the end. By
+default each operation runs in a SAVEPOINT that is rolled back if it fails
+while the others still commit; with atomic, the first failure rolls back
+everything and the remaining operations are skipped (424). Operations whose
+route answers with anything but JSON (exports, streams) are reported as 406.
+"""
+import functools
+import json
+import logging
+import re
+from typing import Any, Callable, Optional
+import anyio
+from fastapi import APIRouter, Depends, Request
+from sqlmodel import Session
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from app.db.core import Database, get_database
+from app.db.schemas.batch import BatchRequest, BatchResponse
+from app.routes.serialization import SerializedRoute
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=SerializedRoute)
+
+_REFERENCE = re.compile(r"\$\{([^}]+)\}")
+
+
+class _Unresolved(Exception):
+    """An operation's reference that cannot be filled in"""
+
+    def __init__(self, status: int, detail: str):
+        self.status = status
+        self.detail = detail
+
+
+def _lookup(results: list[dict], refs: dict[str, int], expression: str) -> Any:
+    """Value of ${expression} - ref or index, then a dotted path into that operation's response body"""
+    name, *fields = expression.split(".")
+    index = refs.get(name, int(name) if name.isdigit() else None)
+    if index is None or index >= len(results):
+        raise _Unresolved(400, f"Unknown reference: ${{{expression}}}")
+    if results[index]["status"] >= 400:
+        raise _Unresolved(424, f"Not run: operation {index} failed")
+    value = results[index]["body"]
+    for field in fields:
+        try:
+            value = value[int(field)] if isinstance(value, list) else value[field]
+        except (IndexError, KeyError, TypeError, ValueError):
+            raise _Unresolved(400, f"Unknown reference: ${{{expression}}}")
+    return value
+
+
+def _substitute(value: Any, resolve: Callable[[str], Any]) -> Any:
+    """value with every ${...} resolved; a string that is one reference becomes the referenced value itself"""
+    if isinstance(value, str):
+        whole = _REFERENCE.fullmatch(value)
+        if whole is not None:
+            return resolve(whole.group(1))
+        return _REFERENCE.sub(lambda match: str(resolve(match.group(1))), value)
+    if isinstance(value, list):
+        return [_substitute(item, resolve) for item in value]
+    if isinstance(value, dict):
+        return {key: _substitute(item, resolve) for key, item in value.items()}
+    return value
+
+
+def _defer_commits(session: Session) -> None:
+    # As under group commit: the routes' CRUD commits only flush into the batch's transaction
+    session.commit = session.flush
+
+
+def _finish(session: Session, commit: bool) -> None:
+    del session.commit
+    if commit:
+        session.commit()
+    else:
+        session.rollback()
+
+
+def _savepoint(session: Session) -> Any:
+    return session.begin_nested()
+
+
+def _end_savepoint(session: Session, savepoint: Any, keep: bool) -> None:
+    if keep:
+        savepoint.commit()
+    else:
+        savepoint.rollback()
+
+
+async def _dispatch(request: Request, db: Database, method: str, path: str, body: Any) -> tuple[int, Any]:
+    """Run one operation through the app's router on the batch's database handle; (status, decoded body)"""
+    path, _, query = path.partition("?")
+    # Operation paths are relative to the prefix this route is mounted under
+    full_path = request.scope["route"].path.removesuffix("/batch") + path
+    content = b"" if body is None else json.dumps(body).encode()
+    scope = {
+        **request.scope,
+        "method": method,
+        "path": full_path,
+        "raw_path": full_path.encode(),
+        "query_string": query.encode(),
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"accept", b"application/json"),
+            (b"content-length", str(len(content)).encode()),
+        ],
+        "state": {},
+        "batch_database": db,
+    }
+    for key in ("route", "endpoint", "path_params"):
+        scope.pop(key, None)
+
+    received = False
+
+    async def receive() -> dict:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": content, "more_body": False}
+        # The body is all there is; streaming responses wait here for a disconnect that never comes
+        await anyio.sleep_forever()
+
+    status, content_type, chunks = 500, "", []
+
+    async def send(message: dict) -> None:
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = Headers(raw=message.get("headers", [])).get("content-type", "")
+        elif message["type"] == "http.response.body" and content_type.startswith("application/json"):
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app.router(scope, receive, send)
+    except HTTPException as e:
+        # Raised by the router itself: no such path (404) or method (405)
+        return e.status_code, {"detail": e.detail}
+    except Exception:
+        logger.exception("Batch operation %s %s failed", method, path)
+        return 500, {"detail": "Internal Server Error"}
+    if status < 400 and status != 204 and not content_type.startswith("application/json"):
+        detail = f"Operation responded with {content_type or 'no content type'}; batches carry JSON only"
+        return 406, {"detail": detail}
+    payload = b"".join(chunks)
+    try:
+        return status, json.loads(payload) if payload else None
+    except ValueError:
+        return status, payload.decode(errors="replace")
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    db: Database = Depends(get_database)
+):
+    """
+    Run operations in order in one session and report each one's status and
+    body. Later operations can use earlier results via ${ref.field}.
+    """
+    shared = Database(db.session, coordinated=False)
+    refs: dict[str, int] = {}
+    results: list[dict] = []
+    failed_at: Optional[int] = None
+    committed = False
+    await db.run(_defer_commits)
+    try:
+        for index, operation in enumerate(batch.operations):
+            if batch.atomic and failed_at is not None:
+                status, body = 424, {"detail": f"Not run: operation {failed_at} failed"}
+            else:
+                status, body = await _run_operation(request, db, shared, operation, results, refs, batch.atomic)
+            results.append({"index": index, "ref": operation.ref, "status": status, "body": body})
+            if operation.ref is not None:
+                refs[operation.ref] = index
+            if status >= 400 and failed_at is None:
+                failed_at = index
+        committed = not (batch.atomic and failed_at is not None)
+    finally:
+        await db.run(_finish, committed)
+
+    failed = sum(result["status"] >= 400 for result in results)
+    return {"committed": committed, "succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+async def _run_operation(
+    request: Request,
+    db: Database,
+    shared: Database,
+    operation: Any,
+    results: list[dict],
+    refs: dict[str, int],
+    atomic: bool
+) -> tuple[int, Any]:
+    """Resolve an operation's references and dispatch it, inside a savepoint unless the batch is atomic"""
+    resolve = functools.partial(_lookup, results, refs)
+    try:
+        path = _substitute(operation.path, resolve)
+        body = _substitute(operation.body, resolve)
+    except _Unresolved as e:
+        return e.status, {"detail": e.detail}
+    if not path.startswith("/") or path.partition("?")[0].rstrip("/") == "/batch":
+        return 400, {"detail": f"Invalid operation path: {path}"}
+
+    if atomic:
+        return await _dispatch(request, shared, operation.method, path, body)
+    savepoint = await db.run(_savepoint)
+    status, body = await _dispatch(request, shared, operation.method, path, body)
+    await db.run(_end_savepoint, savepoint, status < 400)
+    return status, body
@@ -0,0 +1,51 @@
+"""
+Bulk insert helpers - validate a batch of raw rows and build the per-row report
+"""
+from fastapi import Body
+from pydantic import BaseModel, ValidationError
+from typing import Any, Callable, Dict, List, Type
+from app.config import settings
+from app.db.core import Database
+
+BulkRows = Body(
+    ...,
+    max_length=settings.bulk_max_rows,
+    description="JSON array of create payloads; each row is validated and reported on its own"
+)
+
+
+async def bulk_insert(
+    db: Database,
+    schema: Type[BaseModel],
+    rows: List[Dict[str, Any]],
+    crud_fn: Callable[..., list[dict]]
+) -> dict:
+    """
+    Validate every row against the create schema, hand the valid ones to
+    crud_fn in one call and merge both outcomes into a report in input order.
+    Bulk loads commit chunk by chunk themselves, so they bypass the group-commit
+    coordinator and run as a single unit of work.
+    """
+    results: list[dict] = [None] * len(rows)
+    valid_rows = []
+    positions = []
+    for index, row in enumerate(rows):
+        try:
+            valid_rows.append(schema.model_validate(row).model_dump())
+            positions.append(index)
+        except ValidationError as e:
+            errors = [{"loc": list(error["loc"]), "msg": error["msg"]} for error in e.errors()]
+            results[index] = {"index": index, "status": "invalid", "id": None, "detail": errors}
+
+    if valid_rows:
+        outcomes = await db.run(crud_fn, valid_rows, chunk_size=settings.bulk_chunk_size)
+        for index, outcome in zip(positions, outcomes):
+            results[index] = {"index": index, **outcome}
+
+    statuses = [result["status"] for result in results]
+    return {
+        "created": statuses.count("created"),
+        "conflicts": statuses.count("conflict"),
+        "invalid": statuses.count("invalid"),
+        "results": results,
+    }
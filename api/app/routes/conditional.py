@@ -0,0 +1,90 @@
+"""
+Conditional GETs - ETag / Last-Modified validators and 304 Not Modified
+
+Detail routes are validated by their row's (id, updated_at) and list routes
+by their table's change counter (app.db.versions), each read with one small
+query before the endpoint runs. While the client's If-None-Match (or,
+without one, If-Modified-Since) still holds, the request ends there with a
+bodiless 304 and no rows are loaded; otherwise the validators go out with
+the 200 response. A detail route's dependency also returns the changed_at
+its ETag was built from (None when the row is missing), so an endpoint
+serving from a cache can check its copy is that same version.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Depends, HTTPException, Request, Response
+from typing import Any, Callable, Optional
+from app.db.core import Database, get_database
+from app.db.crud import versions as crud
+
+
+def _etag(*parts: Any) -> str:
+    """Strong validator over everything that shapes the representation"""
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins; If-Modified-Since only counts without it"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _validate(request: Request, response: Response, etag: str, changed_at: Optional[datetime], **extra: str) -> None:
+    """Raise 304 when the client's copy is current, else attach the validators to the response"""
+    headers = {"ETag": etag, **extra}
+    last_modified = changed_at.replace(tzinfo=timezone.utc) if changed_at is not None else None
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if _not_modified(request, etag, last_modified):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional_row(table_name: str, param: str, column: str = "id") -> Callable[..., Any]:
+    """
+    Dependency validating a detail route by the (id, updated_at) of the row
+    whose column equals path param; returns that row's changed_at
+    """
+
+    async def check_row(
+        request: Request, response: Response, db: Database = Depends(get_database)
+    ) -> Optional[datetime]:
+        try:
+            key = int(request.path_params[param])
+        except ValueError:
+            return None  # the endpoint's own validation answers
+        stamp = await db.run(crud.get_row_stamp, table_name, key, column)
+        if stamp is None:
+            return None  # the endpoint answers 404
+        changed_at = stamp.updated_at or stamp.created_at
+        _validate(request, response, _etag(table_name, stamp.id, changed_at, request.url.query), changed_at)
+        return changed_at
+
+    return check_row
+
+
+def conditional_table(table_name: str) -> Callable[..., Any]:
+    """Dependency validating a list route by its table's change counter"""
+
+    async def check_table(request: Request, response: Response, db: Database = Depends(get_database)) -> None:
+        version = await db.run(crud.get_table_version, table_name)
+        number, changed_at = version if version is not None else (0, None)
+        # JSON, NDJSON and CSV lists share a URL, so the Accept header is part of the representation
+        etag = _etag(table_name, number, request.url.query, request.headers.get("accept", ""))
+        _validate(request, response, etag, changed_at, Vary="Accept")
+
+    return check_table
@@ -1,65 +1,99 @@
 """
 Diagnosis routes - API endpoints for diagnosis management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
-from typing import List
-from app.db.core import get_session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.routes.conditional import conditional_row, conditional_table
+from app.routes.response_cache import cached
+from app.routes.fieldsets import fieldset, sparse
+from app.routes.pagination import CursorQuery, decode_cursor, set_next_page
+from app.routes.streaming import STREAM_RESPONSES, stream_format, stream_list
 from app.db.crud import diagnosis as crud
 from app.db.schemas.diagnosis import DiagnosisCreate, DiagnosisUpdate, DiagnosisResponse
 
-router = APIRouter(tags=["Diagnoses"])
+router = APIRouter(tags=["Diagnoses"], route_class=SerializedRoute)
 
 
 @router.post("/", response_model=DiagnosisResponse, status_code=201)
-def create_diagnosis(
+async def create_diagnosis(
     diagnosis: DiagnosisCreate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Add a new diagnosis to an encounter"""
-    return crud.create_diagnosis(session, diagnosis.dict())
+    return await db.write(crud.create_diagnosis, diagnosis.dict())
 
 
-@router.get("/", response_model=List[DiagnosisResponse])
-def list_diagnoses(
+@router.get(
+    "/", response_model=List[DiagnosisResponse], responses=STREAM_RESPONSES,
+    dependencies=[Depends(cached("diagnosis")), Depends(conditional_table("diagnosis"))]
+)
+async def list_diagnoses(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[List[str]] = Depends(fieldset(DiagnosisResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get list of diagnoses with pagination"""
-    return crud.get_diagnoses(session, skip=skip, limit=limit)
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(
+            request, media_type, DiagnosisResponse, crud.get_diagnoses,
+            skip=skip, limit=limit, after_id=decode_cursor(cursor),
+            fields=fields
+        )
+    diagnoses = await db.run(
+        crud.get_diagnoses,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor),
+        fields=fields
+    )
+    set_next_page(request, response, diagnoses, limit)
+    return sparse(diagnoses, fields)
 
 
 @router.get("/encounter/{encounter_id}", response_model=List[DiagnosisResponse])
-def get_encounter_diagnoses(
+async def get_encounter_diagnoses(
     encounter_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Get all diagnoses for a specific encounter"""
-    return crud.get_encounter_diagnoses(session, encounter_id)
+    return await db.run(crud.get_encounter_diagnoses, encounter_id)
 
 
-@router.get("/{diagnosis_id}", response_model=DiagnosisResponse)
-def get_diagnosis(
+@router.get(
+    "/{diagnosis_id}", response_model=DiagnosisResponse,
+    dependencies=[
+        Depends(cached("diagnosis")),
+        Depends(conditional_row("diagnosis", "diagnosis_id"))
+    ]
+)
+async def get_diagnosis(
     diagnosis_id: int,
-    session: Session = Depends(get_session)
+    fields: Optional[List[str]] = Depends(fieldset(DiagnosisResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get diagnosis by ID"""
-    diagnosis = crud.get_diagnosis(session, diagnosis_id)
+    diagnosis = await db.run(crud.get_diagnosis, diagnosis_id, fields=fields)
     if not diagnosis:
         raise HTTPException(status_code=404, detail="Diagnosis not found")
-    return diagnosis
+    return sparse(diagnosis, fields)
 
 
 @router.patch("/{diagnosis_id}", response_model=DiagnosisResponse)
-def update_diagnosis(
+async def update_diagnosis(
     diagnosis_id: int,
     diagnosis_update: DiagnosisUpdate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Update diagnosis information"""
-    diagnosis = crud.update_diagnosis(
-        session,
+    diagnosis = await db.write(
+        crud.update_diagnosis,
         diagnosis_id,
         diagnosis_update.dict(exclude_unset=True)
     )
@@ -69,11 +103,11 @@ def update_diagnosis(
 
 
 @router.delete("/{diagnosis_id}", status_code=204)
-def delete_diagnosis(
+async def delete_diagnosis(
     diagnosis_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Delete a diagnosis"""
-    success = crud.delete_diagnosis(session, diagnosis_id)
+    success = await db.write(crud.delete_diagnosis, diagnosis_id)
     if not success:
         raise HTTPException(status_code=404, detail="Diagnosis not found")
@@ -1,67 +1,142 @@
 """
 Encounter routes - API endpoints for encounter management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
-from typing import List
-from app.db.core import get_session
-from app.db.crud import encounter as crud
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Any, Dict, List, Optional
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.routes.bulk import BulkRows, bulk_insert
+from app.routes.conditional import conditional_row, conditional_table
+from app.routes.response_cache import cached
+from app.routes.fieldsets import fieldset, sparse
+from app.routes.pagination import CursorQuery, decode_cursor, set_next_page
+from app.routes.streaming import STREAM_RESPONSES, stream_format, stream_list
+from app.db.crud import encounter as crud, stats as stats_crud
+from app.db.schemas.bulk import BulkResponse
 from app.db.schemas.encounter import EncounterCreate, EncounterUpdate, EncounterResponse
+from app.db.schemas.stats import EncounterStats
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 
 
 @router.post("/", response_model=EncounterResponse, status_code=201)
-def create_encounter(
+async def create_encounter(
     encounter: EncounterCreate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Create a new encounter"""
-    return crud.create_encounter(session, encounter.dict())
+    return await db.write(crud.create_encounter, encounter.dict())
 
 
-@router.get("/", response_model=List[EncounterResponse])
-def list_encounters(
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_encounters(
+    rows: List[Dict[str, Any]] = BulkRows,
+    db: Database = Depends(get_database)
+):
+    """Create many encounters at once; rows for unknown patients are reported per row"""
+    return await bulk_insert(db, EncounterCreate, rows, crud.bulk_create_encounters)
+
+
+@router.get(
+    "/", response_model=List[EncounterResponse], responses=STREAM_RESPONSES,
+    dependencies=[Depends(cached("encounter")), Depends(conditional_table("encounter"))]
+)
+async def list_encounters(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[List[str]] = Depends(fieldset(EncounterResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get list of encounters with pagination"""
-    return crud.get_encounters(session, skip=skip, limit=limit)
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(
+            request, media_type, EncounterResponse, crud.get_encounters,
+            skip=skip, limit=limit, after_id=decode_cursor(cursor),
+            fields=fields
+        )
+    encounters = await db.run(
+        crud.get_encounters,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor),
+        fields=fields
+    )
+    set_next_page(request, response, encounters, limit)
+    return sparse(encounters, fields)
 
 
-@router.get("/patient/{patient_id}", response_model=List[EncounterResponse])
-def get_patient_encounters(
+@router.get("/stats", response_model=EncounterStats)
+async def get_encounter_stats(db: Database = Depends(get_database)):
+    """Encounter counts by type and month"""
+    return await db.run(stats_crud.get_encounter_stats)
+
+
+@router.get(
+    "/patient/{patient_id}", response_model=List[EncounterResponse], responses=STREAM_RESPONSES,
+    dependencies=[Depends(cached("encounter")), Depends(conditional_table("encounter"))]
+)
+async def get_patient_encounters(
     patient_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[List[str]] = Depends(fieldset(EncounterResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get all encounters for a specific patient"""
-    return crud.get_patient_encounters(session, patient_id, skip=skip, limit=limit)
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(
+            request, media_type, EncounterResponse, crud.get_patient_encounters, patient_id,
+            skip=skip, limit=limit, after_id=decode_cursor(cursor),
+            fields=fields
+        )
+    encounters = await db.run(
+        crud.get_patient_encounters,
+        patient_id,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor),
+        fields=fields
+    )
+    set_next_page(request, response, encounters, limit)
+    return sparse(encounters, fields)
 
 
-@router.get("/{encounter_id}", response_model=EncounterResponse)
-def get_encounter(
+@router.get(
+    "/{encounter_id}", response_model=EncounterResponse,
+    dependencies=[
+        Depends(cached("encounter")),
+        Depends(conditional_row("encounter", "encounter_id"))
+    ]
+)
+async def get_encounter(
     encounter_id: int,
-    session: Session = Depends(get_session)
+    fields: Optional[List[str]] = Depends(fieldset(EncounterResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get encounter by ID"""
-    encounter = crud.get_encounter(session, encounter_id)
+    encounter = await db.run(crud.get_encounter, encounter_id, fields=fields)
     if not encounter:
         raise HTTPException(status_code=404, detail="Encounter not found")
-    return encounter
+    return sparse(encounter, fields)
 
 
 @router.patch("/{encounter_id}", response_model=EncounterResponse)
-def update_encounter(
+async def update_encounter(
     encounter_id: int,
     encounter_update: EncounterUpdate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Update encounter information"""
-    encounter = crud.update_encounter(
-        session,
+    encounter = await db.write(
+        crud.update_encounter,
         encounter_id,
         encounter_update.dict(exclude_unset=True)
     )
@@ -71,11 +146,11 @@ def update_encounter(
 
 
 @router.delete("/{encounter_id}", status_code=204)
-def delete_encounter(
+async def delete_encounter(
     encounter_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Delete an encounter"""
-    success = crud.delete_encounter(session, encounter_id)
+    success = await db.write(crud.delete_encounter, encounter_id)
     if not success:
         raise HTTPException(status_code=404, detail="Encounter not found")
@@ -0,0 +1,35 @@
+"""
+Export routes - columnar downloads of the EMR and research case tables
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.db import export
+
+router = APIRouter()
+
+
+@router.get("/tables")
+async def list_export_tables():
+    """Tables that can be exported"""
+    return {"tables": sorted(export.EXPORT_TABLES), "formats": sorted(export.EXPORT_FORMATS)}
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str,
+    fmt: str = Query("parquet", alias="format", pattern="^(parquet|arrow)$"),
+    chunk_rows: int = Query(None, ge=100, le=100000, description="Rows per row group / record batch")
+):
+    """Stream a whole table as Parquet or an Arrow IPC stream"""
+    if table not in export.EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export table: {table}")
+    try:
+        export.require_pyarrow()
+    except export.ExportUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    media_type, extension = export.EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        export.stream_export(table, fmt, chunk_rows),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table}.{extension}"'}
+    )
@@ -0,0 +1,36 @@
+"""
+Sparse fieldsets - ?fields=a,b,c on list and detail routes
+
+The requested names are checked against the response model before any query
+runs, then passed to CRUD as fields= so only those columns are selected (as
+plain rows, no ORM objects), and the response encodes only them.
+"""
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from typing import Any, Callable, Optional, Sequence, Type
+from app.routes.serialization import Fieldset
+
+
+def fieldset(response_model: Type[BaseModel]) -> Callable[..., Optional[list[str]]]:
+    """Dependency parsing ?fields= for response_model; unknown names are a 400"""
+    known = list(response_model.model_fields)
+
+    def parse_fields(
+        fields: Optional[str] = Query(None, description="Comma-separated response fields to return (default: all)")
+    ) -> Optional[list[str]]:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise HTTPException(status_code=400, detail="fields must name at least one field")
+        unknown = sorted(requested - set(known))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return [name for name in known if name in requested]
+
+    return parse_fields
+
+
+def sparse(content: Any, fields: Optional[Sequence[str]]) -> Any:
+    """Endpoint result restricted to fields, or unchanged when none were requested"""
+    return content if fields is None else Fieldset(content, fields)
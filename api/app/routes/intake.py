@@ -0,0 +1,52 @@
+"""
+Case intake routes - one request, one transaction for a new research case
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from app.db.core import Database, get_database
+from app.db.crud import intake as crud
+from app.db.research_cases import RESEARCH_CASE_TYPES
+from app.db.schemas.intake import CaseIntake, CaseIntakeResponse
+from app.routes.serialization import SerializedRoute
+
+router = APIRouter(route_class=SerializedRoute)
+
+
+@router.post("/case", response_model=CaseIntakeResponse, status_code=201)
+async def create_case(
+    intake: CaseIntake,
+    db: Database = Depends(get_database)
+):
+    """
+    Match or create the patient, then create the encounter and the research
+    case, all committed together: a failure part way leaves nothing behind
+    """
+    case_type = RESEARCH_CASE_TYPES.get(intake.procedure_type)
+    if case_type is None:
+        raise HTTPException(status_code=400, detail=f"Unknown research case type: {intake.procedure_type}")
+
+    # Validate the case fields up front; the encounter id is only known inside the transaction
+    try:
+        case = case_type.create_schema.model_validate({
+            "encounter_id": 0,
+            "fellow_or_pa": intake.fellow_or_pa,
+            "attending": intake.attending_physician,
+            "mrn": intake.mrn,
+            "first_name": intake.first_name,
+            "last_name": intake.last_name,
+            "dob": intake.date_of_birth,
+            case_type.surgery_date: intake.encounter_date,
+            "laterality": intake.laterality,
+        })
+    except ValidationError as e:
+        errors = [{"loc": list(error["loc"]), "msg": error["msg"]} for error in e.errors()]
+        raise HTTPException(status_code=422, detail=errors)
+
+    try:
+        return await db.write(
+            crud.create_case, intake.dict(), case_type.crud, case.dict(exclude={"encounter_id"})
+        )
+    except IntegrityError:
+        # The MRN belongs to a deleted patient, or a concurrent intake created it first
+        raise HTTPException(status_code=400, detail="Patient with this MRN already exists")
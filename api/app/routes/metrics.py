@@ -0,0 +1,22 @@
+"""
+Metrics routes - cache and write-batching counters for monitoring
+"""
+from fastapi import APIRouter
+from app.db.cache import cache_stats
+from app.db.core import write_coordinator
+
+router = APIRouter()
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Hit/miss/eviction counters for every cache in this worker"""
+    return cache_stats()
+
+
+@router.get("/write-batching")
+async def get_write_batching_stats():
+    """Group-commit batch counters (WRITE_BATCHING)"""
+    if write_coordinator is None:
+        return {"enabled": False}
+    return {"enabled": True, **write_coordinator.stats()}
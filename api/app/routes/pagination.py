@@ -0,0 +1,45 @@
+"""
+Keyset pagination helpers - opaque cursors and next-page links for list routes
+"""
+import base64
+import json
+from fastapi import HTTPException, Query, Request, Response
+from typing import Optional, Sequence
+
+CursorQuery = Query(
+    None,
+    description="Opaque cursor from the previous page's Link / X-Next-Cursor header; skip is ignored when set"
+)
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last id on a page as an opaque URL-safe cursor"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decode a cursor back to the id to resume after (400 if malformed)"""
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+        if not isinstance(last_id, int):
+            raise ValueError(last_id)
+        return last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def set_next_page(request: Request, response: Response, items: Sequence, limit: int) -> None:
+    """
+    Advertise the next page when this one is full, as both an RFC 8288
+    Link header and a bare X-Next-Cursor header
+    """
+    if len(items) < limit:
+        return
+    next_cursor = encode_cursor(items[-1].id)
+    next_url = request.url.remove_query_params("skip").include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = next_cursor
@@ -1,73 +1,182 @@
 """
 Patient routes - API endpoints for patient management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
-from typing import List
-from app.db.core import get_session
-from app.db.crud import patient as crud
-from app.db.schemas.patient import PatientCreate, PatientUpdate, PatientResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.routes.bulk import BulkRows, bulk_insert
+from app.routes.conditional import conditional_row, conditional_table
+from app.routes.response_cache import cached
+from app.routes.fieldsets import fieldset, sparse
+from app.routes.pagination import CursorQuery, decode_cursor, set_next_page
+from app.routes.streaming import STREAM_RESPONSES, stream_format, stream_list
+from app.db.crud import patient as crud, stats as stats_crud, timeline as timeline_crud
+from app.db.schemas.bulk import BulkResponse
+from app.db.schemas.patient import PatientCreate, PatientMatch, PatientUpdate, PatientResponse
+from app.db.schemas.stats import PatientStats
+from app.db.schemas.timeline import PatientTimeline
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 
 
 @router.post("/", response_model=PatientResponse, status_code=201)
-def create_patient(
+async def create_patient(
     patient: PatientCreate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Create a new patient"""
     # Check if MRN already exists
-    existing = crud.get_patient_by_mrn(session, patient.mrn)
+    existing = await db.run(crud.get_patient_by_mrn, patient.mrn)
     if existing:
         raise HTTPException(status_code=400, detail="Patient with this MRN already exists")
     
-    return crud.create_patient(session, patient.dict())
+    try:
+        return await db.write(crud.create_patient, patient.dict())
+    except IntegrityError:
+        # Lost a race with a concurrent create for the same MRN
+        raise HTTPException(status_code=400, detail="Patient with this MRN already exists")
+
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_patients(
+    rows: List[Dict[str, Any]] = BulkRows,
+    db: Database = Depends(get_database)
+):
+    """Create many patients at once; existing MRNs are reported per row, not raised"""
+    return await bulk_insert(db, PatientCreate, rows, crud.bulk_create_patients)
 
-@router.get("/", response_model=List[PatientResponse])
-def list_patients(
+
+@router.get(
+    "/", response_model=List[PatientResponse], responses=STREAM_RESPONSES,
+    dependencies=[Depends(cached("patient")), Depends(conditional_table("patient"))]
+)
+async def list_patients(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[List[str]] = Depends(fieldset(PatientResponse)),
     include_deleted: bool = Query(False),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Get list of patients with pagination"""
-    return crud.get_patients(session, skip=skip, limit=limit, include_deleted=include_deleted)
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(
+            request, media_type, PatientResponse, crud.get_patients,
+            skip=skip, limit=limit, include_deleted=include_deleted, after_id=decode_cursor(cursor),
+            fields=fields
+        )
+    patients = await db.run(
+        crud.get_patients,
+        skip=skip,
+        limit=limit,
+        include_deleted=include_deleted,
+        after_id=decode_cursor(cursor),
+        fields=fields
+    )
+    set_next_page(request, response, patients, limit)
+    return sparse(patients, fields)
 
 
 @router.get("/search", response_model=List[PatientResponse])
-def search_patients(
+async def search_patients(
     q: str = Query(..., min_length=1, description="Search term (name or MRN)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Search patients by name or MRN"""
-    return crud.search_patients(session, search_term=q, skip=skip, limit=limit)
+    return await db.run(crud.search_patients, search_term=q, skip=skip, limit=limit)
+
+
+@router.get("/match", response_model=List[PatientMatch])
+async def match_patients(
+    mrn: Optional[str] = Query(None, description="MRN; compared after normalization (case, punctuation, leading zeros)"),
+    first_name: Optional[str] = Query(None),
+    last_name: Optional[str] = Query(None),
+    date_of_birth: Optional[date] = Query(None),
+    min_score: float = Query(0.5, ge=0, le=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Database = Depends(get_database)
+):
+    """Find likely existing records for a patient (exact and phonetic matches), best first"""
+    if not (mrn or first_name or last_name):
+        raise HTTPException(status_code=400, detail="Provide an MRN or a name to match on")
+    matches = await db.run(
+        crud.match_patients,
+        mrn=mrn,
+        first_name=first_name,
+        last_name=last_name,
+        date_of_birth=date_of_birth,
+        min_score=min_score,
+        limit=limit
+    )
+    return [
+        {"patient": patient, "score": score, "matched_on": matched}
+        for patient, score, matched in matches
+    ]
 
 
-@router.get("/{patient_id}", response_model=PatientResponse)
-def get_patient(
+@router.get("/stats", response_model=PatientStats)
+async def get_patient_stats(db: Database = Depends(get_database)):
+    """Patient counts by status, sex and state"""
+    return await db.run(stats_crud.get_patient_stats)
+
+
+@router.get(
+    "/{patient_id}", response_model=PatientResponse,
+    dependencies=[Depends(cached("patient"))]
+)
+async def get_patient(
     patient_id: int,
-    session: Session = Depends(get_session)
+    changed_at: Optional[datetime] = Depends(conditional_row("patient", "patient_id")),
+    fields: Optional[List[str]] = Depends(fieldset(PatientResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get patient by ID"""
-    patient = crud.get_patient(session, patient_id)
+    # The body must be the version the ETag names, not an older cached copy
+    patient = await db.run(crud.get_patient, patient_id, fields=fields, changed_at=changed_at)
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
-    return patient
+    return sparse(patient, fields)
+
+
+@router.get("/{patient_id}/timeline", response_model=PatientTimeline)
+async def get_patient_timeline(
+    patient_id: int,
+    depth: int = Query(2, ge=0, le=2, description="0 = patient, 1 = + encounters, 2 = + encounter details"),
+    sections: Optional[str] = Query(
+        None, description="Comma-separated encounter details to load: diagnoses, procedures, research_cases"
+    ),
+    db: Database = Depends(get_database)
+):
+    """Patient with encounters, diagnoses, procedures and research cases in one response"""
+    requested = None
+    if sections is not None:
+        requested = [section.strip() for section in sections.split(",") if section.strip()]
+        unknown = sorted(set(requested) - set(timeline_crud.TIMELINE_SECTIONS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown timeline sections: {', '.join(unknown)}")
+    timeline = await db.run(timeline_crud.get_patient_timeline, patient_id, depth=depth, sections=requested)
+    if not timeline:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return timeline
 
 
 @router.patch("/{patient_id}", response_model=PatientResponse)
-def update_patient(
+async def update_patient(
     patient_id: int,
     patient_update: PatientUpdate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Update patient information"""
-    patient = crud.update_patient(
-        session,
+    patient = await db.write(
+        crud.update_patient,
         patient_id,
         patient_update.dict(exclude_unset=True)
     )
@@ -77,23 +186,23 @@ def update_patient(
 
 
 @router.delete("/{patient_id}", status_code=204)
-def delete_patient(
+async def delete_patient(
     patient_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Soft delete a patient"""
-    success = crud.delete_patient(session, patient_id)
+    success = await db.write(crud.delete_patient, patient_id)
     if not success:
         raise HTTPException(status_code=404, detail="Patient not found")
 
 
 @router.post("/{patient_id}/restore", response_model=PatientResponse)
-def restore_patient(
+async def restore_patient(
     patient_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Restore a soft-deleted patient"""
-    patient = crud.restore_patient(session, patient_id)
+    patient = await db.write(crud.restore_patient, patient_id)
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
     return patient
@@ -1,65 +1,99 @@
 """
 Procedure routes - API endpoints for procedure management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
-from typing import List
-from app.db.core import get_session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.routes.conditional import conditional_row, conditional_table
+from app.routes.response_cache import cached
+from app.routes.fieldsets import fieldset, sparse
+from app.routes.pagination import CursorQuery, decode_cursor, set_next_page
+from app.routes.streaming import STREAM_RESPONSES, stream_format, stream_list
 from app.db.crud import procedure as crud
 from app.db.schemas.procedure import ProcedureCreate, ProcedureUpdate, ProcedureResponse
 
-router = APIRouter(tags=["Procedures"])
+router = APIRouter(tags=["Procedures"], route_class=SerializedRoute)
 
 
 @router.post("/", response_model=ProcedureResponse, status_code=201)
-def create_procedure(
+async def create_procedure(
     procedure: ProcedureCreate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Add a new procedure to an encounter"""
-    return crud.create_procedure(session, procedure.dict())
+    return await db.write(crud.create_procedure, procedure.dict())
 
 
-@router.get("/", response_model=List[ProcedureResponse])
-def list_procedures(
+@router.get(
+    "/", response_model=List[ProcedureResponse], responses=STREAM_RESPONSES,
+    dependencies=[Depends(cached("procedure")), Depends(conditional_table("procedure"))]
+)
+async def list_procedures(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[List[str]] = Depends(fieldset(ProcedureResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get list of procedures with pagination"""
-    return crud.get_procedures(session, skip=skip, limit=limit)
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(
+            request, media_type, ProcedureResponse, crud.get_procedures,
+            skip=skip, limit=limit, after_id=decode_cursor(cursor),
+            fields=fields
+        )
+    procedures = await db.run(
+        crud.get_procedures,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor),
+        fields=fields
+    )
+    set_next_page(request, response, procedures, limit)
+    return sparse(procedures, fields)
 
 
 @router.get("/encounter/{encounter_id}", response_model=List[ProcedureResponse])
-def get_encounter_procedures(
+async def get_encounter_procedures(
     encounter_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Get all procedures for a specific encounter"""
-    return crud.get_encounter_procedures(session, encounter_id)
+    return await db.run(crud.get_encounter_procedures, encounter_id)
 
 
-@router.get("/{procedure_id}", response_model=ProcedureResponse)
-def get_procedure(
+@router.get(
+    "/{procedure_id}", response_model=ProcedureResponse,
+    dependencies=[
+        Depends(cached("procedure")),
+        Depends(conditional_row("procedure", "procedure_id"))
+    ]
+)
+async def get_procedure(
     procedure_id: int,
-    session: Session = Depends(get_session)
+    fields: Optional[List[str]] = Depends(fieldset(ProcedureResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get procedure by ID"""
-    procedure = crud.get_procedure(session, procedure_id)
+    procedure = await db.run(crud.get_procedure, procedure_id, fields=fields)
     if not procedure:
         raise HTTPException(status_code=404, detail="Procedure not found")
-    return procedure
+    return sparse(procedure, fields)
 
 
 @router.patch("/{procedure_id}", response_model=ProcedureResponse)
-def update_procedure(
+async def update_procedure(
     procedure_id: int,
     procedure_update: ProcedureUpdate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Update procedure information"""
-    procedure = crud.update_procedure(
-        session,
+    procedure = await db.write(
+        crud.update_procedure,
         procedure_id,
         procedure_update.dict(exclude_unset=True)
     )
@@ -69,11 +103,11 @@ def update_procedure(
 
 
 @router.delete("/{procedure_id}", status_code=204)
-def delete_procedure(
+async def delete_procedure(
     procedure_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Delete a procedure"""
-    success = crud.delete_procedure(session, procedure_id)
+    success = await db.write(crud.delete_procedure, procedure_id)
     if not success:
         raise HTTPException(status_code=404, detail="Procedure not found")
@@ -1,10 +1,16 @@
 """
 Other Procedures routes - API endpoints for other procedure case management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
-from typing import List
-from app.db.core import get_session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.routes.conditional import conditional_row, conditional_table
+from app.routes.response_cache import cached
+from app.routes.fieldsets import fieldset, sparse
+from app.routes.pagination import CursorQuery, decode_cursor, set_next_page
+from app.routes.streaming import STREAM_RESPONSES, stream_format, stream_list
 from app.db.crud import rc_other as crud
 from app.db.schemas.rc_other import (
     RcOtherSurgicalCreate,
@@ -12,69 +18,109 @@ from app.db.schemas.rc_other import (
     RcOtherSurgicalResponse
 )
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 
 
 @router.post("/", response_model=RcOtherSurgicalResponse, status_code=201)
-def create_case(
+async def create_case(
     case: RcOtherSurgicalCreate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Create a new other procedure case"""
     # Check if case already exists for this encounter
-    existing = crud.get_case_by_encounter(session, case.encounter_id)
+    existing = await db.run(crud.get_case_by_encounter, case.encounter_id)
     if existing:
         raise HTTPException(
             status_code=400,
             detail="Other procedure case already exists for this encounter"
         )
     
-    return crud.create_case(session, case.dict())
+    try:
+        return await db.write(crud.create_case, case.dict())
+    except IntegrityError:
+        # Lost a race with a concurrent create for the same encounter
+        raise HTTPException(
+            status_code=400,
+            detail="Other procedure case already exists for this encounter"
+        )
 
 
-@router.get("/", response_model=List[RcOtherSurgicalResponse])
-def list_cases(
+@router.get(
+    "/", response_model=List[RcOtherSurgicalResponse], responses=STREAM_RESPONSES,
+    dependencies=[Depends(cached("rc_other")), Depends(conditional_table("rc_other"))]
+)
+async def list_cases(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[List[str]] = Depends(fieldset(RcOtherSurgicalResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get list of other procedure cases with pagination"""
-    return crud.get_cases(session, skip=skip, limit=limit)
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(
+            request, media_type, RcOtherSurgicalResponse, crud.get_cases,
+            skip=skip, limit=limit, after_id=decode_cursor(cursor),
+            fields=fields
+        )
+    cases = await db.run(
+        crud.get_cases,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor),
+        fields=fields
+    )
+    set_next_page(request, response, cases, limit)
+    return sparse(cases, fields)
 
 
-@router.get("/{case_id}", response_model=RcOtherSurgicalResponse)
-def get_case(
+@router.get(
+    "/{case_id}", response_model=RcOtherSurgicalResponse,
+    dependencies=[Depends(cached("rc_other")), Depends(conditional_row("rc_other", "case_id"))]
+)
+async def get_case(
     case_id: int,
-    session: Session = Depends(get_session)
+    fields: Optional[List[str]] = Depends(fieldset(RcOtherSurgicalResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get other procedure case by ID"""
-    case = crud.get_case(session, case_id)
+    case = await db.run(crud.get_case, case_id, fields=fields)
     if not case:
         raise HTTPException(status_code=404, detail="Other procedure case not found")
-    return case
+    return sparse(case, fields)
 
 
-@router.get("/encounter/{encounter_id}", response_model=RcOtherSurgicalResponse)
-def get_case_by_encounter(
+@router.get(
+    "/encounter/{encounter_id}", response_model=RcOtherSurgicalResponse,
+    dependencies=[
+        Depends(cached("rc_other")),
+        Depends(conditional_row("rc_other", "encounter_id", "encounter_id"))
+    ]
+)
+async def get_case_by_encounter(
     encounter_id: int,
-    session: Session = Depends(get_session)
+    fields: Optional[List[str]] = Depends(fieldset(RcOtherSurgicalResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get other procedure case by encounter ID"""
-    case = crud.get_case_by_encounter(session, encounter_id)
+    case = await db.run(crud.get_case_by_encounter, encounter_id, fields=fields)
     if not case:
         raise HTTPException(status_code=404, detail="Other procedure case not found for this encounter")
-    return case
+    return sparse(case, fields)
 
 
 @router.patch("/{case_id}", response_model=RcOtherSurgicalResponse)
-def update_case(
+async def update_case(
     case_id: int,
     case_update: RcOtherSurgicalUpdate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Update other procedure case"""
-    case = crud.update_case(
-        session,
+    case = await db.write(
+        crud.update_case,
         case_id,
         case_update.dict(exclude_unset=True)
     )
@@ -84,11 +130,11 @@ def update_case(
 
 
 @router.delete("/{case_id}", status_code=204)
-def delete_case(
+async def delete_case(
     case_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Delete an other procedure case"""
-    success = crud.delete_case(session, case_id)
+    success = await db.write(crud.delete_case, case_id)
     if not success:
         raise HTTPException(status_code=404, detail="Other procedure case not found")
@@ -1,10 +1,16 @@
 """
 Shoulder Arthroplasty routes - API endpoints for shoulder arthroplasty case management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session
-from typing import List
-from app.db.core import get_session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.routes.conditional import conditional_row, conditional_table
+from app.routes.response_cache import cached
+from app.routes.fieldsets import fieldset, sparse
+from app.routes.pagination import CursorQuery, decode_cursor, set_next_page
+from app.routes.streaming import STREAM_RESPONSES, stream_format, stream_list
 from app.db.crud import rc_shoulderarthroplasty as crud
 from app.db.schemas.rc_shoulderarthroplasty import (
     RcShoulderArthroplastySurgicalCreate,
@@ -12,69 +18,115 @@ from app.db.schemas.rc_shoulderarthroplasty import (
     RcShoulderArthroplastySurgicalResponse
 )
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 
 
 @router.post("/", response_model=RcShoulderArthroplastySurgicalResponse, status_code=201)
-def create_case(
+async def create_case(
     case: RcShoulderArthroplastySurgicalCreate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Create a new shoulder arthroplasty case"""
     # Check if case already exists for this encounter
-    existing = crud.get_case_by_encounter(session, case.encounter_id)
+    existing = await db.run(crud.get_case_by_encounter, case.encounter_id)
     if existing:
         raise HTTPException(
             status_code=400,
             detail="Shoulder arthroplasty case already exists for this encounter"
         )
     
-    return crud.create_case(session, case.dict())
+    try:
+        return await db.write(crud.create_case, case.dict())
+    except IntegrityError:
+        # Lost a race with a concurrent create for the same encounter
+        raise HTTPException(
+            status_code=400,
+            detail="Shoulder arthroplasty case already exists for this encounter"
+        )
 
 
-@router.get("/", response_model=List[RcShoulderArthroplastySurgicalResponse])
-def list_cases(
+@router.get(
+    "/", response_model=List[RcShoulderArthroplastySurgicalResponse], responses=STREAM_RESPONSES,
+    dependencies=[
+        Depends(cached("rc_shoulderarthroplasty")),
+        Depends(conditional_table("rc_shoulderarthroplasty"))
+    ]
+)
+async def list_cases(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = CursorQuery,
+    fields: Optional[List[str]] = Depends(fieldset(RcShoulderArthroplastySurgicalResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get list of shoulder arthroplasty cases with pagination"""
-    return crud.get_cases(session, skip=skip, limit=limit)
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(
+            request, media_type, RcShoulderArthroplastySurgicalResponse, crud.get_cases,
+            skip=skip, limit=limit, after_id=decode_cursor(cursor),
+            fields=fields
+        )
+    cases = await db.run(
+        crud.get_cases,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor),
+        fields=fields
+    )
+    set_next_page(request, response, cases, limit)
+    return sparse(cases, fields)
 
 
-@router.get("/{case_id}", response_model=RcShoulderArthroplastySurgicalResponse)
-def get_case(
+@router.get(
+    "/{case_id}", response_model=RcShoulderArthroplastySurgicalResponse,
+    dependencies=[
+        Depends(cached("rc_shoulderarthroplasty")),
+        Depends(conditional_row("rc_shoulderarthroplasty", "case_id"))
+    ]
+)
+async def get_case(
     case_id: int,
-    session: Session = Depends(get_session)
+    fields: Optional[List[str]] = Depends(fieldset(RcShoulderArthroplastySurgicalResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get shoulder arthroplasty case by ID"""
-    case = crud.get_case(session, case_id)
+    case = await db.run(crud.get_case, case_id, fields=fields)
     if not case:
         raise HTTPException(status_code=404, detail="Shoulder arthroplasty case not found")
-    return case
+    return sparse(case, fields)
 
 
-@router.get("/encounter/{encounter_id}", response_model=RcShoulderArthroplastySurgicalResponse)
-def get_case_by_encounter(
+@router.get(
+    "/encounter/{encounter_id}", response_model=RcShoulderArthroplastySurgicalResponse,
+    dependencies=[
+        Depends(cached("rc_shoulderarthroplasty")),
+        Depends(conditional_row("rc_shoulderarthroplasty", "encounter_id", "encounter_id"))
+    ]
+)
+async def get_case_by_encounter(
     encounter_id: int,
-    session: Session = Depends(get_session)
+    fields: Optional[List[str]] = Depends(fieldset(RcShoulderArthroplastySurgicalResponse)),
+    db: Database = Depends(get_database)
 ):
     """Get shoulder arthroplasty case by encounter ID"""
-    case = crud.get_case_by_encounter(session, encounter_id)
+    case = await db.run(crud.get_case_by_encounter, encounter_id, fields=fields)
     if not case:
         raise HTTPException(status_code=404, detail="Shoulder arthroplasty case not found for this encounter")
-    return case
+    return sparse(case, fields)
 
 
 @router.patch("/{case_id}", response_model=RcShoulderArthroplastySurgicalResponse)
-def update_case(
+async def update_case(
     case_id: int,
     case_update: RcShoulderArthroplastySurgicalUpdate,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Update shoulder arthroplasty case"""
-    case = crud.update_case(
-        session,
+    case = await db.write(
+        crud.update_case,
         case_id,
         case_update.dict(exclude_unset=True)
     )
@@ -84,11 +136,11 @@ def update_case(
 
 
 @router.delete("/{case_id}", status_code=204)
-def delete_case(
+async def delete_case(
     case_id: int,
-    session: Session = Depends(get_session)
+    db: Database = Depends(get_database)
 ):
     """Delete a shoulder arthroplasty case"""
-    success = crud.delete_case(session, case_id)
+    success = await db.write(crud.delete_case, case_id)
     if not success:
         raise HTTPException(status_code=404, detail="Shoulder arthroplasty case not found")
@@ -0,0 +1,82 @@
+"""
+Research case routes - endpoints shared by every research case table
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Any, Dict, List, Optional
+from datetime import date
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.db.crud import rc_case_index as crud, stats as stats_crud
+from app.db.research_cases import RESEARCH_CASE_TYPES, ResearchCaseType
+from app.db.schemas.bulk import BulkResponse
+from app.db.schemas.rc_case_index import RcCaseIndexResponse
+from app.db.schemas.stats import CaseStats
+from app.routes.bulk import BulkRows, bulk_insert
+from app.routes.pagination import CursorQuery, decode_cursor, set_next_page
+from app.routes.streaming import STREAM_RESPONSES, stream_format, stream_list
+
+router = APIRouter(route_class=SerializedRoute)
+
+
+def get_case_type(procedure_type: str) -> ResearchCaseType:
+    """Resolve a research case slug (e.g. knee-surgical) or 404"""
+    case_type = RESEARCH_CASE_TYPES.get(procedure_type)
+    if case_type is None:
+        raise HTTPException(status_code=404, detail=f"Unknown research case type: {procedure_type}")
+    return case_type
+
+
+@router.get("/cases", response_model=List[RcCaseIndexResponse], responses=STREAM_RESPONSES)
+async def list_cases(
+    request: Request,
+    response: Response,
+    procedure_type: Optional[List[str]] = Query(None, description="Research case type slug; repeat for several"),
+    attending: Optional[str] = Query(None),
+    fellow_or_pa: Optional[str] = Query(None),
+    mrn: Optional[str] = Query(None),
+    laterality: Optional[str] = Query(None),
+    surgery_date_from: Optional[date] = Query(None),
+    surgery_date_to: Optional[date] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = CursorQuery,
+    db: Database = Depends(get_database)
+):
+    """Research cases of every procedure type, filtered on their common columns"""
+    unknown = sorted(set(procedure_type or ()) - set(RESEARCH_CASE_TYPES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown research case types: {', '.join(unknown)}")
+    filters = dict(
+        procedure_types=procedure_type,
+        attending=attending,
+        fellow_or_pa=fellow_or_pa,
+        mrn=mrn,
+        laterality=laterality,
+        surgery_date_from=surgery_date_from,
+        surgery_date_to=surgery_date_to,
+        skip=skip,
+        limit=limit,
+        after_id=decode_cursor(cursor)
+    )
+    media_type = stream_format(request)
+    if media_type:
+        return stream_list(request, media_type, RcCaseIndexResponse, crud.get_cases, **filters)
+    cases = await db.run(crud.get_cases, **filters)
+    set_next_page(request, response, cases, limit)
+    return cases
+
+
+@router.get("/stats", response_model=CaseStats)
+async def get_case_stats(db: Database = Depends(get_database)):
+    """Research case counts per procedure type and month of surgery"""
+    return await db.run(stats_crud.get_case_stats)
+
+
+@router.post("/{procedure_type}/bulk", response_model=BulkResponse)
+async def bulk_create_cases(
+    rows: List[Dict[str, Any]] = BulkRows,
+    case_type: ResearchCaseType = Depends(get_case_type),
+    db: Database = Depends(get_database)
+):
+    """Create many research cases of one type; encounters that already have a case are reported per row"""
+    return await bulk_insert(db, case_type.create_schema, rows, case_type.crud.bulk_create_cases)
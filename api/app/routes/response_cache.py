@@ -0,0 +1,101 @@
+"""
+Response cache - encoded GET responses reused until a write touches their tables
+
+Entries are keyed by path (route and path params), sorted query and Accept,
+plus a generation token per table the route reads. Any CRUD write to one of
+those tables swaps its token (see app.db.cache.on_table_write), so every
+entry built from the old data stops matching at once and ages out of the LRU.
+A read racing a write caches under the old token at worst. Entries and tokens
+live on CACHE_BACKEND; with the sqlite backend workers share both, with
+"memory" each worker only sees its own writes until RESPONSE_CACHE_TTL.
+
+Only complete 200 bodies are stored (JSON lists and details, not NDJSON/CSV
+streams). A hit whose ETag the client already holds is answered with 304.
+"""
+import uuid
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Hashable, Optional
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from app.config import settings
+from app.db import cache
+from app.routes.conditional import _not_modified
+
+responses = cache.create_cache(
+    "responses", settings.response_cache_size, settings.response_cache_ttl, settings.response_cache_max_bytes
+)
+generations = cache.create_cache("response-generations", 4096, settings.response_cache_ttl)
+
+# Response headers replayed on a hit; content-length is rebuilt and the server adds the rest
+_STORED_HEADERS = {b"content-type", b"etag", b"last-modified", b"link", b"vary"}
+
+
+class Hit(Exception):
+    """Raised by a cached() dependency to answer the request with a stored response"""
+
+    def __init__(self, response: Response):
+        self.response = response
+
+
+def _generation(table_name: str) -> str:
+    token = generations.get(table_name)
+    if token is None:
+        token = uuid.uuid4().hex
+        generations.set(table_name, token)
+    return token
+
+
+def _bump(table_name: str) -> None:
+    if settings.response_cache_size:
+        generations.set(table_name, uuid.uuid4().hex)
+
+
+cache.on_table_write(_bump)
+
+
+def _replay(request: Request, entry: tuple) -> Response:
+    status_code, raw_headers, body = entry
+    headers = Headers(raw=raw_headers)
+    etag = headers.get("etag")
+    if etag is not None:
+        last_modified = headers.get("last-modified")
+        if _not_modified(request, etag, parsedate_to_datetime(last_modified) if last_modified else None):
+            response = Response(status_code=304)
+            response.raw_headers = [(name, value) for name, value in raw_headers if name != b"content-type"]
+            return response
+    response = Response(body, status_code=status_code)
+    response.raw_headers = [*raw_headers, (b"content-length", str(len(body)).encode())]
+    return response
+
+
+def cached(*table_names: str) -> Callable[..., Any]:
+    """
+    Dependency serving a GET route from the response cache; list it before
+    the route's conditional dependency so a hit skips the database entirely
+    """
+
+    async def check_cache(request: Request) -> None:
+        if not settings.response_cache_size:
+            return
+        key = (
+            request.url.path,
+            tuple(sorted(request.query_params.multi_items())),
+            request.headers.get("accept", ""),
+            tuple(_generation(table_name) for table_name in table_names),
+        )
+        entry = responses.get(key)
+        if entry is not None:
+            raise Hit(_replay(request, entry))
+        request.state.response_cache_key = key
+
+    return check_cache
+
+
+def remember(request: Request, response: Response) -> None:
+    """Store response for the key a cached() dependency missed on, if it is a complete 200"""
+    key: Optional[Hashable] = getattr(request.state, "response_cache_key", None)
+    if key is None or response.status_code != 200 or not hasattr(response, "body"):
+        return
+    raw_headers = [(name, value) for name, value in response.raw_headers if name in _STORED_HEADERS]
+    size = len(response.body) + sum(len(name) + len(value) for name, value in raw_headers)
+    responses.set(key, (response.status_code, raw_headers, response.body), size=size)
@@ -0,0 +1,29 @@
+"""
+Search routes - full-text search across clinical free text
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from app.db.core import Database, get_database
+from app.routes.serialization import SerializedRoute
+from app.db.crud import search as crud
+from app.db.fulltext import CLINICAL_TEXT_SOURCES
+from app.db.schemas.search import TextSearchHit
+
+router = APIRouter(route_class=SerializedRoute)
+
+ENTITY_TYPES = sorted({table for _, table, _ in CLINICAL_TEXT_SOURCES})
+
+
+@router.get("/text", response_model=List[TextSearchHit])
+async def search_text(
+    q: str = Query(..., min_length=1, description="Words to find (all must match); end a word with * for a prefix"),
+    types: Optional[List[str]] = Query(None, description=f"Limit to entity types: {', '.join(ENTITY_TYPES)}"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Database = Depends(get_database)
+):
+    """Search operative reports, notes, complaints and comments, best match first"""
+    unknown = set(types or []) - set(ENTITY_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown entity types: {', '.join(sorted(unknown))}")
+    return await db.run(crud.search_clinical_text, q, entity_types=types, skip=skip, limit=limit)
@@ -0,0 +1,235 @@
+"""
+Response serialization - cached TypeAdapters that dump straight to JSON bytes
+
+For response_model routes FastAPI validates every returned object against the
+model (an attribute read per field) and then re-encodes the result in Python
+with jsonable_encoder. Routes built on SerializedRoute skip both: rows of a
+flat response model (every table's *Response) are trusted as read from the
+database and dumped, in the model's field order, by a TypedDict twin of the
+model with no validation at all; composite responses (timeline, stats,
+reports) take a single pydantic-core validate + dump pass. Either way the JSON bytes come from
+pydantic-core and the adapters are built once per response model.
+"""
+import asyncio
+import functools
+import inspect
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Sequence, get_args, get_origin
+from fastapi import Request, Response
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.engine import Row
+from typing_extensions import TypedDict
+from app.routes import response_cache
+
+
+# Response parameter added to endpoints that declare none (see _with_response)
+_RESPONSE_PARAM = "serialized_response"
+
+
+class JSONBytesResponse(Response):
+    """Response whose content is already encoded JSON"""
+    media_type = "application/json"
+
+
+class Fieldset(NamedTuple):
+    """Endpoint result to encode with only some of its response fields (?fields=)"""
+    content: Any
+    fields: Sequence[str]
+
+
+def _nests_model(annotation: Any) -> bool:
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return True
+    return any(_nests_model(arg) for arg in get_args(annotation))
+
+
+def _is_flat(model: type[BaseModel]) -> bool:
+    """True when no field holds another model, so a row's __dict__ is the whole payload"""
+    return not any(_nests_model(field.annotation) for field in model.model_fields.values())
+
+
+@functools.lru_cache(maxsize=None)
+def _row_type(model: type[BaseModel]) -> Any:
+    """TypedDict with the model's fields; it serializes a plain dict without validating it"""
+    fields = {name: field.annotation for name, field in model.model_fields.items()}
+    return TypedDict(f"{model.__name__}Row", fields, total=False)
+
+
+def _defaults(model: type[BaseModel]) -> dict:
+    return {name: field.get_default(call_default_factory=True) for name, field in model.model_fields.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _attributes(cls: type) -> frozenset:
+    return frozenset(dir(cls))
+
+
+def _value_reader(obj: Any) -> Callable[[str, Any], Any]:
+    """(name, default) -> value of a row object, dict or Row, as validation from attributes would read it"""
+    if isinstance(obj, Row):
+        values = obj._mapping
+        return lambda name, default: values[name] if name in values else default
+    if isinstance(obj, dict):
+        return lambda name, default: obj[name] if name in obj else default
+    # Loaded columns straight from __dict__, anything else the class has (expired, deferred) through
+    # the attribute; names it lacks entirely go straight to the default
+    values, attributes = obj.__dict__, _attributes(type(obj))
+    return lambda name, default: (
+        values[name] if name in values else getattr(obj, name, default) if name in attributes else default
+    )
+
+
+def _row_reader(model: type[BaseModel]) -> Callable[[Any], dict]:
+    """
+    Field values of a row in the model's field order (so every row, and the
+    NDJSON/CSV columns, agree); fields it lacks get the model's defaults, as
+    validation would
+    """
+    fields = tuple(_defaults(model).items())
+    names = tuple(name for name, _ in fields)
+
+    def row(obj: Any) -> dict:
+        if not isinstance(obj, (dict, Row)):
+            values = obj.__dict__
+            try:
+                return {name: values[name] for name in names}  # the usual fully loaded row
+            except KeyError:
+                pass
+        value = _value_reader(obj)
+        return {name: value(name, default) for name, default in fields}
+    return row
+
+
+def _flat_item(response_type: Any) -> tuple[bool, Optional[type[BaseModel]]]:
+    """(is a list, row model) when response_type is a flat model or a list of one"""
+    many = get_origin(response_type) is list
+    item = get_args(response_type)[0] if many else response_type
+    if inspect.isclass(item) and issubclass(item, BaseModel) and _is_flat(item):
+        return many, item
+    return many, None
+
+
+@functools.lru_cache(maxsize=None)
+def json_dumper(response_type: Any) -> Callable[[Any], bytes]:
+    """Cached content -> JSON bytes encoder for a response_model type"""
+    many, item = _flat_item(response_type)
+    if item is not None:
+        row_type, row = _row_type(item), _row_reader(item)
+        if many:
+            rows_adapter = TypeAdapter(list[row_type])
+            return lambda content: rows_adapter.dump_json([row(obj) for obj in content])
+        row_adapter = TypeAdapter(row_type)
+        return lambda content: row_adapter.dump_json(row(content))
+    adapter = TypeAdapter(response_type)
+    return lambda content: adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+@functools.lru_cache(maxsize=None)
+def fieldset_dumper(response_type: Any) -> Callable[[Any, Sequence[str]], bytes]:
+    """Cached (content, fields) -> JSON bytes encoder emitting only the given fields of a flat row model"""
+    many, item = _flat_item(response_type)
+    if item is None:
+        raise TypeError(f"Sparse fieldsets need a flat response model, not {response_type}")
+    defaults = _defaults(item)
+
+    def pick(obj: Any, fields: Sequence[str]) -> dict:
+        # CRUD answers a fields= request with column Rows; cached rows may still be whole objects
+        value = _value_reader(obj)
+        return {name: value(name, defaults[name]) for name in fields}
+
+    if many:
+        rows_adapter = TypeAdapter(list[_row_type(item)])
+        return lambda content, fields: rows_adapter.dump_json([pick(obj, fields) for obj in content])
+    row_adapter = TypeAdapter(_row_type(item))
+    return lambda content, fields: row_adapter.dump_json(pick(content, fields))
+
+
+def _respond(content: Any, response_model: Any, status_code: Optional[int], arguments: Iterable[Any]) -> Response:
+    injected = [value for value in arguments if isinstance(value, Response)]
+    if isinstance(content, Response):
+        # Keep headers dependencies set (e.g. ETag) unless the endpoint's own response has them
+        for value in injected:
+            for name, header in value.headers.items():
+                content.headers.setdefault(name, header)
+        return content
+    if isinstance(content, Fieldset):
+        body = fieldset_dumper(response_model)(content.content, content.fields)
+    else:
+        body = json_dumper(response_model)(content)
+    response = JSONBytesResponse(body, status_code=status_code or 200)
+    for value in injected:
+        # Headers / status the endpoint or its dependencies set on the injected Response (e.g. Link)
+        if value.status_code:
+            response.status_code = value.status_code
+        response.headers.raw.extend(value.headers.raw)
+    return response
+
+
+def _with_response(endpoint: Callable[..., Any]) -> inspect.Signature:
+    """
+    Endpoint signature, plus a Response parameter when it has none: FastAPI
+    hands dependencies and endpoint the same Response, so this is how headers
+    set by dependencies reach a response built here
+    """
+    signature = inspect.signature(endpoint)
+    if any(param.annotation is Response for param in signature.parameters.values()):
+        return signature
+    parameter = inspect.Parameter(_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+    return signature.replace(parameters=[*signature.parameters.values(), parameter])
+
+
+def _serializing(endpoint: Callable[..., Any], response_model: Any, status_code: Optional[int]):
+    json_dumper(response_model)  # build the adapters at import time, not on the first request
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def serialize(*args, **kwargs):
+            sub_response = kwargs.pop(_RESPONSE_PARAM, None)
+            content = await endpoint(*args, **kwargs)
+            return _respond(content, response_model, status_code, [sub_response, *kwargs.values()])
+    else:
+        @functools.wraps(endpoint)
+        def serialize(*args, **kwargs):
+            sub_response = kwargs.pop(_RESPONSE_PARAM, None)
+            content = endpoint(*args, **kwargs)
+            return _respond(content, response_model, status_code, [sub_response, *kwargs.values()])
+    serialize.__signature__ = _with_response(endpoint)
+    serialize.__serialized__ = True
+    return serialize
+
+
+class SerializedRoute(APIRoute):
+    """
+    APIRoute that encodes response_model content with json_dumper instead of
+    FastAPI's encoder, and serves / fills the response cache for routes with a
+    response_cache.cached() dependency
+    """
+
+    def __init__(
+        self,
+        path: str,
+        endpoint: Callable[..., Any],
+        *,
+        response_model: Any = Default(None),
+        status_code: Optional[int] = None,
+        **kwargs: Any
+    ):
+        if (
+            response_model is not None
+            and not isinstance(response_model, DefaultPlaceholder)
+            and not getattr(endpoint, "__serialized__", False)
+        ):
+            endpoint = _serializing(endpoint, response_model, status_code)
+        super().__init__(path, endpoint, response_model=response_model, status_code=status_code, **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except response_cache.Hit as hit:
+                return hit.response
+            response_cache.remember(request, response)
+            return response
+        return route_handler
@@ -0,0 +1,103 @@
+"""
+Streaming list responses - NDJSON or CSV, chosen by the Accept header
+
+A streamed list runs the route's CRUD function with columns= so rows come
+back as plain tuples from a server-side cursor, and each fetched chunk is
+encoded and sent before the next is read. Nothing is built per row beyond
+the encoded line, so memory stays flat however many rows match. Without an
+explicit limit a stream returns every matching row (after cursor / skip).
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Any, Callable, Iterator, Optional, Sequence, Type
+from app.db.core import RoutingSession
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+
+# OpenAPI: list routes also answer with these media types
+STREAM_RESPONSES = {200: {"content": {NDJSON: {}, CSV: {}}}}
+
+
+def stream_format(request: Request) -> Optional[str]:
+    """NDJSON or CSV when the client's highest-ranked acceptable type is one of them"""
+    ranked = []
+    for position, item in enumerate(request.headers.get("accept", "").split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            ranked.append((-quality, position, media_type.lower()))
+    for _, _, media_type in sorted(ranked):
+        if media_type in (NDJSON, CSV):
+            return media_type
+        if media_type in ("application/json", "*/*", "application/*"):
+            return None
+    return None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _ndjson(columns: list[str], chunks: Iterator[list]) -> Iterator[bytes]:
+    encode = json.JSONEncoder(default=_json_default, separators=(",", ":")).encode
+    for rows in chunks:
+        yield "".join(encode(dict(zip(columns, row))) + "\n" for row in rows).encode()
+
+
+def _csv(columns: list[str], chunks: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+
+
+def _stream(
+    encode: Callable[..., Iterator[bytes]],
+    crud_fn: Callable[..., Any],
+    args: tuple,
+    kwargs: dict
+) -> Iterator[bytes]:
+    """Encoded row chunks, read over a session that lives as long as the stream"""
+    with RoutingSession() as session:
+        result = crud_fn(session, *args, **kwargs)
+        yield from encode(list(result.keys()), result.partitions())
+
+
+def stream_list(
+    request: Request,
+    media_type: str,
+    response_model: Type[BaseModel],
+    crud_fn: Callable[..., Any],
+    *args: Any,
+    fields: Optional[Sequence[str]] = None,
+    **kwargs: Any
+) -> StreamingResponse:
+    """
+    Stream crud_fn's rows as media_type. Only the requested fields (default:
+    the response model's) are selected; the limit query parameter only
+    applies when given.
+    """
+    if "limit" not in request.query_params:
+        kwargs["limit"] = None
+    kwargs["columns"] = list(fields or response_model.model_fields)
+    encode = _ndjson if media_type == NDJSON else _csv
+    return StreamingResponse(_stream(encode, crud_fn, args, kwargs), media_type=media_type)
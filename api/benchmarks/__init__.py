@@ -0,0 +1,3 @@
+"""
+Benchmark scripts - run from the api/ directory, e.g. python -m benchmarks.bench_async
+"""
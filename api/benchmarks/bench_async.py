@@ -0,0 +1,63 @@
+"""
+Sync vs async data path - req/s on the patient and research-case routers
+
+Usage (from api/):
+    python -m benchmarks.bench_async --patients 2000 --concurrency 64 --duration 10
+"""
+import argparse
+
+import httpx
+
+from .common import api_server, print_table, run_load
+
+
+def seed(base_url: str, patients: int) -> None:
+    """Create patients, one surgery encounter each and a knee surgical case"""
+    with httpx.Client(base_url=f"{base_url}/api/v1", timeout=60) as client:
+        for i in range(patients):
+            patient = client.post("/patients/", json={
+                "mrn": f"BENCH{i:07d}",
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "date_of_birth": "1970-01-01",
+                "sex": "F" if i % 2 else "M",
+            }).json()
+            encounter = client.post("/encounters/", json={
+                "patient_id": patient["id"],
+                "encounter_type": "surgery",
+                "encounter_date": "2025-01-15",
+            }).json()
+            client.post("/rc/knee-surgical/", json={
+                "encounter_id": encounter["id"],
+                "attending": "Bench Attending",
+                "surgery_date": "2025-01-15",
+            })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patients", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    workloads = {
+        "patients/list": ["/api/v1/patients/?limit=50"],
+        "patients/id": [f"/api/v1/patients/{i}" for i in range(1, args.patients + 1, 7)],
+        "knee/list": ["/api/v1/rc/knee-surgical/?limit=50"],
+        "knee/id": [f"/api/v1/rc/knee-surgical/{i}" for i in range(1, args.patients + 1, 7)],
+    }
+
+    rows = []
+    for mode in ("false", "true"):
+        with api_server(env={"ASYNC_DATABASE": mode}) as base_url:
+            seed(base_url, args.patients)
+            for name, paths in workloads.items():
+                result = run_load(base_url, paths, args.concurrency, args.duration)
+                rows.append({"mode": "async" if mode == "true" else "sync", "workload": name, **result})
+
+    print_table(rows, ["mode", "workload", "requests", "req_per_s", "p50_ms", "p99_ms", "errors"])
+
+
+if __name__ == "__main__":
+    main()
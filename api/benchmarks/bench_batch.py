@@ -0,0 +1,94 @@
+"""
+Batch endpoint - a form's burst of small writes as separate requests vs one POST /batch
+
+Each "form" is one encounter plus --children diagnoses and procedures on it.
+"separate" posts them one by one (each its own request and commit);
+"batch" sends the same operations as one batch, children referring to the
+encounter via ${visit.id}, with and without atomic.
+
+Usage (from api/):
+    python -m benchmarks.bench_batch --forms 200 --children 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def _operations(patient_id: int, children: int) -> list[dict]:
+    operations = [{
+        "method": "POST", "path": "/encounters/", "ref": "visit",
+        "body": {"patient_id": patient_id, "encounter_type": "clinic", "encounter_date": "2025-01-01"},
+    }]
+    for i in range(children):
+        operations.append({"method": "POST", "path": "/diagnoses/", "body": {
+            "encounter_id": "${visit.id}", "icd10_code": f"M75.{i}", "diagnosis_description": "Rotator cuff syndrome",
+        }})
+        operations.append({"method": "POST", "path": "/procedures/", "body": {
+            "encounter_id": "${visit.id}", "cpt_code": f"2982{i}", "procedure_description": "Arthroscopy",
+            "procedure_date": "2025-01-01",
+        }})
+    return operations
+
+
+def _separate(client, operations: list[dict]) -> None:
+    ids = {}
+    for operation in operations:
+        body = {key: ids["visit"] if value == "${visit.id}" else value for key, value in operation["body"].items()}
+        response = client.post("/api/v1" + operation["path"], json=body)
+        response.raise_for_status()
+        if operation.get("ref"):
+            ids[operation["ref"]] = response.json()["id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--forms", type=int, default=200)
+    parser.add_argument("--children", type=int, default=4, help="diagnoses and procedures per encounter (each)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from fastapi.testclient import TestClient
+        from sqlalchemy import event
+        from app.db.core import engine
+        from app.main import app
+        from .common import print_table
+
+        commits: list[int] = []
+        event.listen(engine, "commit", lambda conn: commits.append(1))
+
+        rows = []
+        with TestClient(app) as client:
+            patient = {"mrn": "BENCH1", "sex": "F", "date_of_birth": "1970-01-01"}
+            patient_id = client.post("/api/v1/patients/", json=patient).json()["id"]
+            operations = _operations(patient_id, args.children)
+            _separate(client, operations)  # warm up both paths
+            client.post("/api/v1/batch", json={"operations": operations}).raise_for_status()
+            for label in ("separate", "batch", "batch atomic"):
+                commits.clear()
+                started = time.perf_counter()
+                for _ in range(args.forms):
+                    if label == "separate":
+                        _separate(client, operations)
+                    else:
+                        batch = {"operations": operations, "atomic": label == "batch atomic"}
+                        report = client.post("/api/v1/batch", json=batch).json()
+                        assert report["failed"] == 0, report
+                elapsed = time.perf_counter() - started
+                rows.append({
+                    "flow": label,
+                    "operations": len(operations),
+                    "ms_per_form": elapsed / args.forms * 1000,
+                    "ops_per_s": args.forms * len(operations) / elapsed,
+                    "commits_per_form": len(commits) / args.forms,
+                })
+
+        print_table(rows, ["flow", "operations", "ms_per_form", "ops_per_s", "commits_per_form"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Bulk vs one-at-a-time inserts - rows/s for patients, encounters and research cases
+
+Usage (from api/):
+    python -m benchmarks.bench_bulk --rows 50000 --batch 5000
+"""
+import argparse
+import time
+
+import httpx
+
+from .common import api_server, print_table, run_load
+from .bench_group_commit import create_patient
+
+
+def bulk_load(client: httpx.Client, path: str, rows: list[dict], batch: int) -> dict:
+    """POST rows in batches and report throughput"""
+    created = 0
+    started = time.perf_counter()
+    for start in range(0, len(rows), batch):
+        response = client.post(path, json=rows[start:start + batch])
+        response.raise_for_status()
+        created += response.json()["created"]
+    elapsed = time.perf_counter() - started
+    return {"rows": len(rows), "created": created, "rows_per_s": len(rows) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    patients = [
+        {"mrn": f"BULK{i:09d}", "last_name": f"Last{i}", "date_of_birth": "1970-01-01", "sex": "M"}
+        for i in range(args.rows)
+    ]
+    encounters = [
+        {"patient_id": i + 1, "encounter_type": "surgery", "encounter_date": "2025-01-15"}
+        for i in range(args.rows)
+    ]
+    cases = [
+        {"encounter_id": i + 1, "attending": "Bench Attending", "surgery_date": "2025-01-15"}
+        for i in range(args.rows)
+    ]
+
+    rows = []
+    with api_server() as base_url:
+        single = run_load(base_url, create_patient, args.concurrency, args.duration)
+        rows.append({"workload": "POST /patients/ (one row each)", "rows": single["requests"],
+                     "created": single["requests"] - single["errors"], "rows_per_s": single["req_per_s"]})
+
+    with api_server() as base_url:
+        with httpx.Client(base_url=f"{base_url}/api/v1", timeout=600) as client:
+            for name, path, payload in (
+                ("POST /patients/bulk", "/patients/bulk", patients),
+                ("POST /encounters/bulk", "/encounters/bulk", encounters),
+                ("POST /rc/knee-surgical/bulk", "/rc/knee-surgical/bulk", cases),
+            ):
+                rows.append({"workload": name, **bulk_load(client, path, payload, args.batch)})
+
+    print_table(rows, ["workload", "rows", "created", "rows_per_s"])
+
+
+if __name__ == "__main__":
+    main()
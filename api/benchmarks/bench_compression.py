@@ -0,0 +1,108 @@
+"""
+Response compression - bytes vs CPU per codec and level on research case list payloads
+
+Each payload is one list page as the API serves it (JSON and NDJSON), with a
+--fill fraction of each row's columns set and the rest null, like real case
+entries. "one-shot" compresses the body in one piece, as the middleware does
+for JSON pages; "streamed" flushes after every --chunk-kb of input, as it
+does for NDJSON/CSV streams.
+
+Usage (from api/):
+    python -m benchmarks.bench_compression --rows 1000 --fill 0.15
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from .bench_serialization import _value
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 6, 9), "zstd": (1, 3, 9, 19)}
+
+
+def _compress(codec, level: int, body: bytes, chunk: int) -> bytes:
+    compressor = codec(level)
+    if not chunk:
+        return compressor.compress(body) + compressor.finish()
+    parts = [compressor.compress(body[start:start + chunk]) + compressor.flush() for start in range(0, len(body), chunk)]
+    return b"".join(parts) + compressor.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per list page")
+    parser.add_argument("--fill", type=float, default=0.15, help="fraction of optional columns set per row")
+    parser.add_argument("--tables", nargs="+", default=["knee-surgical", "rotator-cuff"], help="research case slugs")
+    parser.add_argument("--chunk-kb", type=int, default=64, help="input between flushes when streaming")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+        os.environ["COMPRESSION_CODECS"] = ""  # fetch the payloads uncompressed
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from fastapi.testclient import TestClient
+        from sqlalchemy import insert
+        from app.compression import CODECS, _installed
+        from app.db.core import engine
+        from app.db.research_cases import RESEARCH_CASE_TYPES
+        from app.main import app
+        from .common import print_table
+
+        rng = random.Random(0)
+        payloads = []
+        with TestClient(app) as client:
+            with engine.begin() as connection:
+                connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+                for slug in args.tables:
+                    case_type = RESEARCH_CASE_TYPES[slug]
+                    fields = case_type.response_schema.model_fields
+                    columns = [column for column in case_type.model.__table__.columns if column.name != "id"]
+                    connection.execute(insert(case_type.model), [
+                        {
+                            column.name: (
+                                _value(column, i, fields[column.name].annotation if column.name in fields else None)
+                                if not column.nullable or rng.random() < args.fill else None
+                            )
+                            for column in columns
+                        } | {"encounter_id": i + 1}
+                        for i in range(args.rows)
+                    ])
+            for slug in args.tables:
+                path = f"/api/v1/rc/{slug}/?limit={args.rows}"
+                payloads.append((f"{slug} json", client.get(path).content))
+                payloads.append((f"{slug} ndjson", client.get(path, headers={"accept": "application/x-ndjson"}).content))
+
+        rows = []
+        for name, body in payloads:
+            for encoding, levels in LEVELS.items():
+                codec, module, _ = CODECS[encoding]
+                if module is not None and not _installed(module):
+                    print(f"skipping {encoding}: {module} is not installed")
+                    continue
+                for level in levels:
+                    for mode, chunk in (("one-shot", 0), ("streamed", args.chunk_kb * 1024)):
+                        started = time.perf_counter()
+                        for _ in range(args.repeat):
+                            compressed = _compress(codec, level, body, chunk)
+                        elapsed = (time.perf_counter() - started) / args.repeat
+                        rows.append({
+                            "payload": name,
+                            "codec": encoding,
+                            "level": level,
+                            "mode": mode,
+                            "raw_kb": len(body) / 1024,
+                            "out_kb": len(compressed) / 1024,
+                            "ratio": len(body) / len(compressed),
+                            "ms": elapsed * 1000,
+                            "mb_per_s": len(body) / elapsed / 1e6,
+                        })
+
+        print_table(rows, ["payload", "codec", "level", "mode", "raw_kb", "out_kb", "ratio", "ms", "mb_per_s"])
+
+
+if __name__ == "__main__":
+    main()
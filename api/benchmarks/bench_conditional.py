@@ -0,0 +1,104 @@
+"""
+Conditional GETs - full 200 responses vs If-None-Match revalidation (304), with SQL statements per request
+
+A 304 must cost at most one query: the row stamp for detail routes or the
+table_version read for list routes. The run exits non-zero if any 304 takes
+more, or a stale validator is answered with 304.
+
+Usage (from api/):
+    python -m benchmarks.bench_conditional --rows 1000 --repeat 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from .bench_serialization import _value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per table (and per list page)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from fastapi.testclient import TestClient
+        from sqlalchemy import event, insert
+        from app.db.core import engine, read_engine
+        from app.db.research_cases import RESEARCH_CASE_TYPES
+        from app.main import app
+        from .common import print_table
+
+        statements: list[str] = []
+        for bound in {engine, read_engine}:
+            event.listen(bound, "before_cursor_execute", lambda conn, cursor, statement, *rest: statements.append(statement))
+
+        rows, failures = [], []
+        with TestClient(app) as client:
+            case_types = list(RESEARCH_CASE_TYPES.values())
+            with engine.begin() as connection:
+                connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+                for case_type in case_types:
+                    fields = case_type.response_schema.model_fields
+                    columns = [column for column in case_type.model.__table__.columns if column.name != "id"]
+                    # Goes through the version triggers, so table_version is populated as in production
+                    connection.execute(insert(case_type.model), [
+                        {
+                            column.name: _value(column, i, fields[column.name].annotation if column.name in fields else None)
+                            for column in columns
+                        } | {"encounter_id": i + 1}
+                        for i in range(args.rows)
+                    ])
+
+            for case_type in case_types:
+                base_path = f"/api/v1/rc/{case_type.slug}"
+                for route, path in (("list", f"{base_path}/?limit={args.rows}"), ("detail", f"{base_path}/1")):
+                    etag = client.get(path).headers["etag"]
+                    results = {}
+                    for label, headers in (("full", {}), ("304", {"if-none-match": etag})):
+                        client.get(path, headers=headers)  # warm up
+                        statements.clear()
+                        started = time.perf_counter()
+                        for _ in range(args.repeat):
+                            response = client.get(path, headers=headers)
+                        elapsed = (time.perf_counter() - started) / args.repeat * 1000
+                        results[label] = (elapsed, len(statements) / args.repeat, response)
+                    not_modified = results["304"][2]
+                    if not_modified.status_code != 304 or results["304"][1] > 1:
+                        failures.append(f"{path}: {not_modified.status_code} after {results['304'][1]} queries")
+                    rows.append({
+                        "table": case_type.model.__tablename__[:24],
+                        "route": route,
+                        "full_kb": len(results["full"][2].content) / 1024,
+                        "full_ms": results["full"][0],
+                        "full_queries": results["full"][1],
+                        "304_ms": results["304"][0],
+                        "304_queries": results["304"][1],
+                        "speedup": results["full"][0] / results["304"][0],
+                    })
+
+            # A write must invalidate both kinds of validator
+            case_type = case_types[0]
+            base_path = f"/api/v1/rc/{case_type.slug}"
+            stale = {path: client.get(path).headers["etag"] for path in (f"{base_path}/", f"{base_path}/1")}
+            client.patch(f"{base_path}/1", json={"attending": "Dr. Changed"}).raise_for_status()
+            for path, etag in stale.items():
+                status = client.get(path, headers={"if-none-match": etag}).status_code
+                if status != 200:
+                    failures.append(f"{path}: stale ETag answered {status}")
+
+        print_table(rows, ["table", "route", "full_kb", "full_ms", "full_queries", "304_ms", "304_queries", "speedup"])
+        for failure in failures:
+            print("FAIL", failure)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Sparse fieldsets - full rows vs ?fields= on research case list and detail routes
+
+Usage (from api/):
+    python -m benchmarks.bench_fieldsets --rows 1000 --fields 10 --repeat 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from .bench_serialization import _value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per list page")
+    parser.add_argument("--fields", type=int, default=10, help="fields requested in the sparse case")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from fastapi.testclient import TestClient
+        from sqlalchemy import insert
+        from app.db.core import engine
+        from app.db.research_cases import RESEARCH_CASE_TYPES
+        from app.main import app
+        from .common import print_table
+
+        rows = []
+        with TestClient(app) as client:
+            case_types = list(RESEARCH_CASE_TYPES.values())
+            with engine.begin() as connection:
+                # Only the read path is measured; skip the triggers' and foreign keys' work
+                connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+                for name, in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'").all():
+                    connection.exec_driver_sql(f'DROP TRIGGER "{name}"')
+                for case_type in case_types:
+                    fields = case_type.response_schema.model_fields
+                    columns = [column for column in case_type.model.__table__.columns if column.name != "id"]
+                    connection.execute(insert(case_type.model), [
+                        {
+                            column.name: _value(column, i, fields[column.name].annotation if column.name in fields else None)
+                            for column in columns
+                        } | {"encounter_id": i + 1}
+                        for i in range(args.rows)
+                    ])
+
+            for case_type in case_types:
+                table_columns = set(case_type.model.__table__.columns.keys())
+                names = [name for name in case_type.response_schema.model_fields if name in table_columns]
+                sparse = ",".join(names[: args.fields])
+                base_path = f"/api/v1/rc/{case_type.slug}"
+                for route, path in (("list", f"{base_path}/?limit={args.rows}"), ("detail", f"{base_path}/1")):
+                    timings, sizes = {}, {}
+                    for label, url in (("full", path), ("sparse", f"{path}{'&' if '?' in path else '?'}fields={sparse}")):
+                        response = client.get(url)  # warm up
+                        response.raise_for_status()
+                        started = time.perf_counter()
+                        for _ in range(args.repeat):
+                            response = client.get(url)
+                        timings[label] = (time.perf_counter() - started) / args.repeat * 1000
+                        sizes[label] = len(response.content)
+                    rows.append({
+                        "table": case_type.model.__tablename__[:24],
+                        "route": route,
+                        "fields": f"{len(names[: args.fields])}/{len(case_type.response_schema.model_fields)}",
+                        "full_kb": sizes["full"] / 1024,
+                        "sparse_kb": sizes["sparse"] / 1024,
+                        "full_ms": timings["full"],
+                        "sparse_ms": timings["sparse"],
+                        "speedup": timings["full"] / timings["sparse"],
+                    })
+
+        print_table(rows, ["table", "route", "fields", "full_kb", "sparse_kb", "full_ms", "sparse_ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Group commit vs commit-per-call - write throughput for POST /patients and /encounters
+
+Usage (from api/):
+    python -m benchmarks.bench_group_commit --concurrency 64 --duration 10
+"""
+import argparse
+
+from .common import api_server, print_table, run_load
+
+
+def create_patient(i: int):
+    return "POST", "/api/v1/patients/", {
+        "mrn": f"GC{i:010d}",
+        "last_name": f"Last{i}",
+        "date_of_birth": "1970-01-01",
+        "sex": "M",
+    }
+
+
+def create_encounter(i: int):
+    return "POST", "/api/v1/encounters/", {
+        "patient_id": 1,
+        "encounter_type": "outpatient",
+        "encounter_date": "2025-01-15",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    rows = []
+    # synchronous=FULL fsyncs on every commit, which is where batching pays off
+    for synchronous in ("NORMAL", "FULL"):
+        for batching in ("false", "true"):
+            env = {
+                "SQLITE_SYNCHRONOUS": synchronous,
+                "WRITE_BATCHING": batching,
+                "WRITE_BATCH_WINDOW_MS": str(args.window_ms),
+                "WRITE_BATCH_MAX_OPS": str(args.max_batch),
+            }
+            with api_server(env=env) as base_url:
+                for name, factory in (("patients", create_patient), ("encounters", create_encounter)):
+                    result = run_load(base_url, factory, args.concurrency, args.duration)
+                    rows.append({
+                        "synchronous": synchronous,
+                        "batching": batching,
+                        "workload": name,
+                        **result,
+                    })
+
+    print_table(rows, ["synchronous", "batching", "workload", "requests", "req_per_s", "p50_ms", "p99_ms", "errors"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Idempotency keys - first POST vs its retries, and the store's size under load
+
+Creates --requests encounters, each with its own Idempotency-Key, then
+retries the most recent --max-keys of them --retries times. Retries should
+replay the stored response: no SQL statements, no new rows. The store is
+capped at --max-keys, so with more requests than that the run also shows it
+staying bounded (LRU evictions).
+
+Usage (from api/):
+    python -m benchmarks.bench_idempotency --requests 2000 --retries 2 --max-keys 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--retries", type=int, default=2, help="retries per request")
+    parser.add_argument("--max-keys", type=int, default=1000, help="IDEMPOTENCY_MAX_KEYS for the run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+        os.environ["IDEMPOTENCY_MAX_KEYS"] = str(args.max_keys)
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from fastapi.testclient import TestClient
+        from sqlalchemy import event, func, select
+        from app.db.core import engine
+        from app.db.models import Encounter
+        from app.idempotency import store
+        from app.main import app
+        from .common import print_table
+
+        statements: list[str] = []
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *rest: statements.append(statement))
+
+        rows = []
+        with TestClient(app) as client:
+            patient = {"mrn": "BENCH1", "sex": "F", "date_of_birth": "1970-01-01"}
+            patient_id = client.post("/api/v1/patients/", json=patient).json()["id"]
+            encounter = {"patient_id": patient_id, "encounter_type": "clinic", "encounter_date": "2025-01-01"}
+            # Retries only go to keys still in the store; a retry of an evicted key would run again
+            retried = range(max(0, args.requests - args.max_keys), args.requests)
+            flows = [("first", range(args.requests)), *((f"retry {n}", retried) for n in range(1, args.retries + 1))]
+            for label, indices in flows:
+                statements.clear()
+                statuses: dict[int, int] = {}
+                started = time.perf_counter()
+                for i in indices:
+                    headers = {"Idempotency-Key": f"bench-{i}"}
+                    response = client.post("/api/v1/encounters/", json=encounter, headers=headers)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                elapsed = time.perf_counter() - started
+                sent = sum(statuses.values())
+                rows.append({
+                    "flow": label,
+                    "requests": sent,
+                    "ms_per_request": elapsed / sent * 1000,
+                    "sql_per_request": len(statements) / sent,
+                    "statuses": " ".join(f"{status}x{count}" for status, count in sorted(statuses.items())),
+                })
+
+            with engine.connect() as connection:
+                encounters = connection.execute(select(func.count()).select_from(Encounter)).scalar_one()
+
+        print_table(rows, ["flow", "requests", "ms_per_request", "sql_per_request", "statuses"])
+        stats = store.stats()
+        print(f"\nencounters: {encounters} (expected {args.requests})")
+        print(f"store: {stats['size']} keys, {stats['bytes']} bytes, {stats['evictions']} evictions (cap {args.max_keys})")
+        if encounters != args.requests or stats["size"] > args.max_keys:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
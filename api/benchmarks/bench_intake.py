@@ -0,0 +1,100 @@
+"""
+Case intake - four sequential API calls per case vs one POST /intake/case
+
+"sequential" is the intake service's old flow: GET /patients/match, then
+POST patient, encounter and research case, each committed on its own.
+"intake" creates the same case in one request and one transaction. Half the
+cases reuse an existing patient (same MRN) and half create one.
+
+Usage (from api/):
+    python -m benchmarks.bench_intake --cases 500
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def _payload(i: int) -> dict:
+    return {
+        "mrn": f"MRN{i // 2:06d}",
+        "first_name": f"First{i // 2}",
+        "last_name": f"Last{i // 2}",
+        "date_of_birth": "1970-01-01",
+        "sex": "F",
+        "encounter_date": "2025-01-01",
+        "procedure_type": "knee-surgical",
+        "laterality": "Left",
+        "attending_physician": "Dr. Attending",
+    }
+
+
+def _sequential(client, payload: dict) -> None:
+    params = {key: payload[key] for key in ("mrn", "first_name", "last_name", "date_of_birth")}
+    candidates = client.get("/api/v1/patients/match", params={**params, "min_score": 0.6}).json()
+    if candidates:
+        patient_id = candidates[0]["patient"]["id"]
+    else:
+        patient = {key: payload[key] for key in ("mrn", "first_name", "last_name", "date_of_birth", "sex")}
+        patient_id = client.post("/api/v1/patients/", json=patient).json()["id"]
+    encounter_id = client.post("/api/v1/encounters/", json={
+        "patient_id": patient_id,
+        "encounter_type": "surgery",
+        "encounter_date": payload["encounter_date"],
+        "attending_physician": payload["attending_physician"],
+    }).json()["id"]
+    client.post("/api/v1/rc/knee-surgical/", json={
+        "encounter_id": encounter_id,
+        "attending": payload["attending_physician"],
+        "mrn": payload["mrn"],
+        "surgery_date": payload["encounter_date"],
+        "laterality": payload["laterality"],
+    }).raise_for_status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from fastapi.testclient import TestClient
+        from sqlalchemy import event
+        from app.db.core import engine
+        from app.main import app
+        from .common import print_table
+
+        commits: list[int] = []
+        event.listen(engine, "commit", lambda conn: commits.append(1))
+
+        rows = []
+        with TestClient(app) as client:
+            for i in range(-20, 0, 2):  # warm up both paths
+                _sequential(client, _payload(i))
+                client.post("/api/v1/intake/case", json=_payload(i - 1)).raise_for_status()
+            # Each flow gets its own MRN range, so both see the same new/existing patient mix
+            for offset, label in ((0, "sequential"), (args.cases, "intake")):
+                commits.clear()
+                started = time.perf_counter()
+                for i in range(offset, offset + args.cases):
+                    if label == "sequential":
+                        _sequential(client, _payload(i))
+                    else:
+                        client.post("/api/v1/intake/case", json=_payload(i)).raise_for_status()
+                elapsed = time.perf_counter() - started
+                rows.append({
+                    "flow": label,
+                    "ms_per_case": elapsed / args.cases * 1000,
+                    "cases_per_s": args.cases / elapsed,
+                    "commits_per_case": len(commits) / args.cases,
+                })
+
+        print_table(rows, ["flow", "ms_per_case", "cases_per_s", "commits_per_case"])
+
+
+if __name__ == "__main__":
+    main()
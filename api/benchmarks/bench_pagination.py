@@ -0,0 +1,69 @@
+"""
+OFFSET vs keyset paging - page latency by depth on a large patient table
+
+Usage (from api/):
+    python -m benchmarks.bench_pagination --rows 1000000 --limit 100
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+
+def seed(path: str, rows: int) -> None:
+    """Bulk-load patients straight through sqlite3 (the API is far too slow for 1M rows)"""
+    conn = sqlite3.connect(path)
+    batch = 50_000
+    for start in range(0, rows, batch):
+        conn.executemany(
+            "INSERT INTO patient (mrn, last_name, date_of_birth, sex, is_deleted, created_at) "
+            "VALUES (?, ?, '1970-01-01', 'M', 0, '2025-01-01 00:00:00')",
+            ((f"P{i:09d}", f"Last{i}") for i in range(start, min(start + batch, rows)))
+        )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/bench.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from app.db.core import RoutingSession, create_db_and_tables
+        from app.db.crud import patient as crud
+        from .common import print_table
+
+        create_db_and_tables()
+        seed(path, args.rows)
+
+        rows = []
+        with RoutingSession() as session:
+            for depth in (0, 0.01, 0.1, 0.5, 0.99):
+                skip = int(args.rows * depth)
+                for mode in ("offset", "cursor"):
+                    kwargs = {"skip": skip} if mode == "offset" else {"after_id": skip}
+                    crud.get_patients(session, limit=args.limit, **kwargs)
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        page = crud.get_patients(session, limit=args.limit, **kwargs)
+                    elapsed_ms = (time.perf_counter() - started) / args.repeat * 1000
+                    rows.append({
+                        "mode": mode,
+                        "depth_row": skip,
+                        "page_ms": elapsed_ms,
+                        "first_id": page[0].id if page else "-",
+                    })
+
+        print_table(rows, ["mode", "depth_row", "page_ms", "first_id"])
+
+
+if __name__ == "__main__":
+    main()
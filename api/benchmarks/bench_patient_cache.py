@@ -0,0 +1,62 @@
+"""
+MRN / patient cache - lookup latency with no cache, the in-process LRU and the shared SQLite file
+
+Usage (from api/):
+    python -m benchmarks.bench_patient_cache --patients 100000 --lookups 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patients", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--hot", type=int, default=2_000, help="distinct MRNs looked up")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from app.db import cache
+        from app.db.core import RoutingSession, create_db_and_tables
+        from app.db.crud import patient as crud
+        from .bench_pagination import seed
+        from .common import print_table
+
+        create_db_and_tables()
+        seed(f"{tmp}/bench.db", args.patients)
+        mrns = [f"P{random.randrange(args.patients):09d}" for _ in range(args.hot)]
+
+        backends = {
+            "none": lambda ns: cache.MemoryBackend(0),
+            "memory": lambda ns: cache.MemoryBackend(args.hot * 2),
+            "sqlite-file": lambda ns: cache.SqliteBackend(f"{tmp}/cache.db", ns, args.hot * 2),
+        }
+        rows = []
+        with RoutingSession() as session:
+            for name, make_backend in backends.items():
+                crud.mrn_cache = cache.Cache("patient-mrn", make_backend("patient-mrn"), ttl=300)
+                crud.row_cache = cache.Cache("patient", make_backend("patient"), ttl=300)
+                for mrn in mrns:
+                    crud.get_patient_by_mrn(session, mrn)  # warm up
+                started = time.perf_counter()
+                for i in range(args.lookups):
+                    crud.get_patient_by_mrn(session, mrns[i % len(mrns)])
+                elapsed = time.perf_counter() - started
+                rows.append({
+                    "cache": name,
+                    "lookups": args.lookups,
+                    "us_per_lookup": elapsed / args.lookups * 1_000_000,
+                    "hit_ratio": crud.mrn_cache.stats()["hit_ratio"],
+                })
+
+        print_table(rows, ["cache", "lookups", "us_per_lookup", "hit_ratio"])
+
+
+if __name__ == "__main__":
+    main()
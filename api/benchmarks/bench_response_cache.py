@@ -0,0 +1,107 @@
+"""
+Response cache - dashboard GETs served from the database vs from the response cache
+
+Times the routes dashboards poll (research case lists and details, a patient,
+a patient's encounters) with RESPONSE_CACHE_SIZE=0 and with the cache on,
+counting SQL statements per request. A hit must run none, and a write must
+invalidate the cached copy: the run exits non-zero otherwise.
+
+Usage (from api/):
+    python -m benchmarks.bench_response_cache --rows 1000 --repeat 50
+    CACHE_BACKEND=sqlite:////tmp/bench-cache.db python -m benchmarks.bench_response_cache
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from .bench_serialization import _value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per table (and per list page)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from fastapi.testclient import TestClient
+        from sqlalchemy import event, insert
+        from app.config import settings
+        from app.db.cache import cache_stats
+        from app.db.core import engine, read_engine
+        from app.db.models import Encounter, Patient
+        from app.db.research_cases import RESEARCH_CASE_TYPES
+        from app.main import app
+        from .common import print_table
+
+        statements: list[str] = []
+        for bound in {engine, read_engine}:
+            event.listen(bound, "before_cursor_execute", lambda conn, cursor, statement, *rest: statements.append(statement))
+
+        rows, failures = [], []
+        enabled = settings.response_cache_size
+        with TestClient(app) as client:
+            case_types = [RESEARCH_CASE_TYPES["knee-surgical"], RESEARCH_CASE_TYPES["rotator-cuff"]]
+            with engine.begin() as connection:
+                connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+                for model in (Patient, Encounter, *(case_type.model for case_type in case_types)):
+                    columns = [column for column in model.__table__.columns if column.name != "id"]
+                    connection.execute(insert(model), [
+                        {column.name: _value(column, i) for column in columns}
+                        | ({"is_deleted": False} if model is Patient else {})
+                        | ({"patient_id": 1} if model is Encounter else {})
+                        | ({"encounter_id": i + 1} if hasattr(model, "encounter_id") else {})
+                        for i in range(args.rows)
+                    ])
+
+            paths = [f"/api/v1/rc/{case_type.slug}/?limit={args.rows}" for case_type in case_types]
+            paths += [f"/api/v1/rc/{case_type.slug}/1" for case_type in case_types]
+            paths += ["/api/v1/patients/1", f"/api/v1/encounters/patient/1?limit={args.rows}"]
+            for path in paths:
+                results = {}
+                for label, size in (("uncached", 0), ("cached", enabled)):
+                    settings.response_cache_size = size
+                    client.get(path)  # warm up (and fill the cache)
+                    statements.clear()
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        response = client.get(path)
+                    elapsed = (time.perf_counter() - started) / args.repeat * 1000
+                    results[label] = (elapsed, len(statements) / args.repeat, response)
+                if results["cached"][1] or results["cached"][2].content != results["uncached"][2].content:
+                    failures.append(f"{path}: {results['cached'][1]} queries per hit or a different body")
+                rows.append({
+                    "path": path.split("?")[0].removeprefix("/api/v1"),
+                    "kb": len(results["uncached"][2].content) / 1024,
+                    "uncached_ms": results["uncached"][0],
+                    "uncached_queries": results["uncached"][1],
+                    "cached_ms": results["cached"][0],
+                    "cached_queries": results["cached"][1],
+                    "speedup": results["uncached"][0] / results["cached"][0],
+                })
+
+            # A write must invalidate every cached response built from its table
+            base_path = f"/api/v1/rc/{case_types[0].slug}"
+            client.patch(f"{base_path}/1", json={"attending": "Dr. Changed"}).raise_for_status()
+            for path in (f"{base_path}/?limit={args.rows}", f"{base_path}/1"):
+                body = client.get(path).json()
+                attending = (body[0] if isinstance(body, list) else body)["attending"]
+                if attending != "Dr. Changed":
+                    failures.append(f"{path}: stale response after PATCH")
+
+        print_table(rows, ["path", "kb", "uncached_ms", "uncached_queries", "cached_ms", "cached_queries", "speedup"])
+        print(cache_stats()["responses"])
+        for failure in failures:
+            print("FAIL", failure)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Response serialization - FastAPI's validate + jsonable_encoder path vs the cached adapters, per response model
+
+Usage (from api/):
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Any, Literal, Optional, get_args, get_origin
+from sqlalchemy import types
+
+
+def _choice(annotation: Any) -> Optional[str]:
+    """First allowed value of a Literal[...] field (possibly inside Optional)"""
+    if get_origin(annotation) is Literal:
+        return get_args(annotation)[0]
+    return next((choice for arg in get_args(annotation) if (choice := _choice(arg)) is not None), None)
+
+
+def _value(column, i: int, annotation: Any = None):
+    """A plausible non-null value for a column, so every field is actually encoded"""
+    if isinstance(column.type, types.Boolean):
+        return i % 2 == 0
+    if isinstance(column.type, types.Integer):
+        return i
+    if isinstance(column.type, types.Float):
+        return i / 7
+    if isinstance(column.type, types.DateTime):
+        return datetime(2025, 1, 1, 12, 30)
+    if isinstance(column.type, types.Date):
+        return date(2025, 1, 1)
+    if _choice(annotation) is not None:
+        return _choice(annotation)
+    if column.name == "email":
+        return f"user{i}@example.com"
+    return f"{column.name[:20]}-{i}"[: column.type.length or None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per response (one list page)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+
+        # Import after DATABASE_URL is set so the engines point at the scratch DB
+        from typing import List
+        from fastapi.responses import JSONResponse
+        from fastapi.routing import serialize_response
+        from fastapi.utils import create_response_field
+        from sqlalchemy import insert
+        from app.db.core import RoutingSession, create_db_and_tables, engine
+        from app.db.crud import base
+        from app.db.models import Diagnosis, Encounter, Patient, Procedure
+        from app.db.research_cases import RESEARCH_CASE_TYPES
+        from app.db.schemas.diagnosis import DiagnosisResponse
+        from app.db.schemas.encounter import EncounterResponse
+        from app.db.schemas.patient import PatientResponse
+        from app.db.schemas.procedure import ProcedureResponse
+        from app.routes.serialization import json_dumper
+        from .common import print_table
+
+        create_db_and_tables()
+        models = [
+            (Patient, PatientResponse), (Encounter, EncounterResponse),
+            (Diagnosis, DiagnosisResponse), (Procedure, ProcedureResponse),
+        ] + [(case_type.model, case_type.response_schema) for case_type in RESEARCH_CASE_TYPES.values()]
+
+        with engine.begin() as connection:
+            # Only serialization is measured; skip the triggers' and foreign keys' work
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            for name, in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'").all():
+                connection.exec_driver_sql(f'DROP TRIGGER "{name}"')
+            for model, response_model in models:
+                fields = response_model.model_fields
+                columns = [column for column in model.__table__.columns if column.name != "id"]
+                connection.execute(insert(model), [
+                    {
+                        column.name: _value(column, i, fields[column.name].annotation if column.name in fields else None)
+                        for column in columns
+                    }
+                    for i in range(args.rows)
+                ])
+
+        rows = []
+        with RoutingSession() as session:
+            for model, response_model in models:
+                objects = base.get_many(session, model, limit=args.rows)
+                response_type = List[response_model]
+                field = create_response_field(name="Response_bench", type_=response_type)
+
+                async def stock():
+                    content = await serialize_response(field=field, response_content=objects, is_coroutine=True)
+                    return JSONResponse(content).body
+
+                dump = json_dumper(response_type)
+                timings, bodies = {}, {}
+                for label, run in (("stock", lambda: asyncio.run(stock())), ("adapter", lambda: dump(objects))):
+                    run()  # warm up
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        body = run()
+                    timings[label] = (time.perf_counter() - started) / args.repeat * 1000
+                    bodies[label] = body
+                rows.append({
+                    "model": response_model.__name__[:24],
+                    "fields": len(response_model.model_fields),
+                    "stock_ms": timings["stock"],
+                    "adapter_ms": timings["adapter"],
+                    "speedup": timings["stock"] / timings["adapter"],
+                    "kb": len(body) // 1024,
+                    "same_json": json.loads(bodies["stock"]) == json.loads(bodies["adapter"]),
+                })
+
+        print_table(rows, ["model", "fields", "stock_ms", "adapter_ms", "speedup", "kb", "same_json"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Shared helpers for benchmarks - throwaway API servers and a simple load generator
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
+
+import httpx
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+# A request is either a GET path or a factory returning (method, path, json_body)
+RequestSpec = Union[list[str], Callable[[int], tuple[str, str, Optional[dict]]]]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def api_server(env: Optional[dict] = None, database_url: Optional[str] = None) -> Iterator[str]:
+    """Start uvicorn on a scratch SQLite database and yield its base URL"""
+    with tempfile.TemporaryDirectory() as tmp:
+        port = _free_port()
+        server_env = {
+            **os.environ,
+            "DATABASE_URL": database_url or f"sqlite:///{tmp}/bench.db",
+            **(env or {}),
+        }
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=API_DIR,
+            env=server_env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.time() + 30
+            while time.time() < deadline:
+                try:
+                    httpx.get(f"{base_url}/api/v1/health", timeout=1)
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.2)
+            yield base_url
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+async def _load(base_url: str, requests: RequestSpec, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def worker(client: httpx.AsyncClient, offset: int):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < stop_at:
+            if callable(requests):
+                method, path, body = requests(i)
+            else:
+                method, path, body = "GET", requests[i % len(requests)], None
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+            i += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, n * 1_000_000) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "req_per_s": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def run_load(base_url: str, requests: RequestSpec, concurrency: int = 32, duration: float = 10.0) -> dict:
+    """Hammer the API with `concurrency` clients for `duration` seconds"""
+    return asyncio.run(_load(base_url, requests, concurrency, duration))
+
+
+def print_table(rows: list[dict], columns: list[str]) -> None:
+    """Print a fixed-width results table"""
+    print("  ".join(f"{c:>14}" for c in columns))
+    for row in rows:
+        cells = []
+        for c in columns:
+            value = row.get(c, "")
+            cells.append(f"{value:>14.1f}" if isinstance(value, float) else f"{value!s:>14}")
+        print("  ".join(cells))
@@ -0,0 +1,75 @@
+"""
+Test fixtures - the app on a scratch SQLite database, plus a SQL statement counter
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Settings and engines are built at import, so the scratch DB must be configured before any app
+# module is imported (test modules are imported after this conftest)
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["CASELOAD_REFRESH_SECONDS"] = "0"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def _fresh_response_cache():
+    """Every test sees the database, not a GET response cached by an earlier test"""
+    from app.routes import response_cache
+
+    response_cache.responses.clear()
+
+
+@pytest.fixture
+def statements():
+    """statements() is a context manager collecting the SQL issued on every engine inside it"""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @contextmanager
+    def collect():
+        issued: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            issued.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            yield issued
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+    return collect
+
+
+_sequence = iter(range(1, 1_000_000))
+
+
+@pytest.fixture
+def patient(client) -> dict:
+    """A new patient with a unique MRN"""
+    body = {"mrn": f"T{next(_sequence):06d}", "first_name": "Ada", "last_name": "Lovelace",
+            "sex": "F", "date_of_birth": "1970-01-01"}
+    response = client.post("/api/v1/patients/", json=body)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def encounter(client, patient) -> dict:
+    """A surgery encounter for a new patient"""
+    body = {"patient_id": patient["id"], "encounter_type": "surgery", "encounter_date": "2025-01-01"}
+    response = client.post("/api/v1/encounters/", json=body)
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,59 @@
+"""
+Batch route - operations dispatched through the router in one transaction
+"""
+
+
+def _batch(client, *operations, atomic=False) -> dict:
+    response = client.post("/api/v1/batch", json={"operations": list(operations), "atomic": atomic})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_references_and_savepoints(client, patient):
+    report = _batch(
+        client,
+        {"method": "POST", "path": "/encounters/", "ref": "visit",
+         "body": {"patient_id": patient["id"], "encounter_type": "clinic", "encounter_date": "2025-01-01"}},
+        {"method": "POST", "path": "/diagnoses/",
+         "body": {"encounter_id": "${visit.id}", "icd10_code": "M75.1", "diagnosis_description": "Cuff"}},
+        {"method": "POST", "path": "/diagnoses/", "body": {"encounter_id": "${visit.id}"}},
+    )
+    assert [result["status"] for result in report["results"]] == [201, 201, 422]
+    assert report["committed"] and report["failed"] == 1
+    encounter_id = report["results"][0]["body"]["id"]
+    assert client.get(f"/api/v1/encounters/{encounter_id}").status_code == 200
+
+
+def test_atomic_failure_rolls_back(client, patient):
+    report = _batch(
+        client,
+        {"method": "POST", "path": "/encounters/",
+         "body": {"patient_id": patient["id"], "encounter_type": "clinic", "encounter_date": "2025-01-01"}},
+        {"method": "GET", "path": "/patients/0"},
+        {"method": "GET", "path": f"/patients/{patient['id']}"},
+        atomic=True,
+    )
+    assert [result["status"] for result in report["results"]] == [201, 404, 424]
+    assert not report["committed"]
+    encounter_id = report["results"][0]["body"]["id"]
+    assert client.get(f"/api/v1/encounters/{encounter_id}").status_code == 404
+
+
+def test_unknown_path_and_method(client):
+    report = _batch(
+        client,
+        {"method": "GET", "path": "/nope"},
+        {"method": "DELETE", "path": "/intake/case"},
+    )
+    assert [result["status"] for result in report["results"]] == [404, 405]
+
+
+def test_streaming_operation_is_rejected(client, patient):
+    # A streamed response used to wait forever on receive() for a disconnect, hanging the server
+    report = _batch(
+        client,
+        {"method": "GET", "path": "/export/patient?format=arrow"},
+        {"method": "GET", "path": f"/patients/{patient['id']}"},
+    )
+    assert report["results"][0]["status"] in (406, 503)  # 503 when pyarrow is not installed
+    assert report["results"][1]["status"] == 200
@@ -0,0 +1,49 @@
+"""
+Research case index - rc_case_index kept current by triggers
+"""
+from sqlalchemy import text
+
+from app.db.core import engine
+
+
+def _case_ids(client, **params) -> list[int]:
+    response = client.get("/api/v1/rc/cases", params=params)
+    assert response.status_code == 200, response.text
+    return [row["case_id"] for row in response.json()]
+
+
+def _create_case(client, encounter: dict, **fields) -> int:
+    body = {"encounter_id": encounter["id"], "surgery_date": "2025-02-02", **fields}
+    response = client.post("/api/v1/rc/knee-surgical/", json=body)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_case_follows_patient_mrn(client, patient, encounter):
+    case_id = _create_case(client, encounter)
+    assert _case_ids(client, mrn=patient["mrn"]) == [case_id]
+
+    new_mrn = patient["mrn"] + "-NEW"
+    assert client.patch(f"/api/v1/patients/{patient['id']}", json={"mrn": new_mrn}).status_code == 200
+    assert _case_ids(client, mrn=new_mrn) == [case_id]
+    assert _case_ids(client, mrn=patient["mrn"]) == []
+
+
+def test_case_mrn_wins_over_patient_mrn(client, patient, encounter):
+    case_id = _create_case(client, encounter, mrn=patient["mrn"] + "-CASE")
+    client.patch(f"/api/v1/patients/{patient['id']}", json={"mrn": patient["mrn"] + "-MOVED"})
+    assert _case_ids(client, mrn=patient["mrn"] + "-CASE") == [case_id]
+
+
+def test_case_follows_encounter_to_another_patient(client, patient, encounter):
+    other = client.post("/api/v1/patients/", json={
+        "mrn": patient["mrn"] + "-OTHER", "sex": "M", "date_of_birth": "1980-01-01",
+    }).json()
+    case_id = _create_case(client, encounter)
+    with engine.begin() as connection:
+        connection.execute(
+            text("UPDATE encounter SET patient_id = :patient WHERE id = :id"),
+            {"patient": other["id"], "id": encounter["id"]},
+        )
+    assert _case_ids(client, mrn=other["mrn"]) == [case_id]
+    assert _case_ids(client, mrn=patient["mrn"]) == []
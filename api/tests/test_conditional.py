@@ -0,0 +1,71 @@
+"""
+Conditional GETs - ETags, 304s, and bodies that match their ETag
+"""
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.db.core import engine
+from app.db.models import Patient
+from app.routes import response_cache
+
+
+def test_patient_detail_skips_stale_cached_row(client, patient):
+    url = f"/api/v1/patients/{patient['id']}"
+    first = client.get(url)  # leaves the row in this worker's row cache
+    assert first.status_code == 200
+
+    # A write through another worker: the row changes, this worker's caches don't hear of it
+    with engine.begin() as connection:
+        connection.execute(
+            update(Patient).where(Patient.id == patient["id"]).values(city="Elsewhere", updated_at=datetime(2030, 1, 1))
+        )
+    response_cache.responses.clear()
+
+    second = client.get(url)
+    assert second.status_code == 200
+    assert second.json()["city"] == "Elsewhere"
+    assert second.headers["etag"] != first.headers["etag"]
+
+    # The new ETag names the new body, so revalidating with it is safe
+    assert client.get(url, headers={"If-None-Match": second.headers["etag"]}).status_code == 304
+
+
+def test_patient_detail_serves_current_cached_row(client, patient, statements):
+    url = f"/api/v1/patients/{patient['id']}"
+    first = client.get(url)
+    response_cache.responses.clear()
+    with statements() as issued:
+        second = client.get(url)
+    assert second.json() == first.json()
+    assert len(issued) == 1  # the row stamp; the body came from the row cache
+
+
+def test_not_modified_detail_costs_one_query(client, patient, statements):
+    url = f"/api/v1/patients/{patient['id']}"
+    etag = client.get(url).headers["etag"]
+    response_cache.responses.clear()  # answer from the database, not a cached response
+    with statements() as issued:
+        response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert len(issued) <= 1, issued
+    assert "first_name" not in " ".join(issued)  # the stamp, not the row
+
+
+def test_not_modified_list_costs_one_query(client, patient, statements):
+    url = "/api/v1/patients/?limit=5"
+    first = client.get(url)
+    response_cache.responses.clear()
+    with statements() as issued:
+        response = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 304
+    assert len(issued) <= 1, issued
+    assert "table_version" in " ".join(issued)
+
+
+def test_if_modified_since(client, patient):
+    url = f"/api/v1/patients/{patient['id']}"
+    last_modified = client.get(url).headers["last-modified"]
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
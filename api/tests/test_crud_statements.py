@@ -0,0 +1,66 @@
+"""
+CRUD engine - each create, PATCH and delete is a single SQL statement
+"""
+from datetime import date
+
+import pytest
+
+from app.db.core import RoutingSession
+from app.db.crud import diagnosis, encounter as encounter_crud, patient as patient_crud, procedure
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+
+@pytest.fixture
+def session(client):
+    """A session configured as the routes' (RETURNING rows are not expired on commit)"""
+    with RoutingSession() as session:
+        yield session
+
+
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+def _one_statement(statements, operation, *args):
+    """operation(*args)'s result, after checking it issued exactly one statement besides BEGIN/COMMIT"""
+    with statements() as issued:
+        result = operation(*args)
+    work = [statement for statement in issued if not statement.upper().startswith(TRANSACTION_CONTROL)]
+    assert len(work) == 1, work
+    return result
+
+
+@pytest.mark.parametrize("slug", sorted(RESEARCH_CASE_TYPES))
+def test_research_case_writes(session, statements, encounter, slug):
+    crud = RESEARCH_CASE_TYPES[slug].crud
+    case = _one_statement(statements, crud.create_case, session, {"encounter_id": encounter["id"]})
+    updated = _one_statement(statements, crud.update_case, session, case.id, {"attending": "Dr. One"})
+    assert updated.attending == "Dr. One"
+    assert _one_statement(statements, crud.delete_case, session, case.id)
+
+
+def test_patient_writes(session, statements):
+    data = {"mrn": "STATEMENTS1", "sex": "F", "date_of_birth": date(1970, 1, 1)}
+    patient = _one_statement(statements, patient_crud.create_patient, session, data)
+    updated = _one_statement(statements, patient_crud.update_patient, session, patient.id, {"city": "Leeds"})
+    assert updated.city == "Leeds"
+    assert _one_statement(statements, patient_crud.delete_patient, session, patient.id)
+
+
+@pytest.mark.parametrize("crud, name, description, data", [
+    (diagnosis, "diagnosis", "diagnosis_description", {"icd10_code": "M75.1", "diagnosis_description": "Rotator cuff tear"}),
+    (procedure, "procedure", "procedure_description", {"cpt_code": "29827", "procedure_description": "Arthroscopic cuff repair",
+                                           "procedure_date": date(2025, 1, 1)}),
+])
+def test_encounter_child_writes(session, statements, encounter, crud, name, description, data):
+    row = _one_statement(statements, getattr(crud, f"create_{name}"), session, {"encounter_id": encounter["id"], **data})
+    updated = _one_statement(statements, getattr(crud, f"update_{name}"), session, row.id, {description: "Revised"})
+    assert getattr(updated, description) == "Revised"
+    assert _one_statement(statements, getattr(crud, f"delete_{name}"), session, row.id)
+
+
+def test_encounter_writes(session, statements, patient):
+    data = {"patient_id": patient["id"], "encounter_type": "clinic", "encounter_date": date(2025, 3, 4)}
+    row = _one_statement(statements, encounter_crud.create_encounter, session, data)
+    updated = _one_statement(statements, encounter_crud.update_encounter, session, row.id, {"encounter_type": "surgery"})
+    assert updated.encounter_type == "surgery"
+    assert _one_statement(statements, encounter_crud.delete_encounter, session, row.id)
@@ -0,0 +1,45 @@
+"""
+Idempotency keys - retried POSTs replay the first response
+"""
+from app.idempotency import store
+
+
+def _post_encounter(client, patient, key, encounter_type="clinic"):
+    body = {"patient_id": patient["id"], "encounter_type": encounter_type, "encounter_date": "2025-01-01"}
+    return client.post("/api/v1/encounters/", json=body, headers={"Idempotency-Key": key})
+
+
+def test_retry_replays_first_response(client, patient):
+    first = _post_encounter(client, patient, f"replay-{patient['id']}")
+    retry = _post_encounter(client, patient, f"replay-{patient['id']}")
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+
+
+def test_key_reused_with_another_body(client, patient):
+    assert _post_encounter(client, patient, f"reuse-{patient['id']}").status_code == 201
+    assert _post_encounter(client, patient, f"reuse-{patient['id']}", "surgery").status_code == 422
+
+
+def test_key_still_claimed(client, patient, monkeypatch):
+    # Another request holds the key, but its entry is gone by the time it is read back
+    monkeypatch.setattr(store, "add", lambda *args, **kwargs: False)
+    monkeypatch.setattr(store, "get", lambda key: None)
+    response = _post_encounter(client, patient, f"lost-{patient['id']}")
+    assert response.status_code == 409
+    assert client.get(f"/api/v1/encounters/patient/{patient['id']}").json() == []
+
+
+def test_claim_retried_after_entry_vanishes(client, patient, monkeypatch):
+    add = store.add
+    attempts = []
+
+    def add_after_a_miss(*args, **kwargs):
+        attempts.append(args[0])
+        return len(attempts) > 1 and add(*args, **kwargs)
+
+    monkeypatch.setattr(store, "add", add_after_a_miss)
+    response = _post_encounter(client, patient, f"vanished-{patient['id']}")
+    assert response.status_code == 201
+    assert len(attempts) == 2
@@ -0,0 +1,32 @@
+"""
+Index advisor - no hot CRUD query scans a whole table
+"""
+from app.db import index_advisor as advisor
+from app.db.core import engine
+from app.db.crud import patient as patient_crud
+
+
+def test_no_hot_query_full_scans(client):
+    # Warm caches would answer the patient lookups without SQL
+    patient_crud.row_cache.set(1, {"id": 1})
+    patient_crud.mrn_cache.set("ADVISOR-MRN", 1)
+    findings = advisor.analyze(engine)
+    assert {finding.query for finding in findings} >= set(advisor.hot_queries())
+    scans = [
+        (finding.query, issue.detail)
+        for finding in findings for issue in finding.issues if issue.kind == "full scan"
+    ]
+    assert scans == []
+
+
+def test_partial_index_proposed_for_literal_predicate():
+    sql = (
+        "SELECT patient.id FROM patient WHERE patient.is_deleted = 0 AND patient.last_name = ? "
+        "ORDER BY patient.id LIMIT ?"
+    )
+    proposal = advisor.propose_index(sql, "patient")
+    assert proposal.columns == ("last_name", "id")
+    assert proposal.ddl("sqlite") == (
+        'CREATE INDEX ix_patient_last_name_id_active ON "patient" (last_name, id) WHERE is_deleted = 0'
+    )
+    assert proposal.where_pg == "is_deleted = false"
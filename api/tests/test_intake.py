@@ -0,0 +1,37 @@
+"""
+Case intake - patient resolution and the single-transaction create
+"""
+
+
+def _intake(client, **patient) -> dict:
+    body = {
+        "first_name": "John", "last_name": "Smith", "date_of_birth": "1955-06-07", "sex": "M",
+        "encounter_date": "2025-03-04", "procedure_type": "knee-surgical", "attending_physician": "Dr. Test",
+        **patient,
+    }
+    response = client.post("/api/v1/intake/case", json=body)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_same_mrn_reuses_patient(client):
+    first = _intake(client, mrn="INTAKE-R1")
+    again = _intake(client, mrn="INTAKE-R1", first_name="Jon")
+    assert first["patient_created"] and not again["patient_created"]
+    assert again["patient_id"] == first["patient_id"]
+    assert again["encounter_id"] != first["encounter_id"]
+
+
+def test_similar_patient_under_other_mrn_is_reported(client):
+    first = _intake(client, mrn="INTAKE-D1", date_of_birth="1944-01-02")
+    other = _intake(client, mrn="INTAKE-D9", last_name="Smyth", date_of_birth="1944-01-02")
+    assert other["patient_created"]
+    assert other["possible_duplicates"] == [first["patient_id"]]
+
+
+def test_normalized_mrn_needs_same_dob(client):
+    first = _intake(client, mrn="NX1", first_name="Xavier", date_of_birth="1990-09-09")
+    same_dob = _intake(client, mrn="nx-1", first_name="Xavier", date_of_birth="1990-09-09")
+    other_dob = _intake(client, mrn="0NX1", first_name="Mary", date_of_birth="1971-01-01")
+    assert same_dob["patient_id"] == first["patient_id"]
+    assert other_dob["patient_created"] and other_dob["patient_id"] != first["patient_id"]
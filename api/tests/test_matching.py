@@ -0,0 +1,45 @@
+"""
+Patient matching - scores and /patients/match candidates
+"""
+from datetime import date
+from types import SimpleNamespace
+
+from app.db import matching
+
+
+def _patient(mrn: str, first_name: str, last_name: str, date_of_birth: date) -> SimpleNamespace:
+    return SimpleNamespace(
+        mrn=mrn, mrn_key=matching.normalize_mrn(mrn), first_name=first_name, last_name=last_name,
+        date_of_birth=date_of_birth,
+    )
+
+
+def test_different_mrn_scores_on_name_and_dob():
+    # Misspelled surname under another MRN: a likely duplicate, not a certain one
+    candidate = _patient("Y1", "John", "Smith", date(1970, 1, 1))
+    score, matched = matching.score_candidate(candidate, "Y9", "John", "Smyth", date(1970, 1, 1))
+    assert 0.6 <= score < 1.0
+    assert "mrn" not in matched and "date_of_birth" in matched
+
+
+def test_same_mrn_scores_higher_than_different_mrn():
+    probe = ("X1", "John", "Smyth", date(1970, 1, 1))
+    same, _ = matching.score_candidate(_patient("X1", "John", "Smith", date(1970, 1, 1)), *probe)
+    other, _ = matching.score_candidate(_patient("X2", "John", "Smith", date(1970, 1, 1)), *probe)
+    assert same > other
+
+
+def test_mrn_only_probe():
+    candidate = _patient("00x-1", "Ann", "Lee", date(1980, 5, 5))
+    assert matching.score_candidate(candidate, mrn="X1") == (1.0, ["mrn"])
+    assert matching.score_candidate(candidate, mrn="X2") == (0.0, [])
+
+
+def test_match_route_finds_duplicate_under_other_mrn(client):
+    body = {"mrn": "MATCH-A1", "first_name": "Bartholomew", "last_name": "Quimby", "sex": "M",
+            "date_of_birth": "1961-02-03"}
+    patient_id = client.post("/api/v1/patients/", json=body).json()["id"]
+    params = {"mrn": "MATCH-B7", "first_name": "Bartholomew", "last_name": "Quimbey", "date_of_birth": "1961-02-03",
+              "min_score": 0.6}
+    matches = client.get("/api/v1/patients/match", params=params).json()
+    assert [match["patient"]["id"] for match in matches] == [patient_id]
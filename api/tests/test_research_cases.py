@@ -0,0 +1,46 @@
+"""
+Research case routes - create, update and delete on every rc_* table
+"""
+from typing import Optional
+
+import pytest
+
+from app.db.research_cases import RESEARCH_CASE_TYPES
+
+
+def _extra_fields(schema, model) -> list[str]:
+    """Fields schema accepts that model's table lacks"""
+    return [name for name in schema.model_fields if name not in model.__table__.c]
+
+
+@pytest.mark.parametrize("slug", sorted(RESEARCH_CASE_TYPES))
+def test_create_update_delete(client, encounter, slug):
+    case_type = RESEARCH_CASE_TYPES[slug]
+    # Every field the create schema accepts, including ones its table lacks
+    body = {"encounter_id": encounter["id"], "attending": "Dr. Test"}
+    body.update({name: None for name in _extra_fields(case_type.create_schema, case_type.model)})
+
+    created = client.post(f"/api/v1/rc/{slug}/", json=body)
+    assert created.status_code == 201, created.text
+    case_id = created.json()["id"]
+
+    flags = [
+        name for name, field in case_type.update_schema.model_fields.items()
+        if name not in case_type.model.__table__.c and field.annotation == Optional[bool]
+    ]
+    update = {"attending": "Dr. Other", **{name: True for name in flags}}
+    updated = client.patch(f"/api/v1/rc/{slug}/{case_id}", json=update)
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["attending"] == "Dr. Other"
+
+    assert client.delete(f"/api/v1/rc/{slug}/{case_id}").status_code in (200, 204)
+    assert client.get(f"/api/v1/rc/{slug}/{case_id}").status_code == 404
+
+
+@pytest.mark.parametrize("slug", sorted(RESEARCH_CASE_TYPES))
+def test_bulk_create(client, encounter, slug):
+    case_type = RESEARCH_CASE_TYPES[slug]
+    row = {"encounter_id": encounter["id"], **{name: None for name in _extra_fields(case_type.create_schema, case_type.model)}}
+    response = client.post(f"/api/v1/rc/{slug}/bulk", json=[row, row])
+    assert response.status_code == 200, response.text
+    assert [result["status"] for result in response.json()["results"]] == ["created", "conflict"]
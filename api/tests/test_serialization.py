@@ -0,0 +1,52 @@
+"""
+Response serialization - the fast path must match what validating the response model produces
+"""
+import json
+
+from sqlmodel import Session
+
+from app.db.core import engine
+from app.db.models import Encounter, Patient
+from app.db.research_cases import RESEARCH_CASE_TYPES
+from app.db.schemas.encounter import EncounterResponse
+from app.db.schemas.patient import PatientResponse
+from app.routes.serialization import json_dumper
+
+
+def _keys(payload: bytes) -> list[str]:
+    return list(json.loads(payload))
+
+
+def test_detail_and_list_keep_model_field_order(client, encounter):
+    detail = client.get(f"/api/v1/encounters/{encounter['id']}")
+    assert _keys(detail.content) == list(EncounterResponse.model_fields)
+    listed = client.get("/api/v1/encounters/", params={"limit": 5}).json()
+    assert all(list(row) == list(EncounterResponse.model_fields) for row in listed)
+
+
+def test_research_case_matches_validated_output(client, encounter):
+    case_type = RESEARCH_CASE_TYPES["rotator-cuff"]
+    body = {"encounter_id": encounter["id"], "date_of_surgery": "2025-01-01", "attending": "Dr. Test"}
+    case_id = client.post("/api/v1/rc/rotator-cuff/", json=body).json()["id"]
+    served = client.get(f"/api/v1/rc/rotator-cuff/{case_id}").content
+    with Session(engine) as session:
+        row = session.get(case_type.model, case_id)
+        expected = case_type.response_schema.model_validate(row, from_attributes=True).model_dump_json()
+    assert json.loads(served) == json.loads(expected)
+    assert _keys(served) == list(case_type.response_schema.model_fields)
+
+
+def test_expired_attributes_are_loaded(patient):
+    with Session(engine) as session:
+        row = session.get(Patient, patient["id"])
+        session.expire(row)
+        payload = json.loads(json_dumper(PatientResponse)(row))
+    assert payload["mrn"] == patient["mrn"] and payload["id"] == patient["id"]
+
+
+def test_list_of_partially_loaded_rows(encounter):
+    with Session(engine) as session:
+        rows = session.query(Encounter).filter(Encounter.id == encounter["id"]).all()
+        session.expire(rows[0], ["encounter_type"])
+        payload = json.loads(json_dumper(list[EncounterResponse])(rows))
+    assert payload[0]["encounter_type"] == "surgery"
@@ -1,8 +1,10 @@
 """
 Orchestrator for case intake workflow.
-Coordinates: LLM normalization → Patient creation → Encounter creation → Research case creation
+Coordinates: LLM normalization → one intake call creating patient, encounter and research case
 """
 import requests
+import time
+import uuid
 from typing import Dict, Any
 from services.common import get_config, get_logger
 from .schemas import NormalizedCase, CaseCreatePayload, normalized_to_case_payload
@@ -23,9 +25,8 @@ def create_case_from_raw(raw_text: str) -> Dict[str, Any]:
     Steps:
     1. Normalize raw text with LLM
     2. Validate and convert to strict payload
-    3. Search for or create patient
-    4. Create encounter
-    5. Create research case
+    3. POST /api/v1/intake/case, which matches or creates the patient and
+       creates the encounter and research case in one transaction
     
     Args:
         raw_text: Raw surgical note/dictation
@@ -63,29 +64,16 @@ def create_case_from_raw(raw_text: str) -> Dict[str, Any]:
         log.error(f"Payload conversion failed: {e}")
         raise CaseIntakeError(f"Failed to create payload: {e}") from e
     
-    # Step 3: Create or find patient
-    log.info(f"Step 3: Creating/finding patient (MRN={payload.mrn})")
+    # Step 3: Patient, encounter and research case in one request and transaction
+    log.info(f"Step 3: Creating case (MRN={payload.mrn}, type={payload.procedure_type})")
     try:
-        patient_id = _create_or_find_patient(payload, config.api_base_url)
+        created = _create_case(payload, config.api_base_url)
     except Exception as e:
-        log.error(f"Patient creation failed: {e}")
-        raise CaseIntakeError(f"Failed to create patient: {e}") from e
-    
-    # Step 4: Create encounter
-    log.info(f"Step 4: Creating encounter for patient_id={patient_id}")
-    try:
-        encounter_id = _create_encounter(patient_id, payload, config.api_base_url)
-    except Exception as e:
-        log.error(f"Encounter creation failed: {e}")
-        raise CaseIntakeError(f"Failed to create encounter: {e}") from e
-    
-    # Step 5: Create research case
-    log.info(f"Step 5: Creating research case (type={payload.procedure_type})")
-    try:
-        research_case_id = _create_research_case(encounter_id, payload, config.api_base_url)
-    except Exception as e:
-        log.error(f"Research case creation failed: {e}")
-        raise CaseIntakeError(f"Failed to create research case: {e}") from e
+        log.error(f"Case creation failed: {e}")
+        raise CaseIntakeError(f"Failed to create case: {e}") from e
+    patient_id = created["patient_id"]
+    encounter_id = created["encounter_id"]
+    research_case_id = created["research_case_id"]
     
     log.info(f"✓ Case intake complete: patient={patient_id}, encounter={encounter_id}, case={research_case_id}")
     
@@ -99,115 +87,46 @@ def create_case_from_raw(raw_text: str) -> Dict[str, Any]:
     }
 
 
-def _create_or_find_patient(payload: CaseCreatePayload, api_base: str) -> int:
-    """Search for existing patient or create new one"""
-    # Try to find existing patient
-    search_response = requests.get(
-        f"{api_base}/api/v1/patients/search",
-        params={"q": payload.mrn}
-    )
-    
-    # Handle search results
-    if search_response.status_code == 200:
-        patients = search_response.json()
-        if patients:
-            patient_id = patients[0]["id"]
-            log.info(f"Found existing patient: ID={patient_id}, MRN={payload.mrn}")
-            return patient_id
-    elif search_response.status_code != 404:
-        # Real error (not just "no results")
-        raise CaseIntakeError(f"Patient search failed: {search_response.text}")
-    
-    # Create new patient
-    patient_data = {
-        "mrn": payload.mrn,
-        "date_of_birth": str(payload.date_of_birth),
-        "sex": payload.sex
-    }
-    
-    # Only include name fields if they have values
-    if payload.first_name is not None:
-        patient_data["first_name"] = payload.first_name
-    if payload.middle_name is not None:
-        patient_data["middle_name"] = payload.middle_name
-    if payload.last_name is not None:
-        patient_data["last_name"] = payload.last_name
-    
-    create_response = requests.post(
-        f"{api_base}/api/v1/patients",
-        json=patient_data
-    )
-    
-    if create_response.status_code != 201:
-        raise CaseIntakeError(f"Patient creation failed: {create_response.text}")
-    
-    patient_id = create_response.json()["id"]
-    log.info(f"Created new patient: ID={patient_id}, MRN={payload.mrn}")
-    return patient_id
-
-
-def _create_encounter(patient_id: int, payload: CaseCreatePayload, api_base: str) -> int:
-    """Create encounter for patient"""
-    encounter_data = {
-        "patient_id": patient_id,
-        "encounter_type": payload.encounter_type,
-        "encounter_date": str(payload.encounter_date),
-        "chief_complaint": payload.chief_complaint,
-        "location": payload.location,
-        "attending_physician": payload.attending_physician,
-        "status": payload.status,
-        "notes": payload.notes
-    }
-    
-    response = requests.post(
-        f"{api_base}/api/v1/encounters",
-        json=encounter_data
-    )
+def _create_case(payload: CaseCreatePayload, api_base: str, attempts: int = 3) -> Dict[str, Any]:
+    """
+    Create the whole case server-side; nothing is written unless every part succeeds.
+    Retries (connection errors, 409 while the first try is still running, 5xx) reuse
+    one Idempotency-Key, so a retry of a request that did go through gets its
+    response back instead of creating the case twice.
+    """
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    for attempt in range(1, attempts + 1):
+        try:
+            response = requests.post(
+                f"{api_base}/api/v1/intake/case",
+                json=payload.model_dump(mode="json"),
+                headers=headers
+            )
+        except requests.RequestException as e:
+            if attempt == attempts:
+                raise
+            log.warning(f"Case intake attempt {attempt} failed ({e}); retrying")
+        else:
+            retry = response.status_code == 409 or response.status_code >= 500
+            if not retry or attempt == attempts:
+                break
+            log.warning(f"Case intake attempt {attempt} returned {response.status_code}; retrying")
+        time.sleep(attempt)
     
     if response.status_code != 201:
-        raise CaseIntakeError(f"Encounter creation failed: {response.text}")
-    
-    encounter_id = response.json()["id"]
-    log.info(f"Created encounter: ID={encounter_id}")
-    return encounter_id
-
-
-def _create_research_case(encounter_id: int, payload: CaseCreatePayload, api_base: str) -> int:
-    """Create research case record"""
-    # Map procedure type to endpoint
-    endpoint_map = {
-        "rotator-cuff": "rotator-cuff",
-        "knee-surgical": "knee-surgical",
-        "shoulder-scope": "shoulder-scope",
-        "shoulder-arthroplasty": "shoulder-arthroplasty",
-        "hip-scope": "hip-scope",
-        "hip-arthroplasty": "hip-arthroplasty",
-        "knee-arthroplasty": "knee-arthroplasty",
-        "other": "other"
-    }
-    
-    endpoint = endpoint_map.get(payload.procedure_type, "other")
-    
-    research_data = {
-        "encounter_id": encounter_id,
-        "fellow_or_pa": payload.fellow_or_pa,
-        "attending": payload.attending_physician,
-        "mrn": payload.mrn,
-        "first_name": payload.first_name,
-        "last_name": payload.last_name,
-        "dob": str(payload.date_of_birth),
-        "surgery_date": str(payload.encounter_date),
-        "laterality": payload.laterality
-    }
-    
-    response = requests.post(
-        f"{api_base}/api/v1/rc/{endpoint}",
-        json=research_data
+        raise CaseIntakeError(f"Case intake failed: {response.text}")
+    
+    created = response.json()
+    if created["patient_created"]:
+        log.info(f"Created new patient: ID={created['patient_id']}, MRN={payload.mrn}")
+    else:
+        log.info(f"Found existing patient: ID={created['patient_id']}, MRN={payload.mrn}")
+    if created["possible_duplicates"]:
+        log.warning(
+            f"Possible duplicates for MRN={payload.mrn} not attached to this case: {created['possible_duplicates']}"
+        )
+    log.info(
+        f"Created encounter: ID={created['encounter_id']}, "
+        f"research case: ID={created['research_case_id']}, type={payload.procedure_type}"
     )
-    
-    if response.status_code != 201:
-        raise CaseIntakeError(f"Research case creation failed: {response.text}")
-    
-    research_case_id = response.json()["id"]
-    log.info(f"Created research case: ID={research_case_id}, type={payload.procedure_type}")
-    return research_case_id
+    return created